@@ -1,3 +1,4 @@
+// Built by experiments/01-translation/lessons.py from concepts/numbers/phrases.txt -- edit that instead
 let phrases = [
 	new Phrase('1','일'),
 	new Phrase('2','이'),
@@ -11,5 +12,5 @@ let phrases = [
 	new Phrase('10','십'),
 	new Phrase('100','백'),
 	new Phrase('1000','천'),
-	new Phrase('10000','만')
+	new Phrase('10000','만'),
 ];
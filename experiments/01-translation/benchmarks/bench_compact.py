@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Benchmark: memory of a 100k word list as WordForm, CompactWordForm and
+# WordFormList (with a plain list of strings for reference).
+#
+# There is no 100k word list in the repo so one is made up, reproducibly:
+# the dictionary words (tools/output_pos.txt) and the paradigm table, then
+# random words with the same syllables and lengths as those.
+#
+# The load times are with tracemalloc running (so slower than usual).
+#
+# Run from experiments/01-translation:
+#   python benchmarks/bench_compact.py
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from compact import CompactWordForm
+from compact import WordFormList
+from dictionary import read_entries
+from main import Syllable
+from main import WordForm
+
+
+WORDS = 100000
+
+
+def word_list(count=WORDS, seed=1):
+    words = {
+        e.korean for e in read_entries('tools/output_pos.txt', None)
+        if e.korean and all(c in Syllable._BY_SYLLABLE for c in e.korean)
+    }
+    with open('tools/paradigms.tsv', encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('#'):
+                words.update(w for w in line.strip().split('\t') if all(c in Syllable._BY_SYLLABLE for c in w))
+    known = sorted(words)
+    syllables = [c for w in known for c in w]
+    lengths = [len(w) for w in known]
+    rng = random.Random(seed)
+    while len(words) < count:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.choice(lengths))))
+    return sorted(words)[:count]
+
+
+def measure(build):
+    """(bytes held by what `build` returns, seconds to build it)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+if __name__ == '__main__':
+    words = word_list()
+    characters = sum(len(w) for w in words)
+    print('%d words, %d syllables' % (len(words), characters))
+
+    # Copies, so the strings of `words` are not counted as shared
+    builds = [
+        ('str', lambda: [w.encode('utf-8').decode('utf-8') for w in words]),
+        ('WordForm', lambda: [WordForm(w.encode('utf-8').decode('utf-8')) for w in words]),
+        ('CompactWordForm', lambda: [CompactWordForm(w) for w in words]),
+        ('WordFormList', lambda: WordFormList(words)),
+    ]
+    print('%-16s %12s %10s %12s %10s %12s' % ('', 'MB', 'B/word', 'B/syllable', 'load s', '.string s'))
+    for name, build in builds:
+        result, size, elapsed = measure(build)
+        start = time.perf_counter()
+        strings = [w if name == 'str' else w.string for w in result]
+        read = time.perf_counter() - start
+        assert strings == words
+        print('%-16s %12.1f %10.1f %12.1f %10.2f %12.2f' % (
+            name, size / 1e6, size / len(words), size / characters, elapsed, read
+        ))
+        del result, strings
+
+    # The same answers as WordForm
+    for w in words[:2000]:
+        compact = CompactWordForm(w)
+        form = WordForm(w)
+        assert compact.jamos == form.jamos and compact.syllables == form.syllables
+        assert compact[:-1].string == form[:-1].string
+        assert compact.append('습니다').jamos == form.append('습니다').jamos
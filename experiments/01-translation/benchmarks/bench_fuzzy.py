@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Benchmark: typo tolerant lookup (fuzzy.FuzzyLookup.suggest) on 30k
+# headwords, against a scan that checks every headword.
+#
+# The headwords are made up the same way as in bench_compact.py. The queries
+# are headwords with one or two jamos changed, so most have an answer.
+#
+# Run from experiments/01-translation:
+#   python benchmarks/bench_fuzzy.py
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_compact import word_list
+from fuzzy import FuzzyLookup
+from fuzzy import levenshtein
+from main import Syllable
+from main import WordForm
+
+
+WORDS = 30000
+QUERIES = 300
+MAX_DISTANCE = 2
+
+
+def typo(word, rng):
+    """`word` with one or two of its medial jamos swapped for another (or the word again if that is not possible)."""
+    syllables = list(word)
+    for _ in range(rng.choice([1, 2])):
+        i = rng.randrange(len(syllables))
+        s = Syllable.from_syllable(syllables[i])
+        medial = rng.choice(Syllable.MEDIAL_JAMOS)
+        syllables[i] = Syllable.from_jamos(s.jamo_initial, medial, s.jamo_final).syllable
+    return ''.join(syllables)
+
+
+def scan(lookup, word, max_distance):
+    jamos = WordForm(word).jamos
+    results = []
+    for w, j in lookup.words.items():
+        distance = levenshtein(jamos, j, max_distance)
+        if distance <= max_distance:
+            results.append((distance, w))
+    results.sort()
+    return results
+
+
+if __name__ == '__main__':
+    words = word_list(WORDS)
+    start = time.perf_counter()
+    lookup = FuzzyLookup(words, MAX_DISTANCE)
+    elapsed = time.perf_counter() - start
+    index = lookup.index
+    size = len(index._hashes) * index._hashes.itemsize + len(index._owners) * index._owners.itemsize
+    print('%d headwords indexed in %.2fs: %d deletions, %.1f MB of arrays' % (
+        len(lookup), elapsed, len(index._hashes), size / 1e6
+    ))
+
+    rng = random.Random(1)
+    queries = [typo(w, rng) for w in rng.sample(words, QUERIES)]
+
+    start = time.perf_counter()
+    found = [lookup.index.search(q, MAX_DISTANCE) for q in queries]
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    expected = [scan(lookup, q, MAX_DISTANCE) for q in queries[:30]]
+    scanned = (time.perf_counter() - start) / 30
+
+    # The index finds exactly what checking every headword finds
+    assert found[:30] == expected
+    print('index: %.2fms per query, %.1f results on average' % (indexed * 1000, sum(map(len, found)) / len(found)))
+    print('scan:  %.2fms per query' % (scanned * 1000))
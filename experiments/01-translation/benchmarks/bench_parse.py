@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Benchmark: full page parse vs the targeted (translations section only)
+# parse of WiktionaryTranslator, on the saved fixture pages.
+#
+# Run from experiments/01-translation:
+#   python benchmarks/bench_parse.py
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+
+from wiktionary_translator import WiktionaryTranslator
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools', 'fixtures', 'wiktionary')
+# page -> part of speech to look up
+PAGES = {
+    'dog': 'noun',
+    'small': 'adjective',
+    'book': 'noun',
+    'book__translations': 'noun',
+    'set': 'verb',
+}
+
+
+def parse(content, pos, fast):
+    t = WiktionaryTranslator('x', pos, 'korean', fetcher=object(), run=False)
+    t.parse(content, fast=fast)
+    return t
+
+
+def peak_memory(content, pos, fast):
+    tracemalloc.start()
+    parse(content, pos, fast)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    print('%-20s %8s %12s %12s %10s %12s %12s' % (
+        'page', 'bytes', 'full ms', 'fast ms', 'speedup', 'full peak KB', 'fast peak KB'))
+    for name, pos in PAGES.items():
+        with open(os.path.join(FIXTURES, '%s.html' % name), 'rb') as f:
+            content = f.read()
+        assert str(parse(content, pos, True)) == str(parse(content, pos, False))
+        number = 20
+        full = timeit.timeit(lambda: parse(content, pos, False), number=number) / number
+        fast = timeit.timeit(lambda: parse(content, pos, True), number=number) / number
+        print('%-20s %8d %12.2f %12.2f %9.1fx %12.0f %12.0f' % (
+            name,
+            len(content),
+            full * 1000,
+            fast * 1000,
+            full / fast,
+            peak_memory(content, pos, False) / 1024,
+            peak_memory(content, pos, True) / 1024
+        ))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Micro-benchmark: the interned, table-driven Syllable vs the original class.
+#
+# Run from experiments/01-translation:
+#   python benchmarks/bench_syllable.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from main import Syllable
+
+
+class LegacySyllable:
+    """The Syllable class as it was before interning (kept here for comparison only)."""
+    INITIAL_JAMOS = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+    MEDIAL_JAMOS = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+    FINAL_JAMOS = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+    UNICODE_HANGUL_SYLLABLE_OFFSET = 44032
+    UNICODE_INITIAL_JAMO_FACTOR = 588
+    UNICODE_MEDIAL_JAMO_FACTOR = 28
+
+    def __init__(self):
+        self.syllable = ''
+        self.jamo_initial = ''
+        self.jamo_medial = ''
+        self.jamo_final = ''
+
+    @classmethod
+    def from_syllable(cls, syllable):
+        instance = cls()
+        instance.syllable = syllable
+        instance._decompose()
+        return instance
+
+    @classmethod
+    def from_jamos(cls, jamo_initial, jamo_medial, jamo_final=' '):
+        instance = cls()
+        instance.jamo_initial = jamo_initial
+        instance.jamo_medial = jamo_medial
+        instance.jamo_final = jamo_final
+        instance._compose()
+        return instance
+
+    def _decompose(self):
+        num = ord(self.syllable) - self.UNICODE_HANGUL_SYLLABLE_OFFSET
+        n_initial = num // self.UNICODE_INITIAL_JAMO_FACTOR
+        n_medial = (num % self.UNICODE_INITIAL_JAMO_FACTOR) // self.UNICODE_MEDIAL_JAMO_FACTOR
+        n_final = (num % self.UNICODE_INITIAL_JAMO_FACTOR) % self.UNICODE_MEDIAL_JAMO_FACTOR
+        self.jamo_initial = self.INITIAL_JAMOS[n_initial]
+        self.jamo_medial = self.MEDIAL_JAMOS[n_medial]
+        self.jamo_final = self.FINAL_JAMOS[n_final]
+
+    def _compose(self):
+        n_initial = self.INITIAL_JAMOS.index(self.jamo_initial) * self.UNICODE_INITIAL_JAMO_FACTOR
+        n_medial = self.MEDIAL_JAMOS.index(self.jamo_medial) * self.UNICODE_MEDIAL_JAMO_FACTOR
+        n_final = self.FINAL_JAMOS.index(self.jamo_final)
+        self.syllable = chr(n_initial+n_medial+n_final+self.UNICODE_HANGUL_SYLLABLE_OFFSET)
+
+
+TEXT = '저는사람입니다음식이맛있다뉴욕시에살고있습니다' * 40
+JAMOS = [(s.jamo_initial, s.jamo_medial, s.jamo_final) for s in map(Syllable.from_syllable, TEXT)]
+
+
+def run(label, cls, number=50):
+    decompose = timeit.timeit(lambda: [cls.from_syllable(c) for c in TEXT], number=number)
+    compose = timeit.timeit(lambda: [cls.from_jamos(*j) for j in JAMOS], number=number)
+    total = len(TEXT) * number
+    print('%-8s from_syllable: %10.0f syllables/s   from_jamos: %10.0f syllables/s' % (
+        label,
+        total / decompose,
+        total / compose
+    ))
+    return decompose, compose
+
+
+if __name__ == '__main__':
+    legacy = run('legacy', LegacySyllable)
+    interned = run('interned', Syllable)
+    print('speedup  from_syllable: %.1fx   from_jamos: %.1fx' % (
+        legacy[0] / interned[0],
+        legacy[1] / interned[1]
+    ))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Benchmark: a 10-step WordForm.append chain, full rebuild vs copy-on-write.
+#
+# Run from experiments/01-translation:
+#   python benchmarks/bench_wordform.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from main import Syllable
+from main import WordForm
+
+
+class LegacyWordForm:
+    """WordForm as it was before (rebuilds every syllable on each append)."""
+    def __init__(self, string):
+        self.string = string
+        self.jamos = ''
+        self.syllables = [Syllable.from_syllable(c) for c in self.string]
+        self._build_jamo_sequence()
+
+    def copy(self):
+        return self.__class__(self.string)
+
+    def append(self, suffix, merge_syllables=False):
+        if merge_syllables:
+            self.syllables[-1] = self.syllables[-1].append(suffix[0])
+            self.syllables.extend([Syllable.from_syllable(c) for c in suffix[1:]])
+        else:
+            self.syllables.extend([Syllable.from_syllable(c) for c in suffix])
+        self._build_jamo_sequence()
+        self._syllabes_to_word()
+        return self
+
+    def _syllabes_to_word(self):
+        self.string = ''.join([s.syllable for s in self.syllables])
+
+    def _build_jamo_sequence(self):
+        jamos = []
+        for syllable in self.syllables:
+            jamos.append(syllable.jamo_initial)
+            jamos.append(syllable.jamo_medial)
+            if syllable.jamo_final != syllable.JAMO_NONE:
+                jamos.append(syllable.jamo_final)
+        self.jamos = ''.join(jamos)
+
+
+# 10 appends: a noun followed by a pile of particles/endings
+CHAIN = [
+    ('들', False), ('에게', False), ('서', False), ('도', False), ('요', False),
+    ('ㄴ', True), ('데', False), ('까', False), ('지', False), ('만', False),
+]
+
+
+def legacy_chain(base):
+    form = LegacyWordForm(base).copy()
+    for suffix, merge in CHAIN:
+        form.append(suffix, merge)
+    return form.string
+
+
+def cow_chain(base):
+    form = WordForm(base).copy()
+    for suffix, merge in CHAIN:
+        form = form.append(suffix, merge)
+    return form.string
+
+
+def run(base, number):
+    assert legacy_chain(base) == cow_chain(base), (legacy_chain(base), cow_chain(base))
+    legacy = timeit.timeit(lambda: legacy_chain(base), number=number)
+    cow = timeit.timeit(lambda: cow_chain(base), number=number)
+    print('base of %d syllables' % len(base))
+    print('  legacy (full rebuild): %8.0f chains/s' % (number / legacy))
+    print('  copy-on-write        : %8.0f chains/s' % (number / cow))
+    print('  speedup              : %.1fx' % (legacy / cow))
+
+
+if __name__ == '__main__':
+    run('선생님', 20000)
+    # The legacy cost grows with the length of the word, the new one does not
+    run('대한민국국립중앙박물관선생님', 10000)
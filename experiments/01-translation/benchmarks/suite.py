@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+# Benchmark suite for the hot paths (Hangul, conjugation, particles, page
+# parsing), run offline on the committed fixtures: the paradigm table and
+# dictionary output in tools/, phrases/*.txt and the saved Wiktionary pages.
+#
+# Every case runs one operation per input of its batch and reports:
+#   - ops/s: from the fastest of REPEATS timed runs over the batch
+#   - ops/ref: operations per run of `_reference` (a fixed loop timed next to
+#     every run), so a machine that is busy or slower at the moment counts
+#     less against the code
+#   - B/op: tracemalloc's peak over one run that keeps every result, per
+#     operation (so what an operation allocates and hands back)
+#
+# The results are compared with baseline.json (next to this file). A case
+# fails when its ops/ref dropped, or its B/op grew, by more than the
+# threshold and the script then exits with 1. B/op is exact from run to run;
+# ops/ref still moves by up to 25% on a noisy machine, so refresh the
+# baseline with --update where the comparison is going to run.
+#
+# Run from experiments/01-translation:
+#   python benchmarks/suite.py                  compare with the baseline
+#   python benchmarks/suite.py --threshold 0.1  fail on a 10% regression (default 30%)
+#   python benchmarks/suite.py --update         store the results as the new baseline
+#   python benchmarks/suite.py wordform         only the cases with `wordform` in their name
+
+import argparse
+import gc
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, os.path.join(HERE, '..', 'tools'))
+
+import bs4
+
+from dictionary import read_entries
+from lessons import read_phrases
+from main import Noun
+from main import Object
+from main import PresentPolite
+from main import Subject
+from main import Syllable
+from main import Topic
+from main import Verb
+from main import WordForm
+from wiktionary_translator import Document
+from wiktionary_translator import WiktionaryTranslator
+
+
+BASELINE_PATH = os.path.join(HERE, 'baseline.json')
+TOOLS = os.path.join(HERE, '..', 'tools')
+PAGES = os.path.join(TOOLS, 'fixtures', 'wiktionary')
+PHRASES = os.path.join(HERE, '..', 'phrases')
+REPEATS = 9
+REFERENCE_LOOPS = 200000
+THRESHOLD = 0.3
+
+# name -> function returning (operation, inputs); filled in by @case
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _verbs():
+    with open(os.path.join(TOOLS, 'paradigms.tsv'), encoding='utf-8') as f:
+        lemmas = [line.split('\t')[0] for line in f if not line.startswith('#')]
+    return [w for w in lemmas if all(c in Syllable._BY_SYLLABLE for c in w)]
+
+
+def _nouns():
+    return sorted({
+        e.korean for e in read_entries(os.path.join(TOOLS, 'output_pos.txt'), None)
+        if e.korean and ' ' not in e.korean and all(c in Syllable._BY_SYLLABLE for c in e.korean)
+    })
+
+
+def _page(name):
+    with open(os.path.join(PAGES, name + '.html'), 'rb') as f:
+        return f.read()
+
+
+@case('syllable.from_syllable')
+def _():
+    return Syllable.from_syllable, [c for w in _nouns() for c in w]
+
+
+@case('syllable.from_jamos')
+def _():
+    syllables = [Syllable.from_syllable(c) for w in _nouns() for c in w]
+    return (lambda s: Syllable.from_jamos(s[0], s[1], s[2])), [
+        (s.jamo_initial, s.jamo_medial, s.jamo_final) for s in syllables
+    ]
+
+
+@case('wordform.init')
+def _():
+    return WordForm, _nouns()
+
+
+@case('wordform.append')
+def _():
+    return (lambda w: w.append('습니다')), [WordForm(w) for w in _nouns()]
+
+
+@case('wordform.append_merge')
+def _():
+    return (lambda w: w.append('ㅂ니다', True)), [
+        WordForm(w[:-1]) for w in _verbs() if Syllable.from_syllable(w[-2]).jamo_final == Syllable.JAMO_NONE
+    ]
+
+
+@case('conjugation.present_polite')
+def _():
+    return PresentPolite, [Verb(w) for w in _verbs()]
+
+
+@case('particles.topic')
+def _():
+    return Topic, [Noun(w) for w in _nouns()]
+
+
+@case('particles.subject')
+def _():
+    return Subject, [Noun(w) for w in _nouns()]
+
+
+@case('particles.object')
+def _():
+    return Object, [Noun(w) for w in _nouns()]
+
+
+@case('phrases.normalize')
+def _():
+    lines = []
+    for path in sorted(glob.glob(os.path.join(PHRASES, '*.txt'))):
+        with open(path, encoding='utf-8') as f:
+            lines.extend(line for line in f if '=' in line)
+    return (lambda line: list(read_phrases([line]))), lines
+
+
+@case('document.build_nodes_by_toc')
+def _():
+    soups = [bs4.BeautifulSoup(_page(name), features='lxml') for name in ['dog', 'book', 'set']]
+
+    def build(soup):
+        doc = Document(soup)
+        doc.build_nodes_by_toc(WiktionaryTranslator._clean_heading)
+        return doc
+    return build, soups
+
+
+@case('document.extract_section')
+def _():
+    docs = []
+    for name, pos in [('dog', 'noun'), ('book', 'noun'), ('set', 'verb')]:
+        doc = Document(bs4.BeautifulSoup(_page(name), features='lxml'))
+        doc.build_nodes_by_toc(WiktionaryTranslator._clean_heading)
+        docs.append((doc, doc.find_heading([pos, 'translations'])))
+
+    def extract(item):
+        # Put the nodes back afterwards so every run extracts the same section
+        doc, heading = item
+        section = doc.extract_section(heading)
+        node = doc.toc_by_path[heading].node
+        for child in list(section.contents):
+            node.insert_after(child)
+            node = child
+        return section
+    return extract, docs
+
+
+@case('document.find_heading')
+def _():
+    docs = []
+    for name, pos in [('dog', 'noun'), ('book', 'noun'), ('set', 'verb')]:
+        doc = Document(bs4.BeautifulSoup(_page(name), features='lxml'))
+        doc.build_nodes_by_toc(WiktionaryTranslator._clean_heading)
+        docs.append((doc, [pos, 'translations']))
+
+    def find(item):
+        doc, parts = item
+        # Without the cache, or this only measures a dictionary lookup
+        doc._find_cache = {}
+        return doc.find_heading(parts)
+    return find, docs
+
+
+@case('translator.parse')
+def _():
+    def parse(item):
+        content, pos = item
+        t = WiktionaryTranslator('x', pos, 'korean', fetcher=object(), run=False)
+        t.parse(content)
+        return t
+    return parse, [(_page('dog'), 'noun'), (_page('book'), 'noun'), (_page('set'), 'verb')]
+
+
+def _reference():
+    # A fixed amount of plain Python work, timed next to every sample
+    total = 0
+    for i in range(REFERENCE_LOOPS):
+        total += i * i % 7
+    return total
+
+
+def _time(function, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return time.perf_counter() - start
+
+
+def measure(operation, inputs):
+    """
+    Returns (ops/s, ops per reference, B/op) of `operation` over `inputs`.
+
+    Ops per reference is how many operations run in the time `_reference`
+    takes, from the sample where that ratio is best. It follows the speed of
+    the machine at the time of the sample, so it is what gets compared with
+    the baseline.
+    """
+    def run():
+        return [operation(i) for i in inputs]
+
+    run()
+    gc.collect()
+    # Repeat short batches until each timed run takes at least 0.1s
+    loops = 1
+    while True:
+        elapsed = _time(run, loops)
+        if elapsed >= 0.1:
+            break
+        loops *= 2 if elapsed > 0.01 else 10
+    best = elapsed
+    best_ratio = None
+    for _ in range(REPEATS):
+        before = _time(_reference, 1)
+        elapsed = _time(run, loops)
+        reference = min(before, _time(_reference, 1))
+        best = min(best, elapsed)
+        ratio = elapsed / reference
+        best_ratio = ratio if best_ratio is None else min(best_ratio, ratio)
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    results = run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del results
+    count = len(inputs) * loops
+    return count / best, count / best_ratio, (peak - start) / len(inputs)
+
+
+def compare(results, baseline, threshold):
+    """(name, what got worse, baseline, now) of every regression beyond `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if result['ops_per_reference'] < old['ops_per_reference'] * (1 - threshold):
+            regressions.append((name, 'ops/ref', old['ops_per_reference'], result['ops_per_reference']))
+        # A few bytes either way is noise, not a regression
+        if result['bytes_per_op'] > old['bytes_per_op'] * (1 + threshold) + 16:
+            regressions.append((name, 'B/op', old['bytes_per_op'], result['bytes_per_op']))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths against baseline.json')
+    parser.add_argument('only', nargs='*', help='only run the cases with one of these in their name')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='the slowdown (or growth in B/op) that fails, as a fraction (default %(default)s)')
+    parser.add_argument('--update', action='store_true', help='store the results as the new baseline')
+    args = parser.parse_args()
+
+    try:
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except OSError:
+        baseline = {}
+
+    results = {}
+    print('%-30s %6s %12s %12s %8s %10s %8s' % ('case', 'ops', 'ops/s', 'ops/ref', 'vs base', 'B/op', 'vs base'))
+    for name, setup in CASES.items():
+        if args.only and not any(o in name for o in args.only):
+            continue
+        operation, inputs = setup()
+        ops_per_sec, ops_per_reference, bytes_per_op = measure(operation, inputs)
+        results[name] = {
+            'ops_per_sec': round(ops_per_sec, 1),
+            'ops_per_reference': round(ops_per_reference, 3),
+            'bytes_per_op': round(bytes_per_op, 1),
+        }
+        old = baseline.get(name)
+        print('%-30s %6d %12.0f %12.3f %8s %10.1f %8s' % (
+            name,
+            len(inputs),
+            ops_per_sec,
+            ops_per_reference,
+            '%+.0f%%' % (100 * (ops_per_reference / old['ops_per_reference'] - 1)) if old else '-',
+            bytes_per_op,
+            '%+.0f%%' % (100 * (bytes_per_op / old['bytes_per_op'] - 1)) if old and old['bytes_per_op'] else '-',
+        ))
+
+    if args.update:
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=1)
+            f.write('\n')
+        print('Baseline updated: %s' % BASELINE_PATH)
+        sys.exit(0)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, what, old, new in regressions:
+        print('REGRESSION %s: %s %.4g -> %.4g' % (name, what, old, new))
+    if not baseline:
+        print('No baseline yet (run with --update)')
+    sys.exit(1 if regressions else 0)
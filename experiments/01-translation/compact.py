@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Word forms that take a few bytes per syllable, for loading whole word lists.
+
+`WordForm` keeps three things per word: the string, the jamo string and a
+tuple of (shared) `Syllable`s. `CompactWordForm` keeps only the jamo indices,
+three bytes per syllable (initial, medial and final, as indexes into
+`Syllable.INITIAL_JAMOS`, `MEDIAL_JAMOS` and `FINAL_JAMOS`), and works out
+`string`, `jamos` and `syllables` when they are asked for. It has the same
+`append`/`copy`/slicing API so it can stand in for a `WordForm`.
+
+`WordFormList` goes one step further for corpora: every word lives in one
+bytearray (plus an array of offsets) and a `CompactWordForm` is only made
+when a word is looked at.
+
+Only Hangul syllables can be stored (ValueError otherwise).
+
+Run from experiments/01-translation:
+    python compact.py
+"""
+
+from array import array
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+
+from main import Syllable
+
+
+def _build_tables():
+    encoded = {}
+    decoded = {}
+    for s in Syllable._BY_SYLLABLE.values():
+        code = bytes((
+            Syllable.INITIAL_INDEX[s.jamo_initial],
+            Syllable.MEDIAL_INDEX[s.jamo_medial],
+            Syllable.FINAL_INDEX[s.jamo_final],
+        ))
+        encoded[s.syllable] = code
+        decoded[code] = s
+    return encoded, decoded
+
+
+# syllable -> its 3 bytes and back (to the shared Syllable instance)
+ENCODED: Dict[str, bytes]
+DECODED: Dict[bytes, Syllable]
+ENCODED, DECODED = _build_tables()
+WIDTH = 3
+
+
+def encode(string: str) -> bytes:
+    """The jamo indices of `string`. Raises ValueError if it is not all Hangul syllables."""
+    try:
+        return b''.join(map(ENCODED.__getitem__, string))
+    except KeyError as e:
+        raise ValueError('Cannot encode: %s (%s is not a Hangul syllable)' % (string, e.args[0]))
+
+
+def _chunks(data: bytes) -> Iterator[bytes]:
+    return (data[i:i+WIDTH] for i in range(0, len(data), WIDTH))
+
+
+class CompactWordForm:
+    """
+    A `WordForm` stored as jamo indices (`data`, 3 bytes per syllable).
+    `string`, `jamos` and `syllables` are computed on every access.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, string: str):
+        object.__setattr__(self, 'data', encode(string))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactWordForm":
+        """Wrap already encoded jamo indices (ie a slice of a WordFormList)."""
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, 'data', bytes(data))
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    @property
+    def syllables(self) -> Tuple[Syllable, ...]:
+        return tuple(map(DECODED.__getitem__, _chunks(self.data)))
+
+    @property
+    def string(self) -> str:
+        return ''.join([s.syllable for s in map(DECODED.__getitem__, _chunks(self.data))])
+
+    @property
+    def jamos(self) -> str:
+        return ''.join([s.jamos for s in map(DECODED.__getitem__, _chunks(self.data))])
+
+    def copy(self) -> "CompactWordForm":
+        # Immutable so there is nothing to copy
+        return self
+
+    def append(self, suffix: str, merge_syllables=False) -> "CompactWordForm":
+        """
+        Returns this word form with `suffix` added to the end, like
+        `WordForm.append`: with `merge_syllables` the first character of the
+        suffix becomes the final jamo of the last syllable.
+
+        Raises ValueError if the syllables cannot be merged and `merge_syllables`
+        is True.
+        """
+        if not merge_syllables:
+            return self.from_bytes(self.data + encode(suffix))
+        if suffix[0] not in Syllable.INITIAL_INDEX:
+            raise ValueError('Cannot append: %s+%s (%s must start with one of: %s)' % (
+                self.string,
+                suffix,
+                suffix,
+                Syllable.INITIAL_JAMOS
+            ))
+        last = self.data[-WIDTH:]
+        if last[2] != 0:
+            raise ValueError('Jamo final is %s -- there should not be a final jamo.' % Syllable.FINAL_JAMOS[last[2]])
+        final = Syllable.FINAL_INDEX.get(suffix[0])
+        if final is None:
+            raise ValueError('Cannot compose: %s+%s+%s (unknown jamo %s)' % (
+                Syllable.INITIAL_JAMOS[last[0]],
+                Syllable.MEDIAL_JAMOS[last[1]],
+                suffix[0],
+                suffix[0]
+            ))
+        return self.from_bytes(self.data[:-1] + bytes((final,)) + encode(suffix[1:]))
+
+    def __getitem__(self, key: slice) -> "CompactWordForm":
+        """Returns the word form made of a slice of this one's syllables (ie form[:-1] drops the last)."""
+        start, stop, step = key.indices(len(self))
+        if step == 1:
+            return self.from_bytes(self.data[start*WIDTH:stop*WIDTH])
+        return self.from_bytes(b''.join(self.data[i*WIDTH:(i+1)*WIDTH] for i in range(start, stop, step)))
+
+    def __len__(self):
+        return len(self.data) // WIDTH
+
+    def __eq__(self, other):
+        return isinstance(other, CompactWordForm) and self.data == other.data
+
+    def __hash__(self):
+        return hash(self.data)
+
+    def __repr__(self):
+        return '<%s "%s" %s>' % (
+            self.__class__.__name__,
+            self.string,
+            self.jamos
+        )
+
+
+class WordFormList:
+    """
+    Many word forms in one buffer: `data` holds every word's jamo indices
+    back to back and `offsets` where each one starts (4 bytes per word).
+    Indexing returns a `CompactWordForm`.
+    """
+    def __init__(self, words: Iterable[str] = ()):
+        self.data = bytearray()
+        self.offsets = array('I', [0])
+        self.extend(words)
+
+    def append(self, word: str):
+        self.data += encode(word)
+        self.offsets.append(len(self.data))
+
+    def extend(self, words: Iterable[str]):
+        data = self.data
+        offsets = self.offsets
+        for word in words:
+            data += encode(word)
+            offsets.append(len(data))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> CompactWordForm:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('WordFormList index out of range')
+        return CompactWordForm.from_bytes(self.data[self.offsets[index]:self.offsets[index+1]])
+
+    def __iter__(self) -> Iterator[CompactWordForm]:
+        data = self.data
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield CompactWordForm.from_bytes(data[offsets[i]:offsets[i+1]])
+
+    def strings(self) -> Iterator[str]:
+        """Every word as a string (without making the word forms)."""
+        decoded = DECODED
+        # Slices of a bytearray cannot be looked up in DECODED
+        data = bytes(self.data)
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield ''.join([decoded[data[j:j+WIDTH]].syllable for j in range(offsets[i], offsets[i+1], WIDTH)])
+
+
+if __name__ == '__main__':
+    from main import WordForm
+
+    for word, suffix, merge in [('먹', '습니다', False), ('가', 'ㅂ니다', True), ('하', 'ㄴ다', True)]:
+        compact = CompactWordForm(word).append(suffix, merge)
+        expected = WordForm(word).append(suffix, merge)
+        print(compact, compact.string == expected.string and compact.jamos == expected.jamos
+              and compact.syllables == expected.syllables)
+    print(CompactWordForm('먹습니다')[:-1], CompactWordForm('먹습니다')[::2])
+    words = WordFormList(['안녕', '고마워', '만나서'])
+    print(len(words), list(words.strings()), words[-1])
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Type Korean with Latin letters: `gamsahamnida` -> 감사함니다, `goyang-i` -> 고양이.
+
+Input goes through two small state machines, a character at a time:
+
+1. The letters are split into jamo tokens (`eo` -> ㅓ, `ch` -> ㅊ, `ng` -> ㅇ)
+   by longest match. At most 3 letters are held back, until no longer token
+   can start with them.
+2. The jamos are assembled into syllables. A consonant after a vowel is kept
+   as a pending final until the next jamo shows whether it stays there
+   (`dal` + `da` -> 달다) or starts the next syllable (`da` + `la` -> 다라).
+
+A syllable is committed (returned by `feed`) as soon as nothing that comes
+later can change it; what is still open is `preedit`. Every character costs a
+constant amount of work, there is no backtracking over the input.
+
+k, t and p are ㅋ, ㅌ and ㅍ at the start of a syllable but ㄱ, ㄷ and ㅂ at the
+end of one (like Revised Romanization writes them: meok -> 먹). A hyphen
+separates syllables explicitly (han-geul -> 한글, not 항을).
+
+Run from experiments/01-translation:
+    python composer.py
+"""
+
+from typing import Iterable
+from typing import Iterator
+
+from main import Syllable
+
+
+# Latin -> (jamo at the start of a syllable, jamo at the end of one)
+CONSONANTS = {
+    'g': ('ㄱ', 'ㄱ'), 'kk': ('ㄲ', 'ㄲ'), 'n': ('ㄴ', 'ㄴ'), 'd': ('ㄷ', 'ㄷ'), 'tt': ('ㄸ', None),
+    'r': ('ㄹ', 'ㄹ'), 'l': ('ㄹ', 'ㄹ'), 'm': ('ㅁ', 'ㅁ'), 'b': ('ㅂ', 'ㅂ'), 'pp': ('ㅃ', None),
+    's': ('ㅅ', 'ㅅ'), 'ss': ('ㅆ', 'ㅆ'), 'ng': ('ㅇ', 'ㅇ'), 'j': ('ㅈ', 'ㅈ'), 'jj': ('ㅉ', None),
+    'ch': ('ㅊ', 'ㅊ'), 'k': ('ㅋ', 'ㄱ'), 't': ('ㅌ', 'ㄷ'), 'p': ('ㅍ', 'ㅂ'), 'h': ('ㅎ', 'ㅎ'),
+}
+
+VOWELS = {
+    'a': 'ㅏ', 'ae': 'ㅐ', 'ya': 'ㅑ', 'yae': 'ㅒ', 'eo': 'ㅓ', 'e': 'ㅔ', 'yeo': 'ㅕ', 'ye': 'ㅖ', 'o': 'ㅗ',
+    'wa': 'ㅘ', 'wae': 'ㅙ', 'oe': 'ㅚ', 'yo': 'ㅛ', 'u': 'ㅜ', 'wo': 'ㅝ', 'we': 'ㅞ', 'wi': 'ㅟ', 'yu': 'ㅠ',
+    'eu': 'ㅡ', 'ui': 'ㅢ', 'i': 'ㅣ',
+}
+
+# Two finals that make a cluster (ㄹ + ㄱ -> ㄺ)
+CLUSTERS = {
+    ('ㄱ', 'ㅅ'): 'ㄳ', ('ㄴ', 'ㅈ'): 'ㄵ', ('ㄴ', 'ㅎ'): 'ㄶ', ('ㄹ', 'ㄱ'): 'ㄺ', ('ㄹ', 'ㅁ'): 'ㄻ', ('ㄹ', 'ㅂ'): 'ㄼ',
+    ('ㄹ', 'ㅅ'): 'ㄽ', ('ㄹ', 'ㅌ'): 'ㄾ', ('ㄹ', 'ㅍ'): 'ㄿ', ('ㄹ', 'ㅎ'): 'ㅀ', ('ㅂ', 'ㅅ'): 'ㅄ',
+}
+
+TOKENS = dict(VOWELS)
+TOKENS.update(CONSONANTS)
+# Every proper prefix of a token: while the held back letters are one of
+# these a longer token may still come
+PREFIXES = {token[:i] for token in TOKENS for i in range(1, len(token))}
+SEPARATOR = '-'
+
+# States of the syllable machine
+EMPTY = 0      # nothing open
+INITIAL = 1    # a consonant, waiting for its vowel
+MEDIAL = 2     # consonant + vowel
+FINAL = 3      # consonant + vowel + one pending final
+CLUSTER = 4    # consonant + vowel + two pending finals
+
+
+class Composer:
+    """Turns a stream of Latin letters into Hangul syllables."""
+    def __init__(self):
+        self.letters = ''
+        self.state = EMPTY
+        self.initial = None
+        self.medial = None
+        # The pending final(s) as (initial form, final form) pairs
+        self.finals = []
+        self.out = []
+
+    def feed(self, text: str) -> str:
+        """Type `text`; returns what got committed by it (possibly nothing)."""
+        for c in text:
+            self._letter(c)
+        out = ''.join(self.out)
+        self.out = []
+        return out
+
+    def flush(self) -> str:
+        """Commit everything that is still open (ie at the end of the input)."""
+        self._flush_letters()
+        self._commit()
+        out = ''.join(self.out)
+        self.out = []
+        return out
+
+    @property
+    def preedit(self) -> str:
+        """What is typed but not committed yet, as it would look if the input ended now."""
+        saved = (self.letters, self.state, self.initial, self.medial, list(self.finals), self.out)
+        self.out = []
+        text = self.flush()
+        self.letters, self.state, self.initial, self.medial, self.finals, self.out = saved
+        return text
+
+    # Letters -> tokens
+
+    def _letter(self, c: str):
+        c = c.lower()
+        candidate = self.letters + c
+        if candidate in PREFIXES or candidate in TOKENS:
+            self.letters = candidate
+            if candidate not in PREFIXES:
+                # Nothing longer can start like this: done
+                self.letters = ''
+                self._token(candidate)
+            return
+        if self.letters:
+            # The held back letters end here: emit the longest token they start with
+            rest = self._flush_letters()
+            for r in rest + c:
+                self._letter(r)
+            return
+        # Not a letter we know
+        self._commit()
+        if c != SEPARATOR:
+            self.out.append(c)
+
+    def _flush_letters(self) -> str:
+        """Emit the longest token at the start of the held back letters. Returns the letters left over."""
+        letters = self.letters
+        self.letters = ''
+        for end in range(len(letters), 0, -1):
+            if letters[:end] in TOKENS:
+                self._token(letters[:end])
+                return letters[end:]
+        if letters:
+            # Not the start of any token (ie a lone c): pass it through
+            self._commit()
+            self.out.append(letters[0])
+            return letters[1:]
+        return ''
+
+    # Tokens -> syllables
+
+    def _token(self, token: str):
+        if token in VOWELS:
+            self._vowel(VOWELS[token])
+        else:
+            self._consonant(CONSONANTS[token])
+
+    def _consonant(self, consonant):
+        initial, final = consonant
+        if self.state == MEDIAL and final is not None:
+            self.finals = [consonant]
+            self.state = FINAL
+        elif self.state == FINAL and (self.finals[0][1], final) in CLUSTERS:
+            self.finals.append(consonant)
+            self.state = CLUSTER
+        else:
+            self._commit()
+            self.initial = initial
+            self.state = INITIAL
+
+    def _vowel(self, vowel: str):
+        if self.state == INITIAL:
+            self.medial = vowel
+            self.state = MEDIAL
+            return
+        moves = None
+        if self.state in (FINAL, CLUSTER) and self.finals[-1][1] != 'ㅇ':
+            # The last final starts the next syllable instead (dal + a -> 다라)
+            moves = self.finals.pop()[0]
+        self._commit()
+        self.initial = moves or 'ㅇ'
+        self.medial = vowel
+        self.state = MEDIAL
+
+    def _commit(self):
+        if self.state == INITIAL:
+            # A consonant without a vowel stays a lone jamo
+            self.out.append(self.initial)
+        elif self.state != EMPTY:
+            final = Syllable.JAMO_NONE
+            if len(self.finals) == 2:
+                final = CLUSTERS[(self.finals[0][1], self.finals[1][1])]
+            elif self.finals:
+                final = self.finals[0][1]
+            self.out.append(Syllable.from_jamos(self.initial, self.medial, final).syllable)
+        self.state = EMPTY
+        self.initial = self.medial = None
+        self.finals = []
+
+
+def compose(text: str) -> str:
+    """Convert a whole string."""
+    composer = Composer()
+    return composer.feed(text) + composer.flush()
+
+
+def compose_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """Convert text arriving in pieces (ie keystrokes), yielding syllables as soon as they are final."""
+    composer = Composer()
+    for chunk in chunks:
+        out = composer.feed(chunk)
+        if out:
+            yield out
+    out = composer.flush()
+    if out:
+        yield out
+
+
+if __name__ == '__main__':
+    import time
+
+    from romanization import romanize
+
+    for text in ['annyeonghaseyo', 'gamsahamnida', 'goyang-i', 'han-geul', 'dalda', 'dalgi', 'meok', 'keuda',
+                 'hello, world!']:
+        print(text, compose(text))
+
+    # Keystroke by keystroke, with what is still being composed
+    composer = Composer()
+    for c in 'saranghae':
+        committed = composer.feed(c)
+        print('%s -> committed %r, composing %r' % (c, committed, composer.preedit))
+    print(repr(composer.flush()))
+
+    # How much of the dictionary survives Hangul -> romanization -> Hangul
+    from dictionary import read_entries
+    words = sorted({e.korean for e in read_entries('tools/output_pos.txt', None) if ' ' not in e.korean})
+    same = sum(compose(romanize(w)) == w for w in words)
+    print('%d of %d words round trip through romanize()' % (same, len(words)))
+
+    text = ' '.join(romanize(w) for w in words) * 20
+    start = time.perf_counter()
+    compose(text)
+    print('%.0f letters/s' % (len(text) / (time.perf_counter() - start)))
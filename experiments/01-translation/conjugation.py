@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+A memoized conjugation engine.
+
+`PresentPolite`, `PresentTense` and `PastTense` copy the whole `Word` and
+look at `root.jamos` every time they are used. The drill generator asks for
+the same verb/form pairs over and over so this module compiles the same rules
+into a table keyed by the end of the stem and the form, and keeps an LRU
+cache of (lemma, form) -> conjugated string on top of it.
+"""
+
+import functools
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from main import PastTense
+from main import Syllable
+from main import Word
+
+
+PRESENT_POLITE = 'present_polite'
+PRESENT_INFORMAL_LOW = 'present_informal_low'
+PAST = 'past'
+
+
+def _drop_rieul(last: Syllable) -> Syllable:
+    # Same as main.drop_rieul: 살 -> 사 before ㄴ/ㅂ/ㅅ
+    if last.jamo_final == 'ㄹ':
+        return Syllable.from_jamos(last.jamo_initial, last.jamo_medial)
+    return last
+
+
+# Each rule returns what the last syllable of the stem becomes in that form
+
+def _present_polite(last: Syllable, previous: Optional[Syllable]) -> str:
+    # Same rule as PresentPolite
+    last = _drop_rieul(last)
+    if last.jamo_final == Syllable.JAMO_NONE:
+        return last.append('ㅂ').syllable + '니다'
+    return last.syllable + '습니다'
+
+
+def _present_informal_low(last: Syllable, previous: Optional[Syllable]) -> str:
+    # Same rule as PresentTense.informalLow (for verbs)
+    last = _drop_rieul(last)
+    if last.jamo_final != Syllable.JAMO_NONE:
+        return last.syllable + '는다'
+    return last.append('ㄴ').syllable + '다'
+
+
+def _past(last: Syllable, previous: Optional[Syllable]) -> str:
+    # Same rule as PastTense
+    base = PastTense.base_inflection(last, previous)
+    return base[:-1] + Syllable.from_syllable(base[-1]).append('ㅆ').syllable + '다'
+
+
+class ConjugationEngine:
+    """
+    Conjugates verbs and adjectives (given by their dictionary form, ie 먹다).
+
+    `RULES` maps each form to a function of the stem's last syllable (and the
+    one before it) that returns what that syllable turns into. Only the end
+    of the stem matters so each rule is evaluated once per (syllable, form)
+    and stored in `table`; conjugating is then a table lookup plus string
+    slicing.
+
+    `cache_size` is the number of (lemma, form) results kept (None for
+    unbounded, 0 to disable caching).
+    """
+    RULES = {
+        PRESENT_POLITE: _present_polite,
+        PRESENT_INFORMAL_LOW: _present_informal_low,
+        PAST: _past,
+    }
+
+    def __init__(self, cache_size: int = 4096):
+        self.forms = tuple(self.RULES)
+        # (last syllable, previous syllable's vowel is bright, form) -> replacement
+        self.table: Dict[Tuple[str, bool, str], str] = {}
+        self._cached_conjugate = functools.lru_cache(maxsize=cache_size)(self._conjugate)
+
+    def conjugate(self, lemma: Union[str, Word], form: str) -> str:
+        """
+        Returns `lemma` conjugated into `form`.
+
+        Raises ValueError if the lemma does not end in 다 or the form is unknown.
+        """
+        if isinstance(lemma, Word):
+            lemma = lemma.lemma.string
+        return self._cached_conjugate(lemma, form)
+
+    def conjugate_all(self, lemmas: Iterable[Union[str, Word]], forms: Iterable[str] = None) -> Dict[str, Dict[str, str]]:
+        """Returns {lemma: {form: conjugation}} for every lemma in every form (default: all forms)."""
+        forms = self.forms if forms is None else tuple(forms)
+        results = {}
+        for lemma in lemmas:
+            if isinstance(lemma, Word):
+                lemma = lemma.lemma.string
+            results[lemma] = {form: self._cached_conjugate(lemma, form) for form in forms}
+        return results
+
+    def _conjugate(self, lemma: str, form: str) -> str:
+        if not lemma.endswith('다') or len(lemma) < 2:
+            raise ValueError('%s does not end in 다 did you spell it correctly?' % lemma)
+        stem = lemma[:-1]
+        last = Syllable._BY_SYLLABLE.get(stem[-1])
+        if last is None:
+            raise ValueError('Cannot conjugate %s: %s is not a Hangul syllable' % (lemma, stem[-1]))
+        previous = Syllable._BY_SYLLABLE.get(stem[-2]) if len(stem) > 1 else None
+        # Only an open ㅡ syllable looks at the syllable before it
+        bright = (
+            previous is not None
+            and last.jamo_medial == 'ㅡ'
+            and last.jamo_final == Syllable.JAMO_NONE
+            and previous.jamo_medial in PastTense.BRIGHT_VOWELS
+        )
+        key = (last.syllable, bright, form)
+        replacement = self.table.get(key)
+        if replacement is None:
+            rule = self.RULES.get(form)
+            if rule is None:
+                raise ValueError('Unknown form %s (expected one of: %s)' % (form, ', '.join(self.forms)))
+            replacement = self.table[key] = rule(last, previous if bright else None)
+        return stem[:-1] + replacement
+
+    @property
+    def hits(self) -> int:
+        return self._cached_conjugate.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        return self._cached_conjugate.cache_info().misses
+
+    def cache_info(self):
+        return self._cached_conjugate.cache_info()
+
+    def cache_clear(self):
+        self._cached_conjugate.cache_clear()
+
+
+_default_engine = ConjugationEngine()
+
+
+def conjugate(lemma: Union[str, Word], form: str) -> str:
+    """Conjugate with the shared module-level engine."""
+    return _default_engine.conjugate(lemma, form)
+
+
+def conjugate_all(lemmas: Iterable[Union[str, Word]], forms: Iterable[str] = None) -> Dict[str, Dict[str, str]]:
+    """Conjugate every lemma into every form with the shared module-level engine."""
+    return _default_engine.conjugate_all(lemmas, forms)
+
+
+if __name__ == '__main__':
+    from main import PresentPolite
+    from main import PresentTense
+    from main import Verb
+
+    verbs = ['이다', '먹다', '있다', '가다', '배우다', '하다', '살다', '자다', '마시다', '읽다', '바쁘다', '쓰다', '오다']
+    engine = ConjugationEngine(cache_size=128)
+    table = engine.conjugate_all(verbs)
+    for lemma in verbs:
+        informal = PresentTense(Verb(lemma))
+        informal.informalLow()
+        assert table[lemma][PRESENT_POLITE] == PresentPolite(Verb(lemma)).word.inflection.string
+        assert table[lemma][PRESENT_INFORMAL_LOW] == informal.word.inflection.string
+        assert table[lemma][PAST] == PastTense(Verb(lemma)).word.inflection.string
+        print(lemma, table[lemma])
+    # ㄹ drops before ㄴ/ㅂ/ㅅ
+    assert table['살다'][PRESENT_POLITE] == '삽니다' and table['살다'][PRESENT_INFORMAL_LOW] == '산다'
+
+    engine.conjugate_all(verbs)
+    print(engine.cache_info())
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Reads the human-readable translations written by tools/wiktionary_translator.py
+(tools/output.txt and tools/output_pos.txt) back into structured entries.
+
+The files are blocks of:
+
+    dog:
+    	animal: 개(ko)(gae),견(ko)(gyeon)(犬(ko)),구(ko)(gu)(狗(ko))
+    	morally reprehensible person, : 개같은놈(gaegateunnom)
+
+Each translation is a Korean form optionally preceded by a qualifier in
+parentheses and followed by `(ko)`, a romanization and the hanja.
+"""
+
+import re
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+
+HANGUL_RE = re.compile('[가-힣]')
+HANJA_RE = re.compile('[㐀-鿿豈-﫿]')
+
+
+class Entry:
+    """A single Korean translation of an English headword."""
+    def __init__(self, english, meaning, korean, romanization='', hanja='', qualifiers=None, pos=''):
+        self.english = english
+        self.meaning = meaning
+        self.korean = korean
+        self.romanization = romanization
+        self.hanja = hanja
+        self.qualifiers = qualifiers or []
+        self.pos = pos
+
+    def __repr__(self):
+        return '<%s %s = %s (%s)>' % (
+            self.__class__.__name__,
+            self.english,
+            self.korean,
+            self.romanization
+        )
+
+
+def _split_top_level(text: str, separator: str = ',') -> List[str]:
+    """Split `text` on `separator` but not inside parentheses."""
+    parts = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(text):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth = max(depth-1, 0)
+        elif c == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i+1
+    parts.append(text[start:])
+    return parts
+
+
+def _groups(text: str) -> List[str]:
+    """Return the top level parenthesized groups of `text` (without the parentheses)."""
+    groups = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(text):
+        if c == '(':
+            if depth == 0:
+                start = i+1
+            depth += 1
+        elif c == ')' and depth:
+            depth -= 1
+            if depth == 0:
+                groups.append(text[start:i])
+    return groups
+
+
+def parse_translation(english: str, meaning: str, item: str, pos: str = '') -> Optional[Entry]:
+    """
+    Parse a single translation (ie `견(ko)(gyeon)(犬(ko))`) into an Entry.
+
+    Returns None if the item does not start with Korean once its leading
+    qualifiers are taken off.
+    """
+    item = item.strip()
+    qualifiers = []
+    # Leading qualifiers: (pleaseverify)소(ko)(so) or (mouse or rat)쥐(ko)(jwi)
+    while item.startswith('('):
+        end = item.find(')')
+        if end < 0:
+            break
+        qualifiers.append(item[1:end])
+        item = item[end+1:]
+    match = HANGUL_RE.search(item)
+    if match is None or match.start() != 0:
+        return None
+    paren = item.find('(')
+    korean = (item if paren < 0 else item[:paren]).strip()
+    romanization = ''
+    hanja = ''
+    for group in _groups(item[len(korean):]):
+        if group == 'ko':
+            continue
+        if HANJA_RE.search(group):
+            hanja = group.replace('(ko)', '')
+        elif not romanization and not HANGUL_RE.search(group) and group.isascii() and group not in (
+                'predicative', 'attributive'):
+            romanization = group
+        else:
+            qualifiers.append(group)
+    return Entry(english, meaning, korean, romanization, hanja, qualifiers, pos)
+
+
+def parse_blocks(lines: Iterator[str]) -> Iterator[Entry]:
+    """Yield an Entry for every Korean translation in the lines of an output file."""
+    english = None
+    for line in lines:
+        if not line.strip():
+            continue
+        if not line[0].isspace():
+            english = line.strip().rstrip(':')
+            continue
+        meaning, _, translations = line.strip().rpartition(':')
+        for item in _split_top_level(translations):
+            entry = parse_translation(english, meaning.strip(), item)
+            if entry is not None:
+                yield entry
+
+
+def read_word_pos(path: str = 'tools/most_common_words_wpos.txt') -> Dict[str, str]:
+    """Return {english word: part of speech} from the `word, pos` word list."""
+    pos = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.strip().split(',')
+            if len(parts) < 2 or not parts[1].strip():
+                continue
+            pos[parts[0].strip().lower()] = parts[1].strip().lower()
+    return pos
+
+
+def read_entries(path: str = 'tools/output_pos.txt', pos_path: str = 'tools/most_common_words_wpos.txt') -> List[Entry]:
+    """Return every Korean translation in an output file, tagged with its part of speech if known."""
+    pos = read_word_pos(pos_path) if pos_path else {}
+    with open(path, encoding='utf-8') as f:
+        entries = list(parse_blocks(f))
+    for entry in entries:
+        entry.pos = pos.get(entry.english, '')
+    return entries
+
+
+if __name__ == '__main__':
+    entries = read_entries()
+    print('%d entries' % len(entries))
+    for entry in entries[:10]:
+        print(entry, entry.pos, entry.hanja, entry.qualifiers)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Typo tolerant lookup of Korean headwords.
+
+Distances are computed on the jamo sequence (`WordForm.jamos`) so 베우다 vs
+배우다 is a single substitution (ㅔ -> ㅐ) instead of a whole syllable. The
+headwords are kept in a symmetric delete index so a query only compares
+against the few headwords that share a deletion with it.
+
+To have `Noun`/`Verb`/`Adjective` check their lemma against the dictionary:
+
+    from main import Word
+    Word.lexicon = FuzzyLookup.from_output()
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Set
+from typing import Tuple
+
+from main import WordForm
+
+
+def levenshtein(a: str, b: str, limit: int = None) -> int:
+    """
+    Return the edit distance between `a` and `b`.
+
+    If `limit` is given the computation stops as soon as the distance is
+    known to be larger than it (and returns limit+1).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit+1
+    previous = list(range(len(b)+1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j-1] + 1,
+                previous[j-1] + (ca != cb)
+            ))
+        if limit is not None and min(current) > limit:
+            return limit+1
+        previous = current
+    return previous[-1]
+
+
+def jamo_distance(a: str, b: str) -> int:
+    """Return the edit distance between two Korean words, counted in jamos."""
+    return levenshtein(WordForm(a).jamos, WordForm(b).jamos)
+
+
+def deletions(jamos: str, count: int) -> Set[str]:
+    """Every string made by deleting up to `count` characters of `jamos` (including `jamos` itself)."""
+    found = {jamos}
+    frontier = found
+    for _ in range(count):
+        frontier = {s[:i] + s[i+1:] for s in frontier for i in range(len(s))}
+        found |= frontier
+    return found
+
+
+class DeleteIndex:
+    """
+    A symmetric delete index of jamo sequences.
+
+    Two strings are within `max_distance` edits of each other only if deleting
+    up to `max_distance` characters from each can make them equal, so every
+    deletion of every headword is indexed and a query looks up its own
+    deletions: the candidates are then checked with `levenshtein`. That is a
+    few dozen lookups and checks per query instead of a walk over the whole
+    dictionary.
+
+    To keep it small (a 30k word dictionary has about a million deletions) the
+    deletions are kept as their hashes in a sorted array('q') next to an
+    array('I') of the headword they came from, 12 bytes per deletion. Hash
+    collisions only add candidates, which the check throws out.
+    """
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        # distinct jamo sequences and the words that decompose to each
+        self.keys: List[str] = []
+        self.words: List[List[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._hashes = array('q')
+        self._owners = array('I')
+        # How many of them are sorted (the rest were added since)
+        self._sorted = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, word: str, jamos: str = None):
+        jamos = WordForm(word).jamos if jamos is None else jamos
+        n = self._ids.get(jamos)
+        if n is not None:
+            if word not in self.words[n]:
+                self.words[n].append(word)
+            return
+        n = self._ids[jamos] = len(self.keys)
+        self.keys.append(jamos)
+        self.words.append([word])
+        found = deletions(jamos, self.max_distance)
+        self._hashes.extend(map(hash, found))
+        self._owners.extend([n] * len(found))
+
+    def sort(self):
+        """Merge the words added since the last search (search does it when needed, this does it up front)."""
+        if self._sorted == len(self._hashes):
+            return
+        hashes = self._hashes
+        order = sorted(range(len(hashes)), key=hashes.__getitem__)
+        self._hashes = array('q', map(hashes.__getitem__, order))
+        self._owners = array('I', map(self._owners.__getitem__, order))
+        self._sorted = len(self._hashes)
+
+    def search(self, word: str, max_distance: int = 2) -> List[Tuple[int, str]]:
+        """Return (distance, word) for every word within `max_distance` jamo edits, closest first."""
+        if max_distance > self.max_distance:
+            raise ValueError('Cannot search %d edits away in an index of %d' % (max_distance, self.max_distance))
+        self.sort()
+        jamos = WordForm(word).jamos
+        hashes = self._hashes
+        owners = self._owners
+        candidates = set()
+        for d in deletions(jamos, max_distance):
+            h = hash(d)
+            i = bisect_left(hashes, h)
+            while i < len(hashes) and hashes[i] == h:
+                candidates.add(owners[i])
+                i += 1
+        results = []
+        for n in candidates:
+            distance = levenshtein(jamos, self.keys[n], max_distance)
+            if distance <= max_distance:
+                results.extend((distance, w) for w in self.words[n])
+        results.sort()
+        return results
+
+
+class FuzzyLookup:
+    """Exact and typo tolerant lookup of a set of Korean headwords."""
+    def __init__(self, words: Iterable[str], max_distance: int = 2):
+        self.words: Dict[str, str] = {}
+        self.index = DeleteIndex(max_distance)
+        for word in words:
+            if word in self.words:
+                continue
+            jamos = WordForm(word).jamos
+            self.words[word] = jamos
+            self.index.add(word, jamos)
+        self.index.sort()
+
+    @classmethod
+    def from_output(cls, path: str = 'tools/output_pos.txt') -> "FuzzyLookup":
+        """Build the lookup from the Korean translations in a translator output file."""
+        from dictionary import read_entries
+        return cls(entry.korean for entry in read_entries(path, None) if ' ' not in entry.korean)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def suggest(self, word: str, max_distance: int = 2, limit: int = 5) -> List[str]:
+        """Return up to `limit` known words within `max_distance` jamo edits of `word`, closest first."""
+        return [w for d, w in self.index.search(word, max_distance) if w != word][:limit]
+
+
+if __name__ == '__main__':
+    import time
+    import warnings
+
+    from main import Verb
+    from main import Word
+
+    start = time.perf_counter()
+    lookup = FuzzyLookup.from_output()
+    print('Loaded %d headwords in %.3fs' % (len(lookup), time.perf_counter() - start))
+
+    print(jamo_distance('베우다', '배우다'))
+    for query in ['베우다', '고양위', '돼지', '가르치댜']:
+        start = time.perf_counter()
+        suggestions = lookup.suggest(query)
+        print('%s -> %s (%.2fms)' % (query, suggestions, (time.perf_counter() - start) * 1000))
+
+    Word.lexicon = lookup
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        Verb('베우다')
+    for w in caught:
+        print(w.message)
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Builds the `phrases.js` of every lesson from plain text sources and
+`js/lessons.js`, the index of all of them.
+
+A source has one phrase per line, `english = korean` (like phrases/*.txt):
+    - phrases/<name>.txt                  -> lessons/<name>/phrases.js
+    - lessons/<name>/phrases.txt          -> lessons/<name>/phrases.js
+    - concepts/<name>/phrases.txt         -> concepts/<name>/phrases.js
+
+The Korean is normalized (NFC, single spaces, Hangul typed as separate jamos
+like ㅎㅏㄴ is composed into 한) and every Hangul word must end up made of
+whole syllables; lines that are not are reported and left out. A lesson
+without an index.html gets one, made from lessons/01/index.html.
+
+Rebuilds are incremental. `.build.json` (in lessons/) keeps the size, mtime
+and sha256 of every source along with its phrases: a source whose size and
+mtime did not change is not even read, one whose content did not change is not
+parsed again, and a file is only written when its content is different. So
+after editing one source only that lesson (and the index) is written again.
+
+Run from experiments/01-translation:
+    python lessons.py
+    python lessons.py --force   (rebuild every lesson)
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from composer import CLUSTERS
+from main import Syllable
+from main import WordForm
+
+
+ROOT = '../..'
+STATE_PATH = 'lessons/.build.json'
+INDEX_PATH = 'js/lessons.js'
+TEMPLATE_PATH = 'lessons/01/index.html'
+# Part of the state: changing how lessons are built rebuilds all of them
+BUILD_VERSION = 1
+
+# (source pattern, lesson directory), relative to ROOT; {name} is the file
+# name without .txt or the name of the folder holding phrases.txt
+SOURCES = [
+    ('experiments/01-translation/phrases/*.txt', 'lessons/{name}'),
+    ('lessons/*/phrases.txt', 'lessons/{name}'),
+    ('concepts/*/phrases.txt', 'concepts/{name}'),
+]
+
+HEADER = '// Built by experiments/01-translation/lessons.py from %s -- edit that instead\n'
+HANGUL_WORD_RE = re.compile('[ᄀ-ᇿ㄰-㆏가-힣]+')
+TITLE_RE = re.compile(r'<title>.*?</title>')
+
+
+class PhraseError(ValueError):
+    pass
+
+
+def _compose_jamos(word: str) -> str:
+    """Compose runs of separately typed jamos (ㅎㅏㄴㄱㅡㄹ -> 한글); anything else is kept as is."""
+    out = []
+    i = 0
+    n = len(word)
+    while i < n:
+        initial = word[i]
+        if initial in Syllable.INITIAL_INDEX and i + 1 < n and word[i+1] in Syllable.MEDIAL_INDEX:
+            medial = word[i+1]
+            i += 2
+            final = Syllable.JAMO_NONE
+            # A consonant is a final unless a vowel follows it (then it starts the next syllable)
+            if i < n and word[i] in Syllable.FINAL_INDEX and not (i + 1 < n and word[i+1] in Syllable.MEDIAL_INDEX):
+                final = word[i]
+                i += 1
+                if i < n and (final, word[i]) in CLUSTERS and not (i + 1 < n and word[i+1] in Syllable.MEDIAL_INDEX):
+                    final = CLUSTERS[(final, word[i])]
+                    i += 1
+            out.append(Syllable.from_jamos(initial, medial, final).syllable)
+        else:
+            out.append(initial)
+            i += 1
+    return ''.join(out)
+
+
+def normalize_korean(korean: str) -> str:
+    """
+    The Korean of a phrase in a canonical form. Raises PhraseError if a
+    Hangul word is not made of whole syllables (ie a stray ㅎ).
+    """
+    korean = ' '.join(unicodedata.normalize('NFC', korean).split())
+    if not korean:
+        raise PhraseError('No Korean')
+
+    def word(match):
+        text = match.group(0)
+        if any(c not in Syllable._BY_SYLLABLE for c in text):
+            text = _compose_jamos(text)
+            missing = ''.join(c for c in text if c not in Syllable._BY_SYLLABLE)
+            if missing:
+                raise PhraseError('%s is not made of whole syllables (%s)' % (match.group(0), missing))
+        return WordForm(text).string
+
+    return HANGUL_WORD_RE.sub(word, korean)
+
+
+def read_phrases(lines: Iterable[str], path: str = '') -> Iterator[Tuple[str, str]]:
+    """(english, korean) of every `english = korean` line. Bad lines are reported and skipped."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        english, equals, korean = line.partition('=')
+        english = ' '.join(english.split())
+        try:
+            if not equals or not english:
+                raise PhraseError('Not an `english = korean` line')
+            yield english, normalize_korean(korean)
+        except PhraseError as e:
+            print('%s:%d: %s: %r' % (path, number, e, line.strip()))
+
+
+def js_string(text: str) -> str:
+    return "'%s'" % text.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def phrases_js(phrases: List[Tuple[str, str]], source: str) -> str:
+    """A phrases.js (the way the lessons have always been written, with a header saying where it came from)."""
+    lines = [HEADER % source, 'let phrases = [\n']
+    for english, korean in phrases:
+        lines.append('\tnew Phrase(%s,%s),\n' % (js_string(english), js_string(korean)))
+    lines.append('];\n')
+    return ''.join(lines)
+
+
+def index_js(lessons: Dict[str, List[Tuple[str, str]]]) -> str:
+    """js/lessons.js: every lesson directory and its phrases (needs js/phrase.js)."""
+    lines = [HEADER % 'the lesson sources', 'let lessons = {\n']
+    for directory, phrases in sorted(lessons.items()):
+        lines.append('\t%s: [\n' % js_string(directory))
+        for english, korean in phrases:
+            lines.append('\t\tnew Phrase(%s,%s),\n' % (js_string(english), js_string(korean)))
+        lines.append('\t],\n')
+    lines.append('};\n')
+    return ''.join(lines)
+
+
+def find_sources(root: str = ROOT) -> Dict[str, str]:
+    """lesson directory -> its source, both relative to `root`. A phrases.txt in the lesson folder wins."""
+    sources = {}
+    for pattern, directory in SOURCES:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            if os.path.basename(path) == 'phrases.txt':
+                name = os.path.basename(os.path.dirname(path))
+            else:
+                name = os.path.splitext(os.path.basename(path))[0]
+            sources[directory.format(name=name)] = relative
+    return sources
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    """Write `text` to `path` (atomically) unless it already holds exactly that. Returns True if written."""
+    data = text.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _load_state(path: str) -> Dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != BUILD_VERSION:
+        return {}
+    return state.get('lessons', {})
+
+
+def _read_source(path: str, name: str) -> Tuple[str, List[Tuple[str, str]]]:
+    # Hash the bytes and parse the lines in the same pass over the file
+    digest = hashlib.sha256()
+
+    def lines():
+        with open(path, 'rb') as f:
+            for line in f:
+                digest.update(line)
+                yield line.decode('utf-8-sig')
+
+    phrases = list(read_phrases(lines(), name))
+    return digest.hexdigest(), phrases
+
+
+def build(root: str = ROOT, force: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    Bring every lesson under `root` up to date with its source. Returns
+    (lessons whose source was parsed, files written), relative to `root`.
+    """
+    state_path = os.path.join(root, STATE_PATH)
+    old = {} if force else _load_state(state_path)
+    lessons = {}
+    parsed = []
+    written = []
+    template = None
+    for directory, source in sorted(find_sources(root).items()):
+        source_path = os.path.join(root, source)
+        output = directory + '/phrases.js'
+        output_path = os.path.join(root, output)
+        stat = os.stat(source_path)
+        entry = old.get(directory)
+        if entry is not None and (entry['source'] != source or not os.path.exists(output_path)):
+            entry = None
+        if entry is None or entry['bytes'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+            digest, phrases = None, None
+            if entry is not None:
+                # Touched but maybe not changed: only parse it if the content is different
+                with open(source_path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            if entry is None or digest != entry['sha256']:
+                digest, phrases = _read_source(source_path, source)
+                parsed.append(directory)
+                if write_if_changed(output_path, phrases_js(phrases, source)):
+                    written.append(output)
+            else:
+                phrases = [tuple(p) for p in entry['phrases']]
+            entry = {'source': source, 'bytes': stat.st_size, 'mtime': stat.st_mtime, 'sha256': digest,
+                     'phrases': phrases}
+        lessons[directory] = entry
+
+        page = os.path.join(root, directory, 'index.html')
+        if not os.path.exists(page):
+            if template is None:
+                with open(os.path.join(root, TEMPLATE_PATH), encoding='utf-8') as f:
+                    template = f.read()
+            title = os.path.basename(directory).replace('_', ' ').capitalize()
+            write_if_changed(page, TITLE_RE.sub(lambda m: "<title>Sunmi's Korean Lessons - %s</title>" % title,
+                                                template, 1))
+            written.append(directory + '/index.html')
+
+    # Both are cheap to render from the state and only written when they changed
+    if write_if_changed(os.path.join(root, INDEX_PATH),
+                        index_js({d: [tuple(p) for p in e['phrases']] for d, e in lessons.items()})):
+        written.append(INDEX_PATH)
+    write_if_changed(state_path, json.dumps({'version': BUILD_VERSION, 'lessons': lessons},
+                                            ensure_ascii=False, indent=1) + '\n')
+    return parsed, written
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    start = time.perf_counter()
+    parsed, written = build(force='--force' in sys.argv)
+    print('%d lessons parsed, %d files written in %.1fms' % (
+        len(parsed), len(written), (time.perf_counter() - start) * 1000
+    ))
+    for path in written:
+        print('\t' + path)
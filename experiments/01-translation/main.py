@@ -3,6 +3,8 @@
 
 from typing import Union
 from typing import List
+from typing import Tuple
+import warnings
 
 
 class Syllable:
@@ -19,8 +21,14 @@ class Syllable:
     allows conversion from a list of 2 or 3 jamos to one of the 11,000+ unicode
     syllable blocks (and vice versa).
 
+    Syllables are immutable. Every precomposed block has exactly one shared
+    instance (built once, when the module is loaded) so `from_syllable` and
+    `from_jamos` are plain dictionary lookups and never allocate.
+
     See https://en.wikipedia.org/wiki/Korean_language_and_computers for more info.
     """
+    __slots__ = ('syllable', 'jamo_initial', 'jamo_medial', 'jamo_final', 'jamos')
+
     INITIAL_JAMOS = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
     MEDIAL_JAMOS = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
     FINAL_JAMOS = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
@@ -28,41 +36,60 @@ class Syllable:
     UNICODE_HANGUL_SYLLABLE_OFFSET = 44032
     UNICODE_INITIAL_JAMO_FACTOR = 588
     UNICODE_MEDIAL_JAMO_FACTOR = 28
+    UNICODE_HANGUL_SYLLABLE_COUNT = 11172
+
+    # jamo -> index lookups (filled in below the class definition)
+    INITIAL_INDEX = {}
+    MEDIAL_INDEX = {}
+    FINAL_INDEX = {}
+
+    # The shared instances, keyed by syllable block and by (initial, medial, final)
+    _BY_SYLLABLE = {}
+    _BY_JAMOS = {}
+
+    def __init__(self, syllable: str = '', jamo_initial: str = '', jamo_medial: str = '', jamo_final: str = ''):
+        object.__setattr__(self, 'syllable', syllable)
+        object.__setattr__(self, 'jamo_initial', jamo_initial)
+        object.__setattr__(self, 'jamo_medial', jamo_medial)
+        object.__setattr__(self, 'jamo_final', jamo_final)
+        # The 2 or 3 jamos of this syllable as a string (ie ㄴㅡㄴ or ㄷㅏ)
+        object.__setattr__(self, 'jamos', jamo_initial + jamo_medial + (
+            jamo_final if jamo_final != self.JAMO_NONE else ''
+        ))
 
-    def __init__(self):
-        self.syllable = ''
-        self.jamo_initial = ''
-        self.jamo_medial = ''
-        self.jamo_final = ''
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
 
     @classmethod
-    def from_syllable(cls, syllable: str):
+    def from_syllable(cls, syllable: str) -> "Syllable":
         """Return a Syllable created from a unicode syllable block (ie 이 or 름)"""
-        instance = cls()
-        instance.syllable = syllable
-        instance._decompose()
+        instance = cls._BY_SYLLABLE.get(syllable)
+        if instance is None:
+            # Not a precomposed block -- decompose it the slow way (uncached)
+            instance = cls(*cls._decompose(syllable))
         return instance
 
     @classmethod
-    def from_jamos(cls, jamo_initial: str, jamo_medial: str, jamo_final: str = ' '):
+    def from_jamos(cls, jamo_initial: str, jamo_medial: str, jamo_final: str = ' ') -> "Syllable":
         """Return a Syllable created from indipendently specified jamos (ie ㅇ,ㅣ or ㄹ,ㅡ,ㅁ)"""
-        instance = cls()
-        instance.jamo_initial = jamo_initial
-        instance.jamo_medial = jamo_medial
-        instance.jamo_final = jamo_final
-        instance._compose()
+        instance = cls._BY_JAMOS.get((jamo_initial, jamo_medial, jamo_final))
+        if instance is None:
+            # _compose raises the ValueError for us
+            instance = cls(cls._compose(jamo_initial, jamo_medial, jamo_final), jamo_initial, jamo_medial, jamo_final)
         return instance
 
-    def append(self, jamo_final: str):
+    def append(self, jamo_final: str) -> "Syllable":
         """
-        Sets the final jamo to the one specified.
+        Returns the syllable with the final jamo set to the one specified.
 
         Raises ValueError if the final jamo has already been defined.
         """
         if self.jamo_final != self.JAMO_NONE:
-            raise ValueError('Jamo final is %s -- there should not be a final jamo.')
-        self.jamo_final = jamo_final
-        self._compose()
+            raise ValueError('Jamo final is %s -- there should not be a final jamo.' % self.jamo_final)
+        return self.from_jamos(self.jamo_initial, self.jamo_medial, jamo_final)
 
     def endswith(self, jamo: str):
         """
@@ -73,20 +100,50 @@ class Syllable:
             return self.jamo_final == jamo
         return self.jamo_medial == jamo
 
-    def _decompose(self):
-        num = ord(self.syllable) - self.UNICODE_HANGUL_SYLLABLE_OFFSET
-        n_initial = num // self.UNICODE_INITIAL_JAMO_FACTOR
-        n_medial = (num % self.UNICODE_INITIAL_JAMO_FACTOR) // self.UNICODE_MEDIAL_JAMO_FACTOR
-        n_final = (num % self.UNICODE_INITIAL_JAMO_FACTOR) % self.UNICODE_MEDIAL_JAMO_FACTOR
-        self.jamo_initial = self.INITIAL_JAMOS[n_initial]
-        self.jamo_medial = self.MEDIAL_JAMOS[n_medial]
-        self.jamo_final = self.FINAL_JAMOS[n_final]
-
-    def _compose(self):
-        n_initial = self.INITIAL_JAMOS.index(self.jamo_initial) * self.UNICODE_INITIAL_JAMO_FACTOR
-        n_medial = self.MEDIAL_JAMOS.index(self.jamo_medial) * self.UNICODE_MEDIAL_JAMO_FACTOR
-        n_final = self.FINAL_JAMOS.index(self.jamo_final)
-        self.syllable = chr(n_initial+n_medial+n_final+self.UNICODE_HANGUL_SYLLABLE_OFFSET)
+    @classmethod
+    def _decompose(cls, syllable: str):
+        num = ord(syllable) - cls.UNICODE_HANGUL_SYLLABLE_OFFSET
+        n_initial = num // cls.UNICODE_INITIAL_JAMO_FACTOR
+        n_medial = (num % cls.UNICODE_INITIAL_JAMO_FACTOR) // cls.UNICODE_MEDIAL_JAMO_FACTOR
+        n_final = (num % cls.UNICODE_INITIAL_JAMO_FACTOR) % cls.UNICODE_MEDIAL_JAMO_FACTOR
+        return (
+            syllable,
+            cls.INITIAL_JAMOS[n_initial],
+            cls.MEDIAL_JAMOS[n_medial],
+            cls.FINAL_JAMOS[n_final]
+        )
+
+    @classmethod
+    def _compose(cls, jamo_initial: str, jamo_medial: str, jamo_final: str) -> str:
+        try:
+            n_initial = cls.INITIAL_INDEX[jamo_initial] * cls.UNICODE_INITIAL_JAMO_FACTOR
+            n_medial = cls.MEDIAL_INDEX[jamo_medial] * cls.UNICODE_MEDIAL_JAMO_FACTOR
+            n_final = cls.FINAL_INDEX[jamo_final]
+        except KeyError as e:
+            raise ValueError('Cannot compose: %s+%s+%s (unknown jamo %s)' % (
+                jamo_initial,
+                jamo_medial,
+                jamo_final,
+                e.args[0]
+            ))
+        return chr(n_initial+n_medial+n_final+cls.UNICODE_HANGUL_SYLLABLE_OFFSET)
+
+    @classmethod
+    def _build_tables(cls):
+        cls.INITIAL_INDEX = {j: i for i, j in enumerate(cls.INITIAL_JAMOS)}
+        cls.MEDIAL_INDEX = {j: i for i, j in enumerate(cls.MEDIAL_JAMOS)}
+        cls.FINAL_INDEX = {j: i for i, j in enumerate(cls.FINAL_JAMOS)}
+        by_syllable = {}
+        by_jamos = {}
+        for n in range(cls.UNICODE_HANGUL_SYLLABLE_COUNT):
+            instance = cls(*cls._decompose(chr(n+cls.UNICODE_HANGUL_SYLLABLE_OFFSET)))
+            by_syllable[instance.syllable] = instance
+            by_jamos[(instance.jamo_initial, instance.jamo_medial, instance.jamo_final)] = instance
+        cls._BY_SYLLABLE = by_syllable
+        cls._BY_JAMOS = by_jamos
+
+    def __reduce__(self):
+        return (self.__class__.from_syllable, (self.syllable,))
 
     def __repr__(self):
         return '<%s %s (%s,%s,%s)>' % (
@@ -98,31 +155,67 @@ class Syllable:
         )
 
 
+Syllable._build_tables()
+
+hangul_vowels = tuple(Syllable.MEDIAL_JAMOS)
+hangul_consonants = tuple(Syllable.FINAL_JAMOS.strip())
+
+
 class WordForm:
     """
     A representation of a Korean word. It contains the full unicode representation
     in `string` and the same word represented as unicode sequence of jamos in
     `jamos`.
+
+    Word forms are immutable: `append` returns a new form which shares the
+    unchanged syllables with this one and only decomposes the suffix, so a
+    chain of appends costs O(suffix) per step instead of rebuilding the whole
+    word every time.
     """
+    __slots__ = ('string', 'jamos', 'syllables')
+
     def __init__(self, string: str):
-        self.string: str = string
-        self.jamos: str = ''
-        self.syllables: List[Syllable] = [Syllable.from_syllable(c) for c in self.string]
-        self._build_jamo_sequence()
+        syllables = self._to_syllables(string)
+        _set = object.__setattr__
+        _set(self, 'string', string)
+        _set(self, 'jamos', ''.join([s.jamos for s in syllables]))
+        _set(self, 'syllables', syllables)
+
+    @staticmethod
+    def _to_syllables(string: str) -> Tuple[Syllable, ...]:
+        try:
+            return tuple(map(Syllable._BY_SYLLABLE.__getitem__, string))
+        except KeyError:
+            return tuple(map(Syllable.from_syllable, string))
+
+    @classmethod
+    def _from_parts(cls, string: str, jamos: str, syllables: Tuple[Syllable, ...]) -> "WordForm":
+        instance = cls.__new__(cls)
+        _set = object.__setattr__
+        _set(instance, 'string', string)
+        _set(instance, 'jamos', jamos)
+        _set(instance, 'syllables', syllables)
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s is immutable' % self.__class__.__name__)
 
     def copy(self) -> "WordForm":
-        return self.__class__(self.string)
+        # Immutable so there is nothing to copy
+        return self
 
-    def append(self, suffix: str, merge_syllables=False):
+    def append(self, suffix: str, merge_syllables=False) -> "WordForm":
         """
-        Adds `suffix` to the end of this word form. If `merge_syllables` is True then
-        it use the first character of the suffix as the last jamo of the last syllable
-        in this word. Otherwise, by default, it will simply put attach`suffix`.
+        Returns this word form with `suffix` added to the end. If `merge_syllables` is
+        True then it use the first character of the suffix as the last jamo of the last
+        syllable in this word. Otherwise, by default, it will simply put attach`suffix`.
 
         Raises ValueError if the syllables cannot be merged and `merge_syllables`
         is True.
         """
-        # Currently operates in place... should we make it return a new copy?
         if merge_syllables:
             if suffix[0] not in Syllable.INITIAL_JAMOS:
                 raise ValueError('Cannot append: %s+%s (%s must start with one of: %s)' % (
@@ -131,25 +224,32 @@ class WordForm:
                     suffix,
                     Syllable.INITIAL_JAMOS
                 ))
-            self.syllables[-1].append(suffix[0])
-            self.syllables.extend([Syllable.from_syllable(c) for c in suffix[1:]])
-        else:
-            self.syllables.extend([Syllable.from_syllable(c) for c in suffix])
-        self._build_jamo_sequence()
-        self._syllabes_to_word()
-        return self
+            last = self.syllables[-1]
+            merged = last.append(suffix[0])
+            tail = self._to_syllables(suffix[1:])
+            return self._from_parts(
+                self.string[:-1] + merged.syllable + suffix[1:],
+                self.jamos + suffix[0] + ''.join([s.jamos for s in tail]),
+                self.syllables[:-1] + (merged,) + tail
+            )
+        tail = self._to_syllables(suffix)
+        return self._from_parts(
+            self.string + suffix,
+            self.jamos + ''.join([s.jamos for s in tail]),
+            self.syllables + tail
+        )
 
-    def _syllabes_to_word(self):
-        self.string = ''.join([s.syllable for s in self.syllables])
+    def __getitem__(self, key: slice) -> "WordForm":
+        """Returns the word form made of a slice of this one's syllables (ie form[:-1] drops the last)."""
+        syllables = self.syllables[key]
+        return self._from_parts(
+            self.string[key],
+            ''.join([s.jamos for s in syllables]),
+            syllables
+        )
 
-    def _build_jamo_sequence(self):
-        jamos = []
-        for syllable in self.syllables:
-            jamos.append(syllable.jamo_initial)
-            jamos.append(syllable.jamo_medial)
-            if syllable.jamo_final != syllable.JAMO_NONE:
-                jamos.append(syllable.jamo_final)
-        self.jamos = ''.join(jamos)
+    def __len__(self):
+        return len(self.syllables)
 
     def _repr_word(self):
         return '<%s %s>' % (
@@ -180,16 +280,30 @@ class Word:
     attached to.
     The inflection is the "conjugated" form of the verb/adjective or the noun
     with particles attached.
+
+    Word forms are immutable so all three start out as the same WordForm and
+    only diverge when one of them is replaced.
+
+    If `lexicon` is set (ie to a `fuzzy.FuzzyLookup`) every new word is checked
+    against it and a warning suggests corrections for unknown words.
     """
+    lexicon = None
+
     def __init__(self, lemma: str):
         self.lemma: WordForm = WordForm(lemma)
-        self.root: WordForm = WordForm(lemma)
-        self.inflection: WordForm = WordForm(lemma)
+        self.root: WordForm = self.lemma
+        self.inflection: WordForm = self.lemma
+        if self.lexicon is not None and lemma not in self.lexicon:
+            suggestions = self.lexicon.suggest(lemma)
+            if suggestions:
+                warnings.warn('%s is not in the dictionary, did you mean: %s?' % (
+                    lemma,
+                    ', '.join(suggestions)
+                ))
 
     def copy(self) -> "Word":
-        word = Word(self.lemma.string)
-        word.root = self.root.copy()
-        word.inflection = self.inflection.copy()
+        word = self.__class__.__new__(self.__class__)
+        word.__dict__.update(self.__dict__)
         return word
 
 
@@ -206,34 +320,68 @@ class Noun(Word):
         )
 
 
-class Topic(Noun):
-    """A noun which indicates the topic of a statement (or the 은/는 particle)."""
+# Particle families as (after a final consonant, after a vowel)
+TOPIC_PARTICLES = ('은', '는')
+SUBJECT_PARTICLES = ('이', '가')
+OBJECT_PARTICLES = ('을', '를')
+
+
+def has_batchim(word: str) -> bool:
+    """
+    Returns True if `word` ends in a final consonant (batchim), looking only
+    at its last codepoint. A trailing standalone consonant jamo counts as a
+    batchim; anything else that is not a Hangul syllable does not.
+
+    Raises ValueError if `word` is empty (there is no particle to choose).
+    """
+    if not word:
+        raise ValueError('Cannot check the batchim of an empty word')
+    n = ord(word[-1]) - Syllable.UNICODE_HANGUL_SYLLABLE_OFFSET
+    if 0 <= n < Syllable.UNICODE_HANGUL_SYLLABLE_COUNT:
+        return n % Syllable.UNICODE_MEDIAL_JAMO_FACTOR != 0
+    return word[-1] in hangul_consonants
+
+
+def choose_particle(word: str, particles: Tuple[str, str]) -> str:
+    """Returns the particle of the family (ie TOPIC_PARTICLES) that goes after `word`."""
+    return particles[0] if has_batchim(word) else particles[1]
+
+
+def attach_particle(word: str, particles: Tuple[str, str]) -> str:
+    """Returns `word` with the right particle of the family attached (ie 저+TOPIC_PARTICLES = 저는)."""
+    return word + (particles[0] if has_batchim(word) else particles[1])
+
+
+def attach_particles(words: List[str], particles: Tuple[str, str]) -> List[str]:
+    """Returns every word in `words` with the right particle of the family attached."""
+    with_batchim, without_batchim = particles
+    return [w + (with_batchim if has_batchim(w) else without_batchim) for w in words]
+
+
+class _ParticleNoun(Noun):
+    """A noun with the particle from `PARTICLES` attached to its inflection."""
+    PARTICLES: Tuple[str, str] = ('', '')
+
     def __init__(self, word: Noun):
-        Noun.__init__(self, word.lemma.string)
-        if self.root.jamos.endswith(hangul_vowels):
-            self.inflection.append('는')
-        else:
-            self.inflection.append('은')
+        # Share the (immutable) lemma instead of re-parsing it
+        self.lemma = word.lemma
+        self.root = word.lemma
+        self.inflection = self.root.append(choose_particle(self.root.string, self.PARTICLES))
+
 
+class Topic(_ParticleNoun):
+    """A noun which indicates the topic of a statement (or the 은/는 particle)."""
+    PARTICLES = TOPIC_PARTICLES
 
-class Subject(Noun):
+
+class Subject(_ParticleNoun):
     """A noun which indicates the subject of a statement (or the 이/가 particle)."""
-    def __init__(self, word: Noun):
-        Noun.__init__(self, word.lemma.string)
-        if self.root.jamos.endswith(hangul_vowels):
-            self.inflection.append('가')
-        else:
-            self.inflection.append('이')
+    PARTICLES = SUBJECT_PARTICLES
 
 
-class Object(Noun):
+class Object(_ParticleNoun):
     """A noun which indicates the object of an action (or the 을/를 particle)."""
-    def __init__(self, word: Noun):
-        Noun.__init__(self, word.lemma.string)
-        if self.root.jamos.endswith(hangul_vowels):
-            self.inflection.append('를')
-        else:
-            self.inflection.append('을')
+    PARTICLES = OBJECT_PARTICLES
 
 
 class Adjective(Word):
@@ -241,7 +389,7 @@ class Adjective(Word):
     def __init__(self, lemma: str):
         Word.__init__(self, lemma)
         if self.lemma.string.endswith('다'):
-            self.root = WordForm(self.lemma.string[:-1])
+            self.root = self.lemma[:-1]
         else:
             raise ValueError('%s does not end in 다 did you spell it correctly?')
 
@@ -258,7 +406,7 @@ class Verb(Word):
     def __init__(self, lemma: str):
         Word.__init__(self, lemma)
         if self.lemma.string.endswith('다'):
-            self.root = WordForm(self.lemma.string[:-1])
+            self.root = self.lemma[:-1]
         else:
             raise ValueError('%s does not end in 다 did you spell it correctly?')
 
@@ -280,15 +428,27 @@ class Conjugation:
         )
 
 
+def drop_rieul(root: WordForm) -> WordForm:
+    """
+    Returns `root` without the final ㄹ of its last syllable (살 -> 사), the
+    way ㄹ stems lose it before an ending starting with ㄴ, ㅂ or ㅅ. Any
+    other root is returned as is.
+    """
+    last = root.syllables[-1]
+    if last.jamo_final != 'ㄹ':
+        return root
+    return WordForm(root[:-1].string + Syllable.from_jamos(last.jamo_initial, last.jamo_medial).syllable)
+
+
 class PresentPolite(Conjugation):
     """The polite tone, present tense conjugation for verbs and adjectives."""
     def __init__(self, word: Union[Verb, Adjective]):
         self.word: Word = word.copy()
-        self.word.inflection = self.word.root.copy()
-        if self.word.root.jamos.endswith(hangul_vowels):
-            self.word.inflection.append('ㅂ니다', True)
+        root = drop_rieul(self.word.root)
+        if root.jamos.endswith(hangul_vowels):
+            self.word.inflection = root.append('ㅂ니다', True)
         else:
-            self.word.inflection.append('습니다')
+            self.word.inflection = root.append('습니다')
 
 
 class PresentTense(Conjugation):
@@ -296,41 +456,78 @@ class PresentTense(Conjugation):
         self.word: Word = word.copy()
 
     def informalLow(self):
-        self.word.inflection = self.word.root.copy()
-        if self.word.root.jamos.endswith(hangul_consonants):
-            self.word.inflection.append('는다')
+        """
+        The plain present (먹는다, 간다, 산다). Adjectives have no such ending:
+        their plain present is the dictionary form (작다).
+        """
+        if isinstance(self.word, Adjective):
+            self.word.inflection = self.word.lemma
+            return
+        root = drop_rieul(self.word.root)
+        if root.jamos.endswith(hangul_consonants):
+            self.word.inflection = root.append('는다')
         else:
-            self.word.inflection.append('ㄴ다', True)
+            self.word.inflection = root.append('ㄴ다', True)
 
 
 class PastTense(Conjugation):
-    # NOTE THIS IS UNFINISHED!
+    """
+    The plain past tense conjugation for verbs and adjectives (ie 먹었다, 갔다, 했다).
+
+    The stem first gets the 아/어 ending (the "base inflection") and the past
+    marker ㅆ merges into its last syllable. Only the regular contractions are
+    handled; ㄷ/ㅂ/ㅅ/르/ㅎ irregular verbs come out as if they were regular.
+    """
+    # Vowels of a final open syllable that absorb the 아/어 (ie 오+아 = 와)
+    CONTRACTIONS = {
+        'ㅏ': 'ㅏ',  # 아+아 = 아
+        'ㅗ': 'ㅘ',  # 오+아 = 와
+        'ㅓ': 'ㅓ',  # 어+어 = 어
+        'ㅕ': 'ㅕ',  # 여+어 = 여
+        'ㅜ': 'ㅝ',  # 우+어 = 워
+        'ㅣ': 'ㅕ',  # 이+어 = 여
+        'ㅐ': 'ㅐ',  # 애+어 = 애
+        'ㅔ': 'ㅔ',  # 에+어 = 에
+        'ㅚ': 'ㅙ',  # 외+어 = 왜
+    }
+    # Vowels that take 아 instead of 어
+    BRIGHT_VOWELS = ('ㅏ', 'ㅗ', 'ㅑ', 'ㅛ')
+
     def __init__(self, word: Union[Verb, Adjective]):
         self.word: Word = word.copy()
+        self._build_base_inflection()
+        self.word.inflection = self.word.inflection.append('ㅆ다', True)
+
+    @classmethod
+    def base_inflection(cls, last: Syllable, previous: Syllable = None) -> str:
+        """
+        Returns what the last syllable of a stem becomes with the 아/어 ending
+        attached (ie 먹 -> 먹어, 가 -> 가, 배우 -> 배워). `previous` is the syllable
+        before it (if any), only needed for stems ending in ㅡ (바쁘 -> 바빠).
+        """
+        if last.syllable == '하':
+            # 하+여 = 해
+            return '해'
+        if last.jamo_final != Syllable.JAMO_NONE:
+            if last.jamo_medial in cls.BRIGHT_VOWELS:
+                return last.syllable + '아'
+            return last.syllable + '어'
+        if last.jamo_medial in cls.CONTRACTIONS:
+            return Syllable.from_jamos(last.jamo_initial, cls.CONTRACTIONS[last.jamo_medial]).syllable
+        if last.jamo_medial == 'ㅡ':
+            # The ㅡ drops out: 쓰 -> 써, 바쁘 -> 바빠
+            if previous is not None and previous.jamo_medial in cls.BRIGHT_VOWELS:
+                return Syllable.from_jamos(last.jamo_initial, 'ㅏ').syllable
+            return Syllable.from_jamos(last.jamo_initial, 'ㅓ').syllable
+        if last.jamo_medial in cls.BRIGHT_VOWELS:
+            return last.syllable + '아'
+        return last.syllable + '어'
 
     def _build_base_inflection(self):
-        if self.word.root.string.endswith('하'):
-            pass
-
-        # add a ㅏ
-        elif self.word.root.jamos.endswith(('ㅏ','ㅗ','ㅑ','ㅛ')):
-            # 아+아 = 아
-            if self.word.root.jamos.endswith('ㅏ'):
-                pass
-            # 오 + 아 = 와
-            if self.word.root.jamos.endswith('ㅗ'):
-                self.word.inflection.jamos[-i] = 'ㅘ'
-
-        # add a ㅓ
-        else:
-            if self.word.root.jamos.endswith('ㅜ'):
-                self.word.inflection.jamos[-i] = 'ㅝ'
-            if self.word.root.jamos.endswith('ㅣ'):
-                self.word.inflection.jamos[-i] = 'ㅕ'
-            if self.word.root.jamos.endswith('ㅓ'):
-                pass
-            if self.word.root.jamos.endswith('ㅕ'):
-                self.word.inflection.jamos[-i] = 'ㅕ'
+        root = self.word.root
+        previous = root.syllables[-2] if len(root) > 1 else None
+        self.word.inflection = root[:-1].append(self.base_inflection(root.syllables[-1], previous))
+
 
 def stuff1():
     be = Verb('이다')
@@ -390,17 +587,13 @@ def stuff1():
     print(x_has_y(teacher, table))
     print(x_has_y(doctor, chair))
 
-    # Text to speech
-    from win32com.client import Dispatch
-    speak = Dispatch("SAPI.SpVoice")
-
-    for v in speak.GetVoices():
-        print(v.GetDescription())
-    speak.Voice = speak.GetVoices().Item(3)
-    speak.Rate = 0.5
-
-    print(speak.Speak("Hello world!"))
-    print(speak.Speak(x_has_y(doctor, chair)))
+    # Text to speech: each phrase is rendered once (in tools/.audio_cache) and
+    # spoken the way it is pronounced, not the way it is spelled
+    from tts import SapiBackend
+    from tts import Tts
+    tts = Tts(SapiBackend(), voice='Korean', rate=0.5, pronounce=True)
+    tts.speak("Hello world!")
+    tts.speak(x_has_y(doctor, chair))
 
     # 저 = I, me (formal)
     # 나 = I, me (informal)
@@ -413,11 +606,8 @@ def stuff1():
 
 if __name__ == '__main__':
 
-    hangul_vowels = tuple('ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ')
-    hangul_consonants = tuple('ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ')
-
     eat = Verb('먹다')
-    learn = Verb('베우다')
+    learn = Verb('배우다')
     verbs = [eat, learn]
 
     for v in verbs:
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+A precomputed table of every conjugation of every verb and adjective we know.
+
+`build` collects the Korean verbs/adjectives from the translated word list
+(tools/output_pos.txt, tagged with the part of speech from
+tools/most_common_words_wpos.txt), conjugates them into every form of the
+`ConjugationEngine` across a process pool and writes them to a tab separated
+table (one lemma per line, one column per form).
+
+`Paradigms` loads that table into two dictionaries:
+    - (lemma, form) -> surface form
+    - surface form -> [(lemma, form), ...]
+so conjugating and lemmatizing are both single lookups.
+
+Run from experiments/01-translation:
+    python paradigm.py
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from conjugation import ConjugationEngine
+from conjugation import PRESENT_INFORMAL_LOW
+from conjugation import PRESENT_POLITE
+from dictionary import read_entries
+
+
+PARADIGM_PATH = 'tools/paradigms.tsv'
+PREDICATE_POS = ('verb', 'adjective')
+WORD_RE = re.compile('[가-힣]+')
+
+
+def collect_lemmas(path: str = 'tools/output_pos.txt', pos_path: str = 'tools/most_common_words_wpos.txt') -> List[Tuple[str, str]]:
+    """Return the sorted, unique (lemma, pos) of every Korean verb/adjective in the translations."""
+    lemmas = set()
+    for entry in read_entries(path, pos_path):
+        if entry.pos in PREDICATE_POS and entry.korean.endswith('다') and len(entry.korean) > 1:
+            lemmas.add((entry.korean, entry.pos))
+    return sorted(lemmas)
+
+
+def _conjugate_chunk(chunk: List[Tuple[str, str]]) -> List[Tuple[str, str, List[str]]]:
+    # Runs in a worker process: one engine per process, no cache needed
+    engine = ConjugationEngine(cache_size=0)
+    rows = []
+    for lemma, pos in chunk:
+        try:
+            forms = engine.conjugate_all([lemma])[lemma]
+        except ValueError as e:
+            print('Error with %s' % lemma)
+            print(e)
+            continue
+        if pos == 'adjective':
+            # No 는다/ㄴ다 for adjectives: their plain present is the dictionary form
+            forms[PRESENT_INFORMAL_LOW] = lemma
+        rows.append((lemma, pos, [forms[f] for f in engine.forms]))
+    return rows
+
+
+def build(lemmas: List[Tuple[str, str]], path: str = PARADIGM_PATH, workers: int = None, chunk_size: int = 64):
+    """Conjugate every (lemma, pos) across a process pool and write the table to `path`."""
+    forms = ConjugationEngine.RULES.keys()
+    chunks = [lemmas[i:i+chunk_size] for i in range(0, len(lemmas), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_conjugate_chunk, chunks)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('#lemma\tpos\t%s\n' % '\t'.join(forms))
+            for rows in results:
+                for lemma, pos, surfaces in rows:
+                    f.write('%s\t%s\t%s\n' % (lemma, pos, '\t'.join(surfaces)))
+    os.replace(tmp_path, path)
+
+
+class Paradigms:
+    """The loaded paradigm table with forward and reverse indexes."""
+    def __init__(self, path: str = PARADIGM_PATH):
+        self.forms: Tuple[str, ...] = ()
+        self.pos: Dict[str, str] = {}
+        self.by_lemma: Dict[Tuple[str, str], str] = {}
+        self.by_surface: Dict[str, List[Tuple[str, str]]] = {}
+        self._load(path)
+
+    def _load(self, path: str):
+        with open(path, encoding='utf-8') as f:
+            header = f.readline().rstrip('\n').split('\t')
+            self.forms = tuple(header[2:])
+            for line in f:
+                columns = line.rstrip('\n').split('\t')
+                lemma, pos, surfaces = columns[0], columns[1], columns[2:]
+                self.pos[lemma] = pos
+                for form, surface in zip(self.forms, surfaces):
+                    self.by_lemma[(lemma, form)] = surface
+                    self.by_surface.setdefault(surface, []).append((lemma, form))
+
+    def conjugate(self, lemma: str, form: str) -> str:
+        """Returns the surface form of `lemma` in `form`. Raises KeyError if it is not in the table."""
+        return self.by_lemma[(lemma, form)]
+
+    def lemmatize(self, surface: str) -> List[Tuple[str, str]]:
+        """Returns every (lemma, form) that conjugates to `surface` (empty if none do)."""
+        return self.by_surface.get(surface, [])
+
+    def lemmatize_text(self, text: str) -> Iterable[Tuple[str, str, str]]:
+        """Yields (word, lemma, form) for every Hangul word in `text` found in the table."""
+        for match in WORD_RE.finditer(text):
+            word = match.group(0)
+            for lemma, form in self.by_surface.get(word, []):
+                yield word, lemma, form
+
+
+if __name__ == '__main__':
+    import glob
+    import time
+
+    start = time.perf_counter()
+    lemmas = collect_lemmas()
+    build(lemmas)
+    print('Built %d lemmas in %.2fs' % (len(lemmas), time.perf_counter() - start))
+
+    # ㄹ stems drop the ㄹ and adjectives have no 는다/ㄴ다 form
+    check_path = PARADIGM_PATH + '.check'
+    build([('사다', 'verb'), ('살다', 'verb'), ('작다', 'adjective')], check_path)
+    check = Paradigms(check_path)
+    os.remove(check_path)
+    assert check.conjugate('살다', PRESENT_POLITE) == '삽니다'
+    assert check.lemmatize('산다') == [('사다', PRESENT_INFORMAL_LOW), ('살다', PRESENT_INFORMAL_LOW)]
+    assert check.conjugate('작다', PRESENT_INFORMAL_LOW) == '작다'
+
+    paradigms = Paradigms()
+    for path in sorted(glob.glob('phrases/*.txt')):
+        with open(path, encoding='utf-8') as f:
+            for word, lemma, form in paradigms.lemmatize_text(f.read()):
+                print('%s: %s = %s (%s)' % (path, word, lemma, form))
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+How Korean is pronounced rather than spelled: 있습니다 -> 읻씀니다.
+
+Text to speech reads the spelling, but the standard sound changes (liaison,
+nasalization, ㄹ assimilation, aspiration, tensification, palatalization and
+final consonant neutralization) all happen where a final jamo meets the
+initial jamo of the next syllable. So every (final, next initial, next vowel
+is ㅣ) combination is worked out once, when the module is loaded, into
+`RULES`: what the final and the initial become. Converting text is then a
+single left to right pass that holds back one syllable (whose final is only
+known once the next syllable is seen), so whole phrase files convert in
+linear time.
+
+The rules apply within a word; at a space (or anything that is not Hangul) a
+final is pronounced as it would be at the end of a word.
+
+Run from experiments/01-translation:
+    python pronunciation.py
+"""
+
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+
+from main import Syllable
+
+
+NONE = Syllable.JAMO_NONE
+
+# The sound a final is reduced to before a consonant or at the end of a word
+REPRESENTATIVE = {
+    NONE: NONE, 'ㄱ': 'ㄱ', 'ㄲ': 'ㄱ', 'ㄳ': 'ㄱ', 'ㄴ': 'ㄴ', 'ㄵ': 'ㄴ', 'ㄶ': 'ㄴ', 'ㄷ': 'ㄷ', 'ㄹ': 'ㄹ',
+    'ㄺ': 'ㄱ', 'ㄻ': 'ㅁ', 'ㄼ': 'ㄹ', 'ㄽ': 'ㄹ', 'ㄾ': 'ㄹ', 'ㄿ': 'ㅂ', 'ㅀ': 'ㄹ', 'ㅁ': 'ㅁ', 'ㅂ': 'ㅂ',
+    'ㅄ': 'ㅂ', 'ㅅ': 'ㄷ', 'ㅆ': 'ㄷ', 'ㅇ': 'ㅇ', 'ㅈ': 'ㄷ', 'ㅊ': 'ㄷ', 'ㅋ': 'ㄱ', 'ㅌ': 'ㄷ', 'ㅍ': 'ㅂ', 'ㅎ': 'ㄷ',
+}
+
+# Clusters split in two before a vowel: 읽어 -> 일거
+CLUSTER_PARTS = {
+    'ㄳ': ('ㄱ', 'ㅅ'), 'ㄵ': ('ㄴ', 'ㅈ'), 'ㄶ': ('ㄴ', 'ㅎ'), 'ㄺ': ('ㄹ', 'ㄱ'), 'ㄻ': ('ㄹ', 'ㅁ'), 'ㄼ': ('ㄹ', 'ㅂ'),
+    'ㄽ': ('ㄹ', 'ㅅ'), 'ㄾ': ('ㄹ', 'ㅌ'), 'ㄿ': ('ㄹ', 'ㅍ'), 'ㅀ': ('ㄹ', 'ㅎ'), 'ㅄ': ('ㅂ', 'ㅅ'),
+}
+
+# ㄱ, ㄷ and ㅂ become the nasal of the same place before ㄴ/ㅁ: 국물 -> 궁물
+NASAL = {'ㄱ': 'ㅇ', 'ㄷ': 'ㄴ', 'ㅂ': 'ㅁ'}
+# ㅎ next to these makes them aspirated: 좋고 -> 조코, 축하 -> 추카
+ASPIRATED = {'ㄱ': 'ㅋ', 'ㄷ': 'ㅌ', 'ㅂ': 'ㅍ', 'ㅈ': 'ㅊ'}
+# After ㄱ, ㄷ or ㅂ these become tense: 학교 -> 학꾜
+TENSE = {'ㄱ': 'ㄲ', 'ㄷ': 'ㄸ', 'ㅂ': 'ㅃ', 'ㅅ': 'ㅆ', 'ㅈ': 'ㅉ'}
+
+
+def _rule(final: str, initial: str, before_i: bool) -> Tuple[str, str]:
+    """What a final and the initial after it are pronounced as."""
+    if final == NONE:
+        return NONE, initial
+
+    if initial == 'ㅇ':
+        # Liaison: the final moves over (ㅇ stays and ㅎ is silent)
+        if final == 'ㅇ':
+            return final, initial
+        stays, moves = CLUSTER_PARTS.get(final, (NONE, final))
+        if moves == 'ㅎ':
+            # 좋아 -> 조아, 않아 -> 아나
+            return NONE, 'ㅇ' if stays == NONE else stays
+        if stays != NONE and moves == 'ㅅ':
+            # 값이 -> 갑씨
+            moves = 'ㅆ'
+        if before_i and moves in ('ㄷ', 'ㅌ'):
+            # Palatalization: 굳이 -> 구지, 같이 -> 가치
+            moves = 'ㅈ' if moves == 'ㄷ' else 'ㅊ'
+        return stays, moves
+
+    if final in ('ㅎ', 'ㄶ', 'ㅀ'):
+        stays = {'ㅎ': NONE, 'ㄶ': 'ㄴ', 'ㅀ': 'ㄹ'}[final]
+        if initial in ('ㄱ', 'ㄷ', 'ㅈ'):
+            # 좋다 -> 조타, 않고 -> 안코
+            return stays, ASPIRATED[initial]
+        if initial == 'ㅅ':
+            # 좋습니다 -> 조씀니다
+            return stays, 'ㅆ'
+        if initial == 'ㄴ':
+            # 놓는 -> 논는, 싫네 -> 실레
+            return ('ㄹ', 'ㄹ') if final == 'ㅀ' else ('ㄴ', 'ㄴ')
+        final = REPRESENTATIVE[final]
+
+    representative = REPRESENTATIVE[final]
+    if initial == 'ㅎ':
+        stays, last = CLUSTER_PARTS.get(final, (NONE, final))
+        if last not in ASPIRATED:
+            # 옷하고 -> 오타고 (ㅅ sounds like ㄷ there)
+            last = REPRESENTATIVE[last]
+        if last in ASPIRATED:
+            if last == 'ㄷ' and before_i:
+                # 닫히다 -> 다치다
+                return stays, 'ㅊ'
+            # 축하 -> 추카, 읽히다 -> 일키다
+            return stays, ASPIRATED[last]
+        return final, initial
+
+    if initial in ('ㄴ', 'ㅁ') and representative in NASAL:
+        return NASAL[representative], initial
+
+    if initial == 'ㄹ':
+        if representative in ('ㄴ', 'ㄹ'):
+            # 신라 -> 실라
+            return 'ㄹ', 'ㄹ'
+        if representative in ('ㅁ', 'ㅇ'):
+            # 심리 -> 심니
+            return representative, 'ㄴ'
+        if representative in NASAL:
+            # 독립 -> 동닙
+            return NASAL[representative], 'ㄴ'
+
+    if representative == 'ㄹ' and initial == 'ㄴ':
+        # 설날 -> 설랄
+        return 'ㄹ', 'ㄹ'
+
+    if representative in NASAL and initial in TENSE:
+        # 있습니다 -> 읻씀니다, 학교 -> 학꾜
+        return representative, TENSE[initial]
+
+    return representative, initial
+
+
+def _build_rules() -> Dict[Tuple[str, str, bool], Tuple[str, str]]:
+    return {
+        (final, initial, before_i): _rule(final, initial, before_i)
+        for final in Syllable.FINAL_JAMOS
+        for initial in Syllable.INITIAL_JAMOS
+        for before_i in (False, True)
+    }
+
+
+# (final, next initial, next vowel is ㅣ) -> (final, next initial) as pronounced
+RULES = _build_rules()
+
+
+def _transduce(text: str) -> Iterator:
+    """Yield (initial, medial, final) for every Hangul syllable as pronounced and every other character as is."""
+    rules = RULES
+    decomposed = Syllable._BY_SYLLABLE
+    previous = None
+    for c in text:
+        s = decomposed.get(c)
+        if s is None:
+            if previous is not None:
+                yield previous[0], previous[1], REPRESENTATIVE[previous[2]]
+                previous = None
+            yield c
+            continue
+        initial = s.jamo_initial
+        if previous is not None:
+            final, initial = rules[(previous[2], initial, s.jamo_medial == 'ㅣ')]
+            yield previous[0], previous[1], final
+        previous = (initial, s.jamo_medial, s.jamo_final)
+    if previous is not None:
+        yield previous[0], previous[1], REPRESENTATIVE[previous[2]]
+
+
+def pronounce(text: str) -> str:
+    """`text` written the way it is pronounced (as Hangul syllables): 있습니다 -> 읻씀니다"""
+    compose = Syllable._BY_JAMOS
+    return ''.join(
+        compose[part].syllable if isinstance(part, tuple) else part
+        for part in _transduce(text)
+    )
+
+
+def pronounce_jamos(text: str) -> str:
+    """Like `pronounce` but as a sequence of jamos (like `WordForm.jamos`): 있습니다 -> ㅇㅣㄷㅆㅡㅁㄴㅣㄷㅏ"""
+    return ''.join(
+        (part[0] + part[1] + (part[2] if part[2] != NONE else '')) if isinstance(part, tuple) else part
+        for part in _transduce(text)
+    )
+
+
+def pronounce_stream(lines: Iterable[str]) -> Iterator[str]:
+    """Convert a file (or any iterable of lines) lazily, one line at a time."""
+    for line in lines:
+        yield pronounce(line)
+
+
+if __name__ == '__main__':
+    import glob
+    import time
+
+    examples = {
+        '있습니다': '읻씀니다',
+        '맛있다': '마싣따',
+        '먹었어요': '머거써요',
+        '한국어': '한구거',
+        '좋아요': '조아요',
+        '좋다': '조타',
+        '놓는': '논는',
+        '같이': '가치',
+        '학교': '학꾜',
+        '신라': '실라',
+        '심리': '심니',
+        '독립': '동닙',
+        '국물': '궁물',
+        '감사합니다': '감사함니다',
+        '읽다': '익따',
+        '읽어': '일거',
+        '값이': '갑씨',
+        '축하': '추카',
+        '닫히다': '다치다',
+        '않아': '아나',
+        '싫어': '시러',
+    }
+    for spelling, expected in examples.items():
+        got = pronounce(spelling)
+        print('%s -> %s %s' % (spelling, got, '' if got == expected else '(expected %s)' % expected))
+    print(pronounce_jamos('있습니다'))
+
+    text = ''
+    for path in sorted(glob.glob('phrases/*.txt')):
+        with open(path, encoding='utf-8') as f:
+            text += f.read()
+    for line in list(pronounce_stream(text.splitlines()))[:3]:
+        print(line)
+    text *= 200
+    start = time.perf_counter()
+    pronounce(text)
+    print('%.0f characters/s' % (len(text) / (time.perf_counter() - start)))
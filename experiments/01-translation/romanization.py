@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Revised Romanization of Korean (ie 고양이 -> goyang-i, 합니다 -> hamnida).
+
+A consonant is romanized by where it ends up being pronounced, so the result
+depends on the consonant before it: 먹어 is meogeo (the final ㄱ moves to the
+next syllable), 먹는 is meongneun (ㄱ becomes ng before ㄴ) and 좋고 is joko (ㅎ
+aspirates the ㄱ). Every (final jamo, next initial jamo) pair is romanized
+once, when the module is loaded, into `BOUNDARIES`; romanizing a word is then
+a table lookup per syllable:
+
+    boundary(previous final, initial) + vowel
+
+with the last final written as it sounds at the end of a word.
+
+Following Wiktionary, a hyphen is written where the letters could be split
+into syllables the wrong way: goyang-i (not goyangi, 고얀기), chin-gu (not
+chingu, 칭우) and ma-eul (not maeul, 매울).
+
+Run from experiments/01-translation:
+    python romanization.py
+"""
+
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from main import Syllable
+
+
+VOWELS = {
+    'ㅏ': 'a', 'ㅐ': 'ae', 'ㅑ': 'ya', 'ㅒ': 'yae', 'ㅓ': 'eo', 'ㅔ': 'e', 'ㅕ': 'yeo', 'ㅖ': 'ye', 'ㅗ': 'o',
+    'ㅘ': 'wa', 'ㅙ': 'wae', 'ㅚ': 'oe', 'ㅛ': 'yo', 'ㅜ': 'u', 'ㅝ': 'wo', 'ㅞ': 'we', 'ㅟ': 'wi', 'ㅠ': 'yu',
+    'ㅡ': 'eu', 'ㅢ': 'ui', 'ㅣ': 'i',
+}
+
+INITIALS = {
+    'ㄱ': 'g', 'ㄲ': 'kk', 'ㄴ': 'n', 'ㄷ': 'd', 'ㄸ': 'tt', 'ㄹ': 'r', 'ㅁ': 'm', 'ㅂ': 'b', 'ㅃ': 'pp', 'ㅅ': 's',
+    'ㅆ': 'ss', 'ㅇ': '', 'ㅈ': 'j', 'ㅉ': 'jj', 'ㅊ': 'ch', 'ㅋ': 'k', 'ㅌ': 't', 'ㅍ': 'p', 'ㅎ': 'h',
+}
+
+# How a final sounds before a consonant or at the end of a word
+FINALS = {
+    ' ': '', 'ㄱ': 'k', 'ㄲ': 'k', 'ㄳ': 'k', 'ㄴ': 'n', 'ㄵ': 'n', 'ㄶ': 'n', 'ㄷ': 't', 'ㄹ': 'l', 'ㄺ': 'k',
+    'ㄻ': 'm', 'ㄼ': 'l', 'ㄽ': 'l', 'ㄾ': 'l', 'ㄿ': 'p', 'ㅀ': 'l', 'ㅁ': 'm', 'ㅂ': 'p', 'ㅄ': 'p', 'ㅅ': 't',
+    'ㅆ': 't', 'ㅇ': 'ng', 'ㅈ': 't', 'ㅊ': 't', 'ㅋ': 'k', 'ㅌ': 't', 'ㅍ': 'p', 'ㅎ': 't',
+}
+
+# A final followed by a vowel: (what stays, the initial it moves over as)
+LIAISON = {
+    ' ': ('', ''), 'ㄱ': ('', 'ㄱ'), 'ㄲ': ('', 'ㄲ'), 'ㄳ': ('k', 'ㅆ'), 'ㄴ': ('', 'ㄴ'), 'ㄵ': ('n', 'ㅈ'),
+    'ㄶ': ('', 'ㄴ'), 'ㄷ': ('', 'ㄷ'), 'ㄹ': ('', 'ㄹ'), 'ㄺ': ('l', 'ㄱ'), 'ㄻ': ('l', 'ㅁ'), 'ㄼ': ('l', 'ㅂ'),
+    'ㄽ': ('l', 'ㅆ'), 'ㄾ': ('l', 'ㅌ'), 'ㄿ': ('l', 'ㅍ'), 'ㅀ': ('', 'ㄹ'), 'ㅁ': ('', 'ㅁ'), 'ㅂ': ('', 'ㅂ'),
+    'ㅄ': ('p', 'ㅆ'), 'ㅅ': ('', 'ㅅ'), 'ㅆ': ('', 'ㅆ'), 'ㅇ': ('ng-', ''), 'ㅈ': ('', 'ㅈ'), 'ㅊ': ('', 'ㅊ'),
+    'ㅋ': ('', 'ㅋ'), 'ㅌ': ('', 'ㅌ'), 'ㅍ': ('', 'ㅍ'), 'ㅎ': ('', ''),
+}
+
+# The sound a final is reduced to (ㄱ, ㄴ, ㄷ, ㄹ, ㅁ, ㅂ or ㅇ)
+REPRESENTATIVE = {
+    ' ': ' ', 'ㄱ': 'ㄱ', 'ㄲ': 'ㄱ', 'ㄳ': 'ㄱ', 'ㄴ': 'ㄴ', 'ㄵ': 'ㄴ', 'ㄶ': 'ㄴ', 'ㄷ': 'ㄷ', 'ㄹ': 'ㄹ', 'ㄺ': 'ㄱ',
+    'ㄻ': 'ㅁ', 'ㄼ': 'ㄹ', 'ㄽ': 'ㄹ', 'ㄾ': 'ㄹ', 'ㄿ': 'ㅂ', 'ㅀ': 'ㄹ', 'ㅁ': 'ㅁ', 'ㅂ': 'ㅂ', 'ㅄ': 'ㅂ', 'ㅅ': 'ㄷ',
+    'ㅆ': 'ㄷ', 'ㅇ': 'ㅇ', 'ㅈ': 'ㄷ', 'ㅊ': 'ㄷ', 'ㅋ': 'ㄱ', 'ㅌ': 'ㄷ', 'ㅍ': 'ㅂ', 'ㅎ': 'ㄷ',
+}
+
+# Obstruents become the nasal of the same place before ㄴ/ㅁ (합니다 -> hamnida)
+NASAL = {'ㄱ': 'ng', 'ㄷ': 'n', 'ㅂ': 'm'}
+# ㅎ (alone or in a cluster) aspirates the next consonant (좋고 -> joko)
+H_FINALS = ('ㅎ', 'ㄶ', 'ㅀ')
+ASPIRATED = {'ㄱ': 'k', 'ㄷ': 't', 'ㅈ': 'ch'}
+
+
+def _boundary(final: str, initial: str, before_i: bool) -> str:
+    """Romanize a final and the initial of the next syllable as they are pronounced together."""
+    representative = REPRESENTATIVE[final]
+    if initial == 'ㅇ':
+        stays, moves = LIAISON[final]
+        # Palatalization: 같이 -> gachi, 굳이 -> guji
+        if before_i and final in ('ㄷ', 'ㅌ', 'ㄾ'):
+            moves = 'ㅈ' if final == 'ㄷ' else 'ㅊ'
+        return stays + INITIALS.get(moves, '')
+    if final in H_FINALS:
+        stays = 'l' if final == 'ㅀ' else 'n' if final == 'ㄶ' else ''
+        if initial in ASPIRATED:
+            return stays + ASPIRATED[initial]
+        if initial == 'ㄴ':
+            return (stays or 'n') + 'n'
+        return stays + INITIALS[initial]
+    if initial == 'ㅎ' and representative == 'ㄷ' and before_i:
+        # 닫히다 -> dachida
+        return 'ch'
+    if initial in ('ㄴ', 'ㅁ') and representative in NASAL:
+        return NASAL[representative] + INITIALS[initial]
+    if initial == 'ㄹ':
+        if representative in ('ㄴ', 'ㄹ'):
+            return 'll'
+        if representative in NASAL:
+            return NASAL[representative] + 'n'
+        if representative in ('ㅁ', 'ㅇ'):
+            return FINALS[representative] + 'n'
+    if final == 'ㄹ' and initial == 'ㄴ':
+        return 'll'
+    if FINALS[final] == 'n' and initial == 'ㄱ':
+        # chin-gu, not chingu (which would read 칭우)
+        return 'n-g'
+    return FINALS[final] + INITIALS[initial]
+
+
+def _build_boundaries() -> Dict[Tuple[str, str, bool], str]:
+    return {
+        (final, initial, before_i): _boundary(final, initial, before_i)
+        for final in Syllable.FINAL_JAMOS
+        for initial in Syllable.INITIAL_JAMOS
+        for before_i in (False, True)
+    }
+
+
+# (previous final, initial, the vowel is ㅣ) -> romanization of both
+BOUNDARIES = _build_boundaries()
+
+# Vowels that would run together into a different vowel: 마을 -> ma-eul, not maeul (매울)
+AMBIGUOUS = ('ae', 'eo', 'eu', 'oe', 'ui')
+HYPHENATED_VOWELS = {
+    (previous, vowel)
+    for previous in VOWELS.values()
+    for vowel in VOWELS.values()
+    if previous[-1] + vowel[0] in AMBIGUOUS
+}
+
+
+def _build_syllables() -> Dict[str, Tuple[str, str, bool, str]]:
+    # syllable -> (initial, romanized vowel, the vowel is ㅣ, final)
+    return {
+        s.syllable: (s.jamo_initial, VOWELS[s.jamo_medial], s.jamo_medial == 'ㅣ', s.jamo_final)
+        for s in Syllable._BY_SYLLABLE.values()
+    }
+
+
+SYLLABLES = _build_syllables()
+
+
+def romanize(text: str) -> str:
+    """Romanize every Hangul word in `text`, leaving everything else as it is."""
+    out = []
+    append = out.append
+    syllables = SYLLABLES
+    boundaries = BOUNDARIES
+    hyphenated = HYPHENATED_VOWELS
+    final = None
+    previous = None
+    for c in text:
+        parts = syllables.get(c)
+        if parts is None:
+            if final is not None:
+                append(FINALS[final])
+                final = None
+            append(c)
+            continue
+        initial, vowel, before_i, next_final = parts
+        if final is None:
+            # Start of a word (ㄹ is r here too: 라디오 -> radio)
+            append(INITIALS[initial])
+        elif final == ' ' and initial == 'ㅇ' and (previous, vowel) in hyphenated:
+            append('-')
+        else:
+            append(boundaries[(final, initial, before_i)])
+        append(vowel)
+        final = next_final
+        previous = vowel
+    if final is not None:
+        append(FINALS[final])
+    return ''.join(out)
+
+
+def romanize_all(texts: Iterable[str]) -> List[str]:
+    """Romanize many strings (the batch version of `romanize`)."""
+    return [romanize(text) for text in texts]
+
+
+def romanize_stream(lines: Iterable[str]) -> Iterator[str]:
+    """Romanize a file (or any iterable of lines) lazily, one line at a time."""
+    for line in lines:
+        yield romanize(line)
+
+
+def validate(path: str = 'tools/output_pos.txt') -> Tuple[int, List[Tuple[str, str, str]]]:
+    """
+    Compare with the romanizations scraped from Wiktionary. Returns the number
+    of entries checked and the (korean, expected, got) that differ.
+    """
+    from dictionary import read_entries
+    checked = 0
+    differences = []
+    for entry in read_entries(path, None):
+        if not entry.romanization:
+            continue
+        checked += 1
+        got = romanize(entry.korean)
+        if got != entry.romanization:
+            differences.append((entry.korean, entry.romanization, got))
+    return checked, differences
+
+
+if __name__ == '__main__':
+    import time
+
+    for word in ['고양이', '합니다', '먹는', '좋고', '같이', '신라', '닭고기', '행복하다', '읽어요']:
+        print(word, romanize(word))
+
+    checked, differences = validate()
+    print('%d of %d romanizations match Wiktionary' % (checked - len(differences), checked))
+    for korean, expected, got in differences[:20]:
+        print('\t%s: %s != %s' % (korean, expected, got))
+
+    with open('tools/output_pos.txt', encoding='utf-8') as f:
+        text = f.read() * 20
+    start = time.perf_counter()
+    romanize(text)
+    elapsed = time.perf_counter() - start
+    print('%.0f characters/s (one string)' % (len(text) / elapsed))
+    start = time.perf_counter()
+    for _ in romanize_stream(text.splitlines(True)):
+        pass
+    elapsed = time.perf_counter() - start
+    print('%.0f characters/s (streaming lines)' % (len(text) / elapsed))
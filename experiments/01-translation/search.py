@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Jamo-level search over the phrase files and the dictionary output.
+
+A regex for 'ㅁ' cannot find '람' because it works on precomposed syllables
+(see notes.txt). This index stores every Hangul word as its `WordForm.jamos`
+and keeps an inverted index of jamo n-grams -> words, plus one of
+(position, jamo) -> words so "all words with final ㄹ" is a lookup too.
+Regex queries only run on the words that contain the literal jamos of the
+pattern, and every hit is mapped back to the file, line and syllable column
+it came from.
+
+Files are re-indexed only when their size or modification time changes.
+
+Run from experiments/01-translation:
+    python search.py 'ㄹ$'
+"""
+
+import os
+import pickle
+import re
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Set
+from typing import Tuple
+
+from main import Syllable
+from main import WordForm
+
+
+WORD_RE = re.compile('[가-힣]+')
+JAMO_FIRST = 'ㄱ'
+JAMO_LAST = 'ㅣ'
+NGRAM = 2
+
+INITIAL = 'initial'
+MEDIAL = 'medial'
+FINAL = 'final'
+
+
+class Hit(NamedTuple):
+    """A match in a file: `start`/`end` are syllable (character) columns in the line."""
+    path: str
+    line: int
+    start: int
+    end: int
+    word: str
+
+
+class IndexedWord:
+    """A distinct word in the corpus, its jamos and where each syllable's jamos start."""
+    __slots__ = ('string', 'jamos', 'offsets', 'occurrences')
+
+    def __init__(self, string: str):
+        form = WordForm(string)
+        self.string = string
+        self.jamos = form.jamos
+        # offsets[i] is the index in `jamos` where syllable i starts
+        offsets = [0]
+        for s in form.syllables:
+            offsets.append(offsets[-1] + len(s.jamos))
+        self.offsets = offsets
+        # (path, line, column) of every occurrence
+        self.occurrences: List[Tuple[str, int, int]] = []
+
+    def syllable_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Convert a span of jamo indices into the span of syllables that contain it."""
+        first = 0
+        while self.offsets[first+1] <= start:
+            first += 1
+        last = first
+        while self.offsets[last+1] < end:
+            last += 1
+        return first, last+1
+
+
+def _literals(pattern: str) -> List[str]:
+    """
+    Return the runs of jamos the pattern requires (conservatively).
+
+    Only jamos outside of groups and character classes count, a jamo followed
+    by ?, * or {...} is optional, and alternations make the pattern unusable
+    as a filter (an empty list means "no filter").
+    """
+    if '|' in pattern:
+        return []
+    runs = []
+    current = []
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        i += 1
+        literal = None
+        if c == '\\':
+            # An escape is never a jamo
+            i += 1
+        elif c == '[':
+            end = pattern.find(']', i+1)
+            i = len(pattern) if end < 0 else end+1
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        else:
+            literal = c
+        optional = i < len(pattern) and pattern[i] in '?*{'
+        if literal is not None and depth == 0 and JAMO_FIRST <= literal <= JAMO_LAST and not optional:
+            current.append(literal)
+        elif current:
+            runs.append(''.join(current))
+            current = []
+    if current:
+        runs.append(''.join(current))
+    return runs
+
+
+class JamoIndex:
+    """An incremental inverted index of jamo n-grams over a set of text files."""
+    def __init__(self):
+        self.words: Dict[str, IndexedWord] = {}
+        self.ngrams: Dict[str, Set[str]] = {}
+        self.positions: Dict[Tuple[str, str], Set[str]] = {}
+        # path -> (size, mtime, words in it)
+        self.files: Dict[str, Tuple[int, float, Set[str]]] = {}
+
+    def update(self, paths: Iterable[str]) -> List[str]:
+        """(Re-)index every path whose size or mtime changed; forget paths that are gone. Returns the re-indexed paths."""
+        paths = set(paths)
+        for path in list(self.files):
+            if path not in paths or not os.path.exists(path):
+                self._remove_file(path)
+        changed = []
+        for path in sorted(paths):
+            if not os.path.exists(path):
+                continue
+            stat = os.stat(path)
+            known = self.files.get(path)
+            if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime:
+                continue
+            self._remove_file(path)
+            self._add_file(path, stat)
+            changed.append(path)
+        return changed
+
+    def _add_file(self, path: str, stat: os.stat_result):
+        seen = set()
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                for match in WORD_RE.finditer(line):
+                    word = self._add_word(match.group(0))
+                    word.occurrences.append((path, line_number, match.start()))
+                    seen.add(word.string)
+        self.files[path] = (stat.st_size, stat.st_mtime, seen)
+
+    def _remove_file(self, path: str):
+        known = self.files.pop(path, None)
+        if known is None:
+            return
+        for string in known[2]:
+            word = self.words[string]
+            word.occurrences = [o for o in word.occurrences if o[0] != path]
+            if not word.occurrences:
+                self._remove_word(word)
+
+    def _add_word(self, string: str) -> IndexedWord:
+        word = self.words.get(string)
+        if word is not None:
+            return word
+        word = self.words[string] = IndexedWord(string)
+        for key in self._ngrams_of(word.jamos):
+            self.ngrams.setdefault(key, set()).add(string)
+        for key in self._positions_of(word):
+            self.positions.setdefault(key, set()).add(string)
+        return word
+
+    def _remove_word(self, word: IndexedWord):
+        del self.words[word.string]
+        for key in self._ngrams_of(word.jamos):
+            self.ngrams[key].discard(word.string)
+        for key in self._positions_of(word):
+            self.positions[key].discard(word.string)
+
+    @staticmethod
+    def _ngrams_of(jamos: str) -> Set[str]:
+        grams = set(jamos)
+        grams.update(jamos[i:i+NGRAM] for i in range(len(jamos)-NGRAM+1))
+        return grams
+
+    @staticmethod
+    def _positions_of(word: IndexedWord) -> Set[Tuple[str, str]]:
+        keys = set()
+        for c in word.string:
+            s = Syllable.from_syllable(c)
+            keys.add((INITIAL, s.jamo_initial))
+            keys.add((MEDIAL, s.jamo_medial))
+            if s.jamo_final != Syllable.JAMO_NONE:
+                keys.add((FINAL, s.jamo_final))
+        return keys
+
+    def _candidates(self, literal: str) -> Set[str]:
+        if len(literal) < NGRAM:
+            return set(self.ngrams.get(literal, ()))
+        candidates = None
+        for i in range(len(literal)-NGRAM+1):
+            posting = self.ngrams.get(literal[i:i+NGRAM], set())
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                break
+        return candidates
+
+    def _hits(self, word: IndexedWord, jamo_start: int, jamo_end: int) -> List[Hit]:
+        start, end = word.syllable_span(jamo_start, jamo_end)
+        return [
+            Hit(path, line, column+start, column+end, word.string)
+            for path, line, column in word.occurrences
+        ]
+
+    def with_jamo(self, jamo: str, position: str) -> List[Hit]:
+        """Every occurrence of a syllable with `jamo` as its initial/medial/final (ie with_jamo('ㄹ', FINAL))."""
+        hits = []
+        for string in sorted(self.positions.get((position, jamo), ())):
+            word = self.words[string]
+            for i, c in enumerate(word.string):
+                s = Syllable.from_syllable(c)
+                if getattr(s, 'jamo_' + position) == jamo:
+                    hits.extend(self._hits(word, word.offsets[i], word.offsets[i+1]))
+        return hits
+
+    def search(self, pattern: str) -> List[Hit]:
+        """Every occurrence of the regex `pattern` (written in jamos) within a word."""
+        regex = re.compile(pattern)
+        candidates = None
+        for literal in _literals(pattern):
+            found = self._candidates(literal)
+            candidates = found if candidates is None else candidates & found
+        if candidates is None:
+            # Nothing to filter on: check every distinct word (not every occurrence)
+            candidates = self.words.keys()
+        hits = []
+        for string in sorted(candidates):
+            word = self.words[string]
+            for match in regex.finditer(word.jamos):
+                if match.end() > match.start():
+                    hits.extend(self._hits(word, match.start(), match.end()))
+        return hits
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, path: str) -> "JamoIndex":
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def default_paths() -> List[str]:
+    import glob
+    return sorted(glob.glob('phrases/*.txt')) + ['tools/output.txt', 'tools/output_pos.txt']
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    start = time.perf_counter()
+    index = JamoIndex()
+    index.update(default_paths())
+    print('Indexed %d words in %.3fs' % (len(index.words), time.perf_counter() - start))
+
+    # A regex for ㅁ finds 람 now
+    pattern = sys.argv[1] if len(sys.argv) > 1 else 'ㅁ'
+    for hit in index.search(pattern)[:20]:
+        print('%s:%d:%d-%d %s' % (hit.path, hit.line, hit.start, hit.end, hit.word))
+
+    print('%d syllables with a final ㄹ' % len(index.with_jamo('ㄹ', FINAL)))
+
+    start = time.perf_counter()
+    changed = index.update(default_paths())
+    print('Re-indexed %d changed files in %.3fs' % (len(changed), time.perf_counter() - start))
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+The translations in an indexed SQLite database instead of free text.
+
+Every row is one `dictionary.Entry`: English headword, part of speech, sense
+(the meaning the translation was listed under), Korean form, romanization,
+hanja and qualifiers. There are indexes on the English headword and the
+Korean form, so a lookup is an index search that only reads the pages it
+needs instead of loading (and re-parsing) the whole output file.
+
+Rows are written by a `BatchWriter`, which inserts and commits in batches.
+`import_text` loads the existing tools/output.txt / tools/output_pos.txt
+files; importing a file again replaces what came from it before, in one
+transaction, so a failed import leaves the earlier one in place.
+
+Run from experiments/01-translation:
+    python store.py
+"""
+
+import sqlite3
+from typing import Iterable
+from typing import List
+
+from dictionary import Entry
+from dictionary import parse_blocks
+from dictionary import read_word_pos
+
+
+STORE_PATH = 'tools/dictionary.sqlite'
+QUALIFIER_SEPARATOR = '; '
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    english TEXT NOT NULL,
+    pos TEXT NOT NULL DEFAULT '',
+    meaning TEXT NOT NULL DEFAULT '',
+    korean TEXT NOT NULL,
+    romanization TEXT NOT NULL DEFAULT '',
+    hanja TEXT NOT NULL DEFAULT '',
+    qualifiers TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS entries_english ON entries (english, pos);
+CREATE INDEX IF NOT EXISTS entries_korean ON entries (korean);
+CREATE INDEX IF NOT EXISTS entries_source ON entries (source);
+'''
+
+COLUMNS = ('english', 'pos', 'meaning', 'korean', 'romanization', 'hanja', 'qualifiers', 'source')
+
+
+class BatchWriter:
+    """
+    Collects rows and inserts them `batch_size` at a time, one transaction
+    per batch (or, with `commit=False`, in the caller's transaction). Use it
+    as a context manager so the last batch is written.
+    """
+    def __init__(self, store: "DictionaryStore", batch_size: int = 1000, source: str = '', commit: bool = True):
+        self.store = store
+        self.batch_size = batch_size
+        self.source = source
+        self.commit = commit
+        self.rows = []
+        self.written = 0
+
+    def add(self, entry: Entry):
+        self.rows.append((
+            entry.english,
+            entry.pos,
+            entry.meaning,
+            entry.korean,
+            entry.romanization,
+            entry.hanja,
+            QUALIFIER_SEPARATOR.join(entry.qualifiers),
+            self.source,
+        ))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        self.store.connection.executemany(
+            'INSERT INTO entries (%s) VALUES (%s)' % (', '.join(COLUMNS), ', '.join('?' * len(COLUMNS))),
+            self.rows
+        )
+        if self.commit:
+            self.store.connection.commit()
+        self.written += len(self.rows)
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+
+class DictionaryStore:
+    """An English <-> Korean dictionary kept in a SQLite file."""
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def writer(self, batch_size: int = 1000, source: str = '', commit: bool = True) -> BatchWriter:
+        return BatchWriter(self, batch_size, source, commit)
+
+    def import_text(self, path: str = 'tools/output_pos.txt', pos_path: str = 'tools/most_common_words_wpos.txt',
+                    batch_size: int = 1000) -> int:
+        """Load a translator output file (replacing an earlier import of it). Returns the number of rows."""
+        pos = read_word_pos(pos_path) if pos_path else {}
+        # Commits once at the end, or rolls the whole import back
+        with self.connection:
+            self.connection.execute('DELETE FROM entries WHERE source = ?', (path,))
+            with open(path, encoding='utf-8') as f, self.writer(batch_size, source=path, commit=False) as writer:
+                for entry in parse_blocks(f):
+                    entry.pos = pos.get(entry.english, '')
+                    writer.add(entry)
+        return writer.written
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> Entry:
+        return Entry(
+            row['english'],
+            row['meaning'],
+            row['korean'],
+            row['romanization'],
+            row['hanja'],
+            row['qualifiers'].split(QUALIFIER_SEPARATOR) if row['qualifiers'] else [],
+            row['pos']
+        )
+
+    def _select(self, where: str, parameters: Iterable) -> List[Entry]:
+        rows = self.connection.execute('SELECT * FROM entries WHERE %s ORDER BY id' % where, tuple(parameters))
+        return [self._entry(row) for row in rows]
+
+    def english(self, word: str, pos: str = None) -> List[Entry]:
+        """Every Korean translation of an English headword (of one part of speech if given)."""
+        if pos is None:
+            return self._select('english = ?', (word,))
+        return self._select('english = ? AND pos = ?', (word, pos))
+
+    def korean(self, word: str) -> List[Entry]:
+        """Every entry translated as the Korean `word`."""
+        return self._select('korean = ?', (word,))
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == '__main__':
+    import time
+
+    with DictionaryStore() as store:
+        for path, pos_path in [('tools/output.txt', None), ('tools/output_pos.txt', 'tools/most_common_words_wpos.txt')]:
+            start = time.perf_counter()
+            count = store.import_text(path, pos_path)
+            print('Imported %d entries from %s in %.3fs' % (count, path, time.perf_counter() - start))
+        print('%d entries in %s' % (len(store), store.path))
+
+        for query, lookup in [('dog', store.english), ('water', store.english), ('개', store.korean)]:
+            start = time.perf_counter()
+            number = 1000
+            for _ in range(number):
+                entries = lookup(query)
+            print('%s -> %s (%.3fms per lookup)' % (
+                query, entries, (time.perf_counter() - start) * 1000 / number))
@@ -0,0 +1,226 @@
+"""
+A concurrent, rate limited HTTP fetcher for the translator tools.
+
+All requests go through one pooled `requests.Session`, a bounded thread pool
+and a token bucket (so we stay polite to wiktionary no matter how many
+threads are running). Failed requests are retried with exponential backoff.
+The fetcher only downloads; parsing is left to whoever consumes the results.
+Large files can be streamed straight to disk with `download`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import NULL_METRICS
+
+
+class TokenBucket():
+    """Allows `rate` acquisitions per second on average, with bursts of up to `capacity`."""
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchError(Exception):
+    def __init__(self, url, message):
+        Exception.__init__(self, '%s: %s' % (url, message))
+        self.url = url
+
+
+class Fetcher():
+    """
+    Downloads urls with a shared session, `max_workers` threads and at most
+    `rate` requests per second (None for no limit).
+
+    Connection errors and 429/5xx responses are retried `retries` times,
+    waiting backoff, 2*backoff, 4*backoff... seconds in between (or what
+    the server asks for in Retry-After).
+
+    If a `cache` (http_cache.HttpCache) is given, fresh entries are served
+    from it without a request and stale ones are revalidated.
+
+    With `metrics` (metrics.Metrics) the time spent waiting for the rate
+    limit, on the network and in the cache is recorded per url, along with
+    the bytes fetched, requests, retries and errors.
+    """
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_workers=8, rate=2.0, burst=None, retries=3, backoff=0.5, timeout=30, session=None,
+                 cache=None, metrics=None):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.metrics = metrics or NULL_METRICS
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst or max_workers)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch')
+            return self._pool
+
+    def _send(self, url, headers=None, stream=False, stage='network'):
+        """
+        Request `url` until the response is not a RETRY_STATUS (or the retries
+        are used up, then FetchError is raised). The time of each request is
+        recorded as the span `stage`.
+        """
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            with metrics.span('throttle', url):
+                self.bucket.acquire()
+            wait = self.backoff * 2**attempt
+            metrics.count('requests')
+            try:
+                with metrics.span(stage, url):
+                    r = self.session.get(url, timeout=self.timeout, headers=headers, stream=stream)
+            except requests.RequestException as e:
+                metrics.count('errors.%s' % e.__class__.__name__)
+                error = e
+            else:
+                if r.status_code not in self.RETRY_STATUS:
+                    return r
+                r.close()
+                metrics.count('errors.HTTP %s' % r.status_code)
+                error = 'HTTP %s' % r.status_code
+                retry_after = r.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    wait = max(wait, int(retry_after))
+            if attempt >= self.retries:
+                raise FetchError(url, error)
+            metrics.count('retries')
+            attempt += 1
+            time.sleep(wait)
+
+    def get(self, url, stage='network'):
+        """
+        Download `url` (blocking) and return the response. Raises FetchError
+        once the retries are used up (or http_cache.CacheMiss when the cache
+        is offline and does not have the url). `stage` names the span the
+        request is timed as (ie to tell follow up pages apart).
+        """
+        metrics = self.metrics
+        headers = {}
+        if self.cache is not None:
+            with metrics.span('cache', url):
+                cached, headers = self.cache.lookup(url)
+            if cached is not None:
+                metrics.count('cache_hits')
+                return cached
+        while True:
+            r = self._send(url, headers, stage=stage)
+            if r.status_code == 304 and self.cache is not None:
+                metrics.count('not_modified')
+                with metrics.span('cache', url):
+                    cached = self.cache.revalidated(url)
+                if cached is not None:
+                    return cached
+                # The entry vanished (evicted?) -- ask again without conditions
+                headers = {}
+                continue
+            metrics.count('bytes_fetched', len(r.content))
+            if self.cache is not None:
+                with metrics.span('cache', url):
+                    self.cache.store(url, r)
+            return r
+
+    def download(self, url, path, chunk_size=64*1024):
+        """
+        Stream `url` into the file `path` without holding the body in memory
+        (and without the cache). The body goes to a temporary file that is
+        renamed to `path` once complete, and only for a 200. Returns the
+        response, already closed.
+        """
+        r = self._send(url, stream=True)
+        with r:
+            if r.status_code != 200:
+                return r
+            tmp = '%s.%d.tmp' % (path, threading.get_ident())
+            try:
+                with open(tmp, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size):
+                        f.write(chunk)
+                        self.metrics.count('bytes_fetched', len(chunk))
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        return r
+
+    def submit(self, url, stage='network'):
+        """Start downloading `url` in the background and return a Future of the response."""
+        return self.pool.submit(self.get, url, stage)
+
+    def submit_download(self, url, path):
+        """Start streaming `url` into `path` in the background and return a Future of the response."""
+        return self.pool.submit(self.download, url, path)
+
+    def fetch_all(self, urls):
+        """Download every url, yielding (url, response, error) as each one finishes."""
+        futures = {self.submit(url): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+_default_fetcher = None
+
+
+def default_fetcher():
+    """The fetcher translators use when they are not given one."""
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = Fetcher()
+    return _default_fetcher
@@ -0,0 +1,141 @@
+"""
+A local stand-in for wiktionary that serves the saved pages in
+tools/fixtures/wiktionary with an artificial delay, so the fetcher and the
+translators can be exercised without the network.
+
+/wiki/book/translations is served from book__translations.html.
+
+Run from experiments/01-translation:
+    python tools/fixture_server.py
+"""
+
+import hashlib
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import os
+import threading
+import time
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'wiktionary')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.count_request()
+        time.sleep(server.latency)
+        if server.fail_every and server.requests % server.fail_every == 0:
+            self.send_error(503, 'Artificial failure')
+            return
+        path = unquote(urlsplit(self.path).path)
+        if not path.startswith('/wiki/'):
+            self.send_error(404)
+            return
+        name = path[len('/wiki/'):].replace('/', '__')
+        filename = os.path.join(server.directory, '%s.html' % name)
+        if '..' in name or not os.path.exists(filename):
+            self.send_error(404)
+            return
+        with open(filename, 'rb') as f:
+            body = f.read()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Serves `directory` on localhost (a free port is picked) with `latency`
+    seconds of delay per request. If `fail_every` is set every n-th request
+    gets a 503 (to exercise the retries).
+    """
+    daemon_threads = True
+
+    def __init__(self, directory=FIXTURE_DIR, latency=0.05, fail_every=0):
+        ThreadingHTTPServer.__init__(self, ('127.0.0.1', 0), FixtureHandler)
+        self.directory = directory
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def url(self):
+        return 'http://%s:%d' % self.server_address
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    import sys
+    import tempfile
+
+    import wiktionary_translator
+    from fetch import Fetcher
+    from http_cache import HttpCache
+    from metrics import Metrics
+
+    with FixtureServer(latency=0.2, fail_every=7) as server:
+        wiktionary_translator.WIKTIONARY_URL = server.url
+        with tempfile.TemporaryDirectory() as tmp:
+            words = os.path.join(tmp, 'words.txt')
+            output = os.path.join(tmp, 'output.txt')
+            with open(words, 'w') as f:
+                f.write('dog, noun\ndog, verb\nsmall, adjective\nbook, noun\nbook, verb\nset, verb\nmissing, noun\n' * 3)
+
+            for label, workers in [('sequential', 1), ('concurrent', 8)]:
+                start = time.perf_counter()
+                with Fetcher(max_workers=workers, rate=None, backoff=0.05) as fetcher:
+                    wiktionary_translator.download_wikitionary_words_pos(fetcher, words, output, resume=False)
+                print('%s: %.2fs' % (label, time.perf_counter() - start), file=sys.stderr)
+
+            # Where the time goes (the report is also written next to the output)
+            metrics = Metrics()
+            with Fetcher(max_workers=8, rate=None, backoff=0.05, metrics=metrics) as fetcher:
+                wiktionary_translator.download_wikitionary_words_pos(fetcher, words, output, resume=False)
+            report = metrics.report(slowest=3)
+            for name, stage in report['stages'].items():
+                print('%-12s %4d x  p50 %7.2fms  p95 %7.2fms' % (name, stage['count'], stage['p50_ms'], stage['p95_ms']),
+                      file=sys.stderr)
+            print(report['counters'], file=sys.stderr)
+            for word in report['slowest']:
+                print('slow: %s %.1fms' % (word['key'], word['total_ms']), file=sys.stderr)
+
+            # Cold cache, warm cache, stale cache (revalidated with 304s) and offline
+            cache_dir = os.path.join(tmp, 'cache')
+            for label, ttl, offline in [('cold cache', 3600, False), ('warm cache', 3600, False),
+                                        ('revalidate', 0, False), ('offline', 0, True)]:
+                start = time.perf_counter()
+                cache = HttpCache(cache_dir, ttl=ttl, offline=offline)
+                with Fetcher(max_workers=8, rate=None, backoff=0.05, cache=cache) as fetcher:
+                    wiktionary_translator.download_wikitionary_words_pos(fetcher, words, output, resume=False)
+                print('%s: %.2fs' % (label, time.perf_counter() - start), file=sys.stderr)
+            with open(output, encoding='utf-8') as f:
+                print(f.read())
@@ -0,0 +1,202 @@
+"""
+A persistent on-disk cache of HTTP responses for the translator tools.
+
+Every response is stored under the sha256 of its url (the body and a small
+json file with the status, headers and when it was fetched/last used).
+Entries younger than `ttl` are served without touching the network; older
+ones are revalidated with If-None-Match/If-Modified-Since so an unchanged
+page costs a 304 instead of a full download. When the cache grows past
+`max_bytes` the least recently used entries are removed.
+
+In `offline` mode only the cache is used and a miss is an error.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class CachedResponse():
+    """Just enough of a requests.Response for the translators."""
+    def __init__(self, url, status_code, content, headers):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = True
+
+
+class CacheMiss(Exception):
+    pass
+
+
+class HttpCache():
+    CACHEABLE_STATUS = (200, 404)
+    KEPT_HEADERS = ('ETag', 'Last-Modified', 'Content-Type')
+
+    def __init__(self, directory='tools/.http_cache', ttl=7*24*3600, max_bytes=500*1024*1024, offline=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stored': 0,
+            'evicted': 0,
+            'bytes_saved': 0,
+        }
+        # key -> (body size, last used) for eviction, loaded once
+        self.sizes = {}
+        self.total_bytes = 0
+        self._scan()
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key[:2], key)
+        return base + '.body', base + '.json'
+
+    def _scan(self):
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.listdir(self.directory):
+            folder = os.path.join(self.directory, sub)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(folder, name), encoding='utf-8') as f:
+                        meta = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                self.sizes[name[:-len('.json')]] = (meta['size'], meta['used'])
+                self.total_bytes += meta['size']
+
+    def _read(self, key):
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _write_meta(self, key, meta):
+        _, meta_path = self._paths(key)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        with self.lock:
+            self.sizes[key] = (meta['size'], meta['used'])
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def lookup(self, url):
+        """
+        Returns (response, revalidation headers).
+
+        response is a CachedResponse if there is a fresh entry (or we are
+        offline), otherwise None and the headers to send for a conditional
+        request (empty if there is no entry at all).
+
+        Raises CacheMiss when offline and the url is not cached.
+        """
+        key = self.key(url)
+        meta, body = self._read(key)
+        if meta is None:
+            if self.offline:
+                self._count('misses')
+                raise CacheMiss('%s is not cached (offline mode)' % url)
+            return None, {}
+        now = time.time()
+        if self.offline or now - meta['fetched'] < self.ttl:
+            meta['used'] = now
+            self._write_meta(key, meta)
+            self._count('hits')
+            self._count('bytes_saved', len(body))
+            return CachedResponse(url, meta['status'], body, meta['headers']), {}
+        headers = {}
+        if meta['headers'].get('ETag'):
+            headers['If-None-Match'] = meta['headers']['ETag']
+        if meta['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+        return None, headers
+
+    def revalidated(self, url):
+        """The server answered 304: mark the entry fresh again and return it."""
+        key = self.key(url)
+        meta, body = self._read(key)
+        if meta is None:
+            return None
+        meta['fetched'] = meta['used'] = time.time()
+        self._write_meta(key, meta)
+        self._count('revalidated')
+        self._count('bytes_saved', len(body))
+        return CachedResponse(url, meta['status'], body, meta['headers'])
+
+    def store(self, url, response):
+        """Save a downloaded response (if it is worth keeping)."""
+        self._count('misses')
+        if response.status_code not in self.CACHEABLE_STATUS:
+            return
+        key = self.key(url)
+        body_path, _ = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        body = response.content
+        self._write_atomic(body_path, body)
+        now = time.time()
+        with self.lock:
+            old = self.sizes.get(key)
+            self.total_bytes += len(body) - (old[0] if old else 0)
+        self._write_meta(key, {
+            'url': url,
+            'status': response.status_code,
+            'headers': {h: response.headers[h] for h in self.KEPT_HEADERS if h in response.headers},
+            'size': len(body),
+            'fetched': now,
+            'used': now,
+        })
+        self._count('stored')
+        self._evict()
+
+    def _evict(self):
+        with self.lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            victims = []
+            for key, (size, used) in sorted(self.sizes.items(), key=lambda item: item[1][1]):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                victims.append(key)
+                self.total_bytes -= size
+                del self.sizes[key]
+                self.stats['evicted'] += 1
+        for key in victims:
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def report(self):
+        """A one line summary of the cache statistics."""
+        return 'http cache: %(hits)d hits, %(misses)d misses, %(revalidated)d revalidated, ' \
+               '%(stored)d stored, %(evicted)d evicted, %(bytes_saved)d bytes saved' % self.stats
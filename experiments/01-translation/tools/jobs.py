@@ -0,0 +1,129 @@
+"""
+Resumable batch jobs.
+
+A job is a list of items (words to translate, images to download...) that
+may be interrupted at any point. `Job` keeps the state of every item in a
+journal file next to the output so a rerun skips what is already done,
+retries what failed (up to `max_attempts` runs) and never writes an item's
+output twice.
+
+Results are committed in batches: the batch's output is appended to the
+output file and fsync'd, then one line is appended to the journal with the
+state of the items and the size of the output file. On load, a torn last
+journal line is ignored and the output file is cut back to the last
+committed size, so output written after the last commit (which will be
+produced again) does not end up duplicated.
+
+    with Job('tools/output_pos.txt.job', 'tools/output_pos.txt') as job:
+        for word in job.todo(words):
+            job.complete(word, translate(word))
+"""
+
+import json
+import os
+
+
+DONE = 'done'
+FAILED = 'failed'
+
+
+class ItemState():
+    __slots__ = ('status', 'attempts', 'error')
+
+    def __init__(self, status, attempts=0, error=None):
+        self.status = status
+        self.attempts = attempts
+        self.error = error
+
+
+class Job():
+    def __init__(self, path, output_path=None, batch_size=20, max_attempts=3):
+        self.path = path
+        self.output_path = output_path
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.state = {}
+        # Changes (and output) not committed yet
+        self._items = {}
+        self._output = []
+        self._load()
+
+    def _load(self):
+        output_size = None
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        batch = json.loads(line)
+                    except ValueError:
+                        # Interrupted while writing the last line: that batch never happened
+                        break
+                    for key, (status, attempts, error) in batch['items'].items():
+                        self.state[key] = ItemState(status, attempts, error)
+                    output_size = batch['output_size']
+        if self.output_path is not None and output_size is not None and os.path.exists(self.output_path):
+            if os.path.getsize(self.output_path) > output_size:
+                with open(self.output_path, 'r+b') as f:
+                    f.truncate(output_size)
+
+    def is_done(self, key):
+        state = self.state.get(key)
+        return state is not None and state.status == DONE
+
+    def should_run(self, key):
+        """True unless the item is done or failed too many times already."""
+        state = self.state.get(key)
+        return state is None or (state.status != DONE and state.attempts < self.max_attempts)
+
+    def todo(self, keys):
+        return [key for key in keys if self.should_run(key)]
+
+    def complete(self, key, output=''):
+        """Record a finished item and the text it adds to the output file."""
+        state = self.state.get(key)
+        self.state[key] = self._items[key] = ItemState(DONE, (state.attempts if state else 0) + 1)
+        if output:
+            self._output.append(output)
+        if len(self._items) >= self.batch_size:
+            self.commit()
+
+    def fail(self, key, error):
+        state = self.state.get(key)
+        self.state[key] = self._items[key] = ItemState(FAILED, (state.attempts if state else 0) + 1, str(error))
+        if len(self._items) >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+        """Write the pending output, then make the batch durable in the journal."""
+        if not self._items:
+            return
+        output_size = 0
+        if self.output_path is not None:
+            with open(self.output_path, 'ab') as f:
+                f.write(''.join(self._output).encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+                output_size = f.tell()
+        line = json.dumps({
+            'output_size': output_size,
+            'items': {key: [s.status, s.attempts, s.error] for key, s in self._items.items()},
+        }, ensure_ascii=False)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._items = {}
+        self._output = []
+
+    def report(self):
+        done = sum(1 for s in self.state.values() if s.status == DONE)
+        failed = [s for s in self.state.values() if s.status == FAILED]
+        given_up = sum(1 for s in failed if s.attempts >= self.max_attempts)
+        return '%d done, %d failed (%d given up)' % (done, len(failed), given_up)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        # Whatever finished before an error is still good
+        self.commit()
@@ -0,0 +1,145 @@
+"""
+Timings and counters for a translator run.
+
+`span(name, key)` times a stage (network, soup, toc...) and `count(name)`
+adds to a counter (bytes fetched, pages parsed, errors.FetchError...). The
+key of a span is the item it worked on (a url or a word): `label` says which
+word a url belongs to so the report can add up everything spent on a word
+and list the slowest ones.
+
+`NULL_METRICS` does nothing and is what every tool uses unless it is given a
+`Metrics`, so leaving the instrumentation in costs a method call per span.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+def _percentile(ordered, q):
+    # Nearest rank on an already sorted list
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _Span():
+    __slots__ = ('metrics', 'name', 'key', 'start')
+
+    def __init__(self, metrics, name, key):
+        self.metrics = metrics
+        self.name = name
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.metrics.record(self.name, time.perf_counter() - self.start, self.key)
+
+
+class _NullSpan():
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class NullMetrics():
+    """Instrumentation turned off: every call does nothing."""
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name, key=None):
+        return self._span
+
+    def record(self, name, seconds, key=None):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def label(self, key, label):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class Metrics():
+    """The spans and counters of one run (safe to use from the fetcher's threads)."""
+    enabled = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.samples = {}
+        self.counters = {}
+        # key -> {stage: seconds}
+        self.by_key = {}
+        self.labels = {}
+        self._lock = threading.Lock()
+
+    def span(self, name, key=None):
+        """A context manager timing stage `name` (spent on `key`, if given)."""
+        return _Span(self, name, key)
+
+    def record(self, name, seconds, key=None):
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds)
+            if key is not None:
+                stages = self.by_key.setdefault(key, {})
+                stages[name] = stages.get(name, 0) + seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def label(self, key, label):
+        """Report what was spent on `key` (ie a url) as spent on `label` (the word)."""
+        self.labels[key] = label
+
+    def report(self, slowest=10):
+        """A summary as a dict: per stage count/total/p50/p95/max (in ms), the counters and the slowest labels."""
+        with self._lock:
+            stages = {}
+            for name, samples in sorted(self.samples.items()):
+                ordered = sorted(samples)
+                stages[name] = {
+                    'count': len(ordered),
+                    'total_ms': round(sum(ordered) * 1000, 3),
+                    'p50_ms': round(_percentile(ordered, 0.50) * 1000, 3),
+                    'p95_ms': round(_percentile(ordered, 0.95) * 1000, 3),
+                    'max_ms': round(ordered[-1] * 1000, 3),
+                }
+            totals = {}
+            for key, spent in self.by_key.items():
+                stages_of = totals.setdefault(self.labels.get(key, key), {})
+                for name, seconds in spent.items():
+                    stages_of[name] = stages_of.get(name, 0) + seconds
+            counters = dict(sorted(self.counters.items()))
+        ranked = sorted(totals.items(), key=lambda item: sum(item[1].values()), reverse=True)[:slowest]
+        return {
+            'wall_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'stages': stages,
+            'counters': counters,
+            'slowest': [
+                {
+                    'key': key,
+                    'total_ms': round(sum(spent.values()) * 1000, 3),
+                    'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in sorted(spent.items())},
+                }
+                for key, spent in ranked
+            ],
+        }
+
+    def write(self, path, slowest=10):
+        """Write `report` as json to `path`."""
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.report(slowest), f, indent=1)
+            f.write('\n')
+        os.replace(tmp, path)
+
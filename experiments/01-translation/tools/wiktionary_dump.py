@@ -0,0 +1,411 @@
+"""
+Korean translations straight from a Wiktionary pages-articles dump, without
+touching the network.
+
+The dump (bz2 compressed or plain xml) is read as a stream so memory stays
+bounded no matter how big it is: pages are handed to a process pool in
+batches (with a limited number of batches in flight) and every page element
+is discarded as soon as its wikitext has been read. The workers pick the
+`{{t|ko|...}}` templates out of the English translation tables of each part
+of speech and return the same `Translation(meaning, translation)` records the
+html translators produce, rendered the way the html reads, ie:
+
+    * Korean: {{t+|ko|견|tr=gyeon}} ({{t+|ko|犬}})  ->  견(ko)(gyeon)(犬(ko))
+
+"See translations" links ({{trans-see}}, {{see translation subpage}}) are
+resolved against the subpages (ie `book/translations`) once the whole dump
+has been read. When only some words are wanted, the pages their links point
+to that are not wanted themselves are picked up by a second pass.
+
+Dumps: https://dumps.wikimedia.org/enwiktionary/latest/enwiktionary-latest-pages-articles.xml.bz2
+A small one to try it on is in tools/fixtures/wiktionary_dump (`bzcat` it to read).
+
+Run from experiments/01-translation:
+    python tools/wiktionary_dump.py tools/fixtures/wiktionary_dump/pages-articles.xml.bz2
+    python tools/wiktionary_dump.py   (no dump: check the parser against that fixture)
+"""
+
+import bz2
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+import re
+import xml.etree.ElementTree as ElementTree
+
+from wiktionary_translator import Translation
+
+
+LANGUAGE_HEADING = 'english'
+TARGET_LANGUAGE = 'ko'
+
+# Headings a translation table can belong to
+PARTS_OF_SPEECH = (
+    'noun', 'proper noun', 'verb', 'adjective', 'adverb', 'pronoun', 'preposition', 'conjunction',
+    'interjection', 'determiner', 'article', 'numeral', 'particle', 'phrase', 'prefix', 'suffix',
+)
+
+HEADING_RE = re.compile(r'^(={2,6})\s*(.*?)\s*\1\s*$')
+# Templates without nested templates inside (translation templates never have them)
+TEMPLATE_RE = re.compile(r'\{\{([^{}|]+)((?:\|[^{}]*)?)\}\}')
+COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+LINK_RE = re.compile(r'\[\[(?:[^\]|]*\|)?([^\]]*)\]\]')
+# What becomes an element in the html: links, templates, bold/italic and tags
+MARKUP_RE = re.compile(r"\[\[.*?\]\]|\{\{.*?\}\}|'{2,3}.*?'{2,3}|<(\w+)[^>]*>.*?</\1>|<[^>]*>")
+
+TRANSLATION_TEMPLATES = ('t', 't+', 'tt', 'tt+', 't-check', 't+check')
+CHECK_TEMPLATES = ('t-check', 't+check')
+QUALIFIER_TEMPLATES = ('q', 'qual', 'qualifier', 'i', 'gloss', 'sense')
+
+
+class DumpEntry():
+    """The translations of one word and part of speech (printed like a WiktionaryTranslator)."""
+    def __init__(self, word, part_of_speech, meanings=None):
+        self.word = word
+        self.part_of_speech = part_of_speech
+        self.meanings = meanings or []
+
+    def __str__(self):
+        return '%s:\n\t%s' % (
+            self.word,
+            '\n\t'.join(['%s' % m for m in self.meanings])
+        )
+
+
+def _template_args(args):
+    """Split the `|a|b|key=value` part of a template into positional and named arguments."""
+    positional = []
+    named = {}
+    for arg in args.split('|')[1:]:
+        key, equals, value = arg.partition('=')
+        if equals and key.strip().isidentifier():
+            named[key.strip()] = value.strip()
+        else:
+            positional.append(arg.strip())
+    return positional, named
+
+
+def _plain(text):
+    """Wikitext -> text: [[link|label]] -> label, no comments or bold/italic quotes."""
+    return LINK_RE.sub(r'\1', COMMENT_RE.sub('', text)).replace("'''", '').replace("''", '').strip()
+
+
+def _gloss(text):
+    """
+    The meaning of a translation table as the html translator reads it: the
+    first piece of text directly in the header, so markup and what follows
+    it are left out ("person, ''See also'' [[scoundrel]]" -> "person, ").
+    """
+    text = COMMENT_RE.sub('', text)
+    position = 0
+    for match in MARKUP_RE.finditer(text):
+        if match.start() > position:
+            return text[position:match.start()]
+        position = match.end()
+    return text[position:]
+
+
+def render_translations(line, language=TARGET_LANGUAGE):
+    """
+    Render the translation templates of a `* Korean: ...` line like the html
+    page reads (with the whitespace stripped, like get_text(strip=True)).
+    Returns '' if the line has no translation into `language`.
+    """
+    line = COMMENT_RE.sub('', line)
+    parts = []
+    found = False
+    position = line.find(':') + 1
+    for match in TEMPLATE_RE.finditer(line, position):
+        parts.append(_plain(line[position:match.start()]))
+        position = match.end()
+        name = match.group(1).strip()
+        positional, named = _template_args(match.group(2))
+        if name in TRANSLATION_TEMPLATES:
+            if len(positional) < 2 or positional[0] != language:
+                continue
+            found = True
+            if name in CHECK_TEMPLATES:
+                parts.append('(please verify)')
+            parts.append(named.get('alt') or positional[1])
+            if name.endswith('+') or name == 't+check':
+                parts.append('(%s)' % language)
+            if named.get('tr'):
+                parts.append('(%s)' % named['tr'])
+        elif name in QUALIFIER_TEMPLATES and positional:
+            parts.append('(%s)' % ', '.join(positional))
+    parts.append(_plain(line[position:]))
+    return ''.join(parts) if found else ''
+
+
+def _see_target(title, name, positional, part_of_speech):
+    """Where a "see translations" template points: (page, part of speech)."""
+    if name == 'see translation subpage':
+        pos = positional[0].lower() if positional else part_of_speech
+        page = positional[1] if len(positional) > 1 else '%s/translations' % title
+        return page, pos
+    # {{trans-see|gloss|page#Part of speech}}
+    target = positional[1] if len(positional) > 1 else positional[0] if positional else title
+    page, _, anchor = target.partition('#')
+    return page or title, anchor.lower() or part_of_speech
+
+
+def parse_page(title, text, language=TARGET_LANGUAGE):
+    """
+    Parse the wikitext of one page.
+
+    Returns (title, {part of speech: [(meaning, translation)]}, {part of speech: (page, part of speech)})
+    where the second dict holds the "see translations" links of the parts of
+    speech that have no translations of their own.
+    """
+    translations = {}
+    see = {}
+    in_language = False
+    part_of_speech = None
+    pos_level = 0
+    in_translations = False
+    meaning = None
+    for line in text.splitlines():
+        heading = HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            name = _plain(heading.group(2)).lower()
+            if level == 2:
+                in_language = name == LANGUAGE_HEADING
+                part_of_speech = None
+                in_translations = False
+            elif name in PARTS_OF_SPEECH:
+                part_of_speech = name
+                pos_level = level
+                in_translations = False
+            elif part_of_speech is not None and level <= pos_level:
+                # A sibling of the part of speech (etymology, another part of speech...) ends it
+                part_of_speech = None
+                in_translations = False
+            else:
+                in_translations = name == 'translations'
+            meaning = None
+            continue
+        # Translation subpages have no language heading, the tables are right under the part of speech
+        if not in_translations or part_of_speech is None or not (in_language or title.endswith('/translations')):
+            continue
+        for match in TEMPLATE_RE.finditer(line):
+            name = match.group(1).strip()
+            positional, named = _template_args(match.group(2))
+            if name in ('trans-top', 'checktrans-top'):
+                if name == 'checktrans-top':
+                    meaning = 'Translations to be checked'
+                else:
+                    meaning = _gloss(positional[0]) if positional else ''
+            elif name == 'trans-bottom':
+                meaning = None
+            elif name in ('trans-see', 'see translation subpage'):
+                see.setdefault(part_of_speech, _see_target(title, name, positional, part_of_speech))
+        if meaning is not None and line.startswith('*'):
+            translation = render_translations(line, language)
+            if translation:
+                translations.setdefault(part_of_speech, []).append((meaning, translation))
+    for pos in translations:
+        see.pop(pos, None)
+    return title, translations, see
+
+
+def _parse_batch(batch, language):
+    results = []
+    for title, text in batch:
+        result = parse_page(title, text, language)
+        if result[1] or result[2]:
+            results.append(result)
+    return results
+
+
+def _base_title(title):
+    """book/translations -> book"""
+    return title[:-len('/translations')] if title.endswith('/translations') else title
+
+
+def iter_pages(path):
+    """Yield (title, wikitext) for every main namespace page of a dump, one page in memory at a time."""
+    opener = bz2.open if path.endswith('.bz2') else open
+    with opener(path, 'rb') as f:
+        root = None
+        title = namespace = text = None
+        for event, element in ElementTree.iterparse(f, events=('start', 'end')):
+            if root is None:
+                root = element
+            if event != 'end':
+                continue
+            # Tags are namespaced: {http://www.mediawiki.org/xml/export-0.10/}page
+            tag = element.tag.rpartition('}')[2]
+            if tag == 'title':
+                title = element.text
+            elif tag == 'ns':
+                namespace = element.text
+            elif tag == 'text':
+                text = element.text or ''
+            elif tag == 'page':
+                if namespace == '0' and title is not None:
+                    yield title, text or ''
+                title = namespace = text = None
+                root.clear()
+
+
+def _parse_dump(path, accept, language, workers, batch_size):
+    """Yield parse_page's result for every page of the dump with something in it (only the titles `accept`s, if given)."""
+    max_pending = 2 * (workers or 4)
+    pending = set()
+    batch = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for title, text in iter_pages(path):
+            # Cheap filter before paying for the trip to a worker
+            if '|%s|' % language not in text and 'trans-see' not in text and 'translation subpage' not in text:
+                continue
+            if accept is not None and not accept(title):
+                continue
+            batch.append((title, text))
+            if len(batch) < batch_size:
+                continue
+            pending.add(pool.submit(_parse_batch, batch, language))
+            batch = []
+            # Don't read further ahead than the workers can keep up with
+            while len(pending) >= max_pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield from future.result()
+        if batch:
+            pending.add(pool.submit(_parse_batch, batch, language))
+        for future in pending:
+            yield from future.result()
+
+
+def ingest(path, words=None, language=TARGET_LANGUAGE, workers=None, batch_size=500):
+    """
+    Read a dump and return {(word, part of speech): DumpEntry}.
+
+    If `words` (an iterable of (word, part of speech)) is given only those are
+    kept, otherwise every word with a translation into `language`. The pages
+    the see links of those words point to are read in a second pass over the
+    dump when they are not words themselves (ie hound -> dog). Links that lead
+    nowhere (or to a page without translations into `language`) are reported:
+    every one of them for a list of words, only how many for a whole dump.
+    """
+    wanted = None if words is None else set(words)
+    wanted_titles = None if wanted is None else {w for w, _ in wanted}
+    # Everything we need, including translation subpages for the see links
+    pages = {}
+    see = {}
+
+    def keep(results):
+        for title, translations, links in results:
+            pages[title] = translations
+            if links:
+                see[title] = links
+
+    accept = None if wanted_titles is None else (lambda title: _base_title(title) in wanted_titles)
+    keep(_parse_dump(path, accept, language, workers, batch_size))
+    if wanted_titles is not None:
+        targets = {page for links in see.values() for page, _ in links.values()}
+        missing = {_base_title(page) for page in targets if page not in pages} - wanted_titles
+        if missing:
+            keep(_parse_dump(path, lambda title: _base_title(title) in missing, language, workers, batch_size))
+
+    def follow(page, pos):
+        # One more hop for a target that is itself a link to its subpage
+        meanings = pages.get(page, {}).get(pos)
+        if not meanings and pos in see.get(page, {}):
+            page, pos = see[page][pos]
+            meanings = pages.get(page, {}).get(pos)
+        return meanings
+
+    entries = {}
+    unresolved = []
+    for title, translations in pages.items():
+        if title.endswith('/translations') or (wanted_titles is not None and title not in wanted_titles):
+            continue
+        for pos, meanings in translations.items():
+            entries[(title, pos)] = DumpEntry(title, pos, [Translation(m, t) for m, t in meanings])
+        for pos, (page, target_pos) in see.get(title, {}).items():
+            if wanted is not None and (title, pos) not in wanted:
+                continue
+            meanings = follow(page, target_pos)
+            if meanings:
+                entries[(title, pos)] = DumpEntry(title, pos, [Translation(m, t) for m, t in meanings])
+            else:
+                unresolved.append((title, pos, page, target_pos))
+    if wanted is not None:
+        for title, pos, page, target_pos in unresolved:
+            print('Unresolved see link: %s (%s) -> %s#%s' % (title, pos, page, target_pos))
+        entries = {key: entry for key, entry in entries.items() if key in wanted}
+    elif unresolved:
+        print('%d see links did not resolve' % len(unresolved))
+    return entries
+
+
+def read_words_pos(path):
+    """The `word, part-of-speech` list download_wikitionary_words_pos uses, as (word, pos) tuples."""
+    words = []
+    with open(path) as f:
+        for line in f:
+            parts = line.strip().split(',')
+            if len(parts) < 2:
+                continue
+            words.append((parts[0].strip().lower(), parts[1].strip().lower()))
+    return words
+
+
+def write_entries(entries, output_path, words=None):
+    """Append the entries to `output_path` in the translators' format (in the order of `words` if given)."""
+    keys = sorted(entries) if words is None else [key for key in words if key in entries]
+    with open(output_path, 'a', encoding='utf-8') as output:
+        for key in keys:
+            output.write('%s\n\n' % entries[key])
+    return len(keys)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description='Extract Korean translations from a Wiktionary dump.')
+    parser.add_argument('dump', nargs='?', help='pages-articles .xml or .xml.bz2 (none: check against the fixture)')
+    parser.add_argument('--words', default='tools/most_common_words_wpos.txt',
+                        help='"word, part-of-speech" list (empty for every word in the dump)')
+    parser.add_argument('--output', default='tools/output_dump.txt')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.dump is None:
+        from wiktionary_translator import WiktionaryTranslator
+
+        fixture = 'tools/fixtures/wiktionary_dump/pages-articles.xml.bz2'
+        # The tables of these pages are the ones saved in tools/fixtures/wiktionary
+        expected = {}
+        for page, word, pos in [('dog', 'dog', 'noun'), ('dog', 'dog', 'verb'), ('small', 'small', 'adjective'),
+                                ('book', 'book', 'verb'), ('book__translations', 'book', 'noun')]:
+            translator = WiktionaryTranslator(word, pos, 'korean', fetcher=object(), run=False)
+            with open('tools/fixtures/wiktionary/%s.html' % page, 'rb') as f:
+                translator.parse(f.read())
+            expected[(word, pos)] = [(t.meaning, t.translation) for t in translator.meanings]
+        # {{trans-see|dog|dog#Noun}}
+        expected[('hound', 'noun')] = expected[('dog', 'noun')]
+        expected[('tome', 'noun')] = [
+            ('large book', '(formal)서적(seojeok)'),
+            ('Translations to be checked', '(please verify)도서(doseo)'),
+        ]
+
+        def records(entries):
+            return {key: [(t.meaning, t.translation) for t in entry.meanings] for key, entry in entries.items()}
+
+        # Every word (cat has no Korean, Talk:dog and 개 are not English entries, pup links to nowhere)
+        assert records(ingest(fixture, workers=2)) == expected
+        # hound's link points outside the words, so dog is read in the second pass
+        words = [('hound', 'noun'), ('pup', 'noun'), ('book', 'noun')]
+        assert records(ingest(fixture, words, workers=2)) == {key: expected[key] for key in words if key in expected}
+        for key, meanings in sorted(expected.items()):
+            print(key, meanings)
+        sys.exit(0)
+
+    start = time.perf_counter()
+    words = read_words_pos(args.words) if args.words else None
+    entries = ingest(args.dump, words, workers=args.workers)
+    written = write_entries(entries, args.output, words)
+    print('%d entries written to %s in %.2fs' % (written, args.output, time.perf_counter() - start))
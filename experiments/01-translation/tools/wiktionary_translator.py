@@ -1,9 +1,54 @@
 from collections import OrderedDict
-import time
+import html
+import re
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
 
-import requests
 import bs4
 
+from fetch import Fetcher
+from fetch import default_fetcher
+from http_cache import HttpCache
+from jobs import Job
+from metrics import Metrics
+from metrics import NULL_METRICS
+
+
+WIKTIONARY_URL = 'https://en.wiktionary.org'
+BABELNET_URL = 'https://babelnet.org'
+
+
+HEADING_RE = re.compile(r'<h([1-6])\b[^>]*>(.*?)</h\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+class PartialParseError(Exception):
+    """The fast path could not make sense of a page; use the full parse instead."""
+    pass
+
+
+class RawHeading():
+    """A heading found in the raw html: its level, text and character offsets."""
+    __slots__ = ('level', 'text', 'html', 'start', 'end')
+
+    def __init__(self, match):
+        self.level = int(match.group(1))
+        self.html = match.group(2)
+        self.text = html.unescape(TAG_RE.sub('', self.html))
+        self.start = match.start()
+        self.end = match.end()
+
+
+def scan_headings(page):
+    """Return every <h1>..<h6> of a decoded page without building a tree."""
+    return [RawHeading(m) for m in HEADING_RE.finditer(page)]
+
+
+def parse_fragment(fragment):
+    """Parse a slice of a page into a div (the same kind of node extract_section returns)."""
+    soup = bs4.BeautifulSoup('<div>%s</div>' % fragment, features='lxml')
+    return soup.div
+
 
 class Translation():
     def __init__(self, meaning, translation):
@@ -15,16 +60,48 @@ class Translation():
 
 
 class Translator():
-    def __init__(self, word, target_language):
+    def __init__(self, word, target_language, fetcher=None, run=True):
         self.word = word
         self.target_language = target_language
         self.meanings = []
-        self._run()
+        self.fetcher = fetcher or default_fetcher()
+        if run:
+            self._run()
+
+    def url(self):
+        return '%s/wiki/%s' % (WIKTIONARY_URL, self.word)
 
     def _run(self):
         # Download the wiktionary page for this word
-        r = requests.get('https://en.wiktionary.org/wiki/%s' % self.word)
-        soup = bs4.BeautifulSoup(r.content, features='lxml')
+        r = self.fetcher.get(self.url())
+        self.parse(r.content)
+
+    def parse(self, content, fast=True):
+        if fast:
+            try:
+                return self._parse_fast(content)
+            except PartialParseError:
+                pass
+        return self._parse_full(content)
+
+    def _parse_fast(self, content):
+        # Only build a tree for the html between the first Translations
+        # heading and the heading after it
+        page = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+        headings = scan_headings(page)
+        for i, h in enumerate(headings):
+            if 'id="Translations"' in h.html and h.level <= 5:
+                break
+        else:
+            raise PartialParseError('No translations heading')
+        following = [n for n in headings[i+1:] if n.level <= 5]
+        end = following[0].start if following else len(page)
+        section = parse_fragment(page[h.end:end])
+        # Same as the full parse: skip the node right after the heading
+        self._parse_nodes([n for n in list(section.children)[1:] if isinstance(n, bs4.Tag)])
+
+    def _parse_full(self, content):
+        soup = bs4.BeautifulSoup(content, features='lxml')
 
         # Get the translation sections
         # We're looking for an id so there should only be 1 but .select
@@ -45,7 +122,9 @@ class Translator():
                 if next_node.name in ["h1", "h2", "h3", "h4", "h5"]:
                     break
                 translation_nodes.append(next_node)
+        self._parse_nodes(translation_nodes)
 
+    def _parse_nodes(self, translation_nodes):
         # Parse the translation sections into useful content
         for node in translation_nodes:
             # Not every translation has these ids.
@@ -74,15 +153,23 @@ class Translator():
 
 
 class BableTranslator():
-    def __init__(self, word, target_language):
+    def __init__(self, word, target_language, fetcher=None, run=True):
         self.word = word
         self.target_language = target_language
         self.meanings = []
-        self._run()
+        self.fetcher = fetcher or default_fetcher()
+        if run:
+            self._run()
+
+    def url(self):
+        return '%s/search?word=%s&lang=EN&langTrans=%s' % (BABELNET_URL, self.word, self.target_language)
 
     def _run(self):
-        r = requests.get('https://babelnet.org/search?word=%s&lang=EN&langTrans=%s' % (self.word, self.target_language))
-        soup = bs4.BeautifulSoup(r.content, features='lxml')
+        r = self.fetcher.get(self.url())
+        self.parse(r.content)
+
+    def parse(self, content):
+        soup = bs4.BeautifulSoup(content, features='lxml')
         # Take the first result because we are lazy
         # The 2nd <h3> has the translation in the target language
         result = soup.select('.result')[0]
@@ -100,25 +187,104 @@ class BableTranslator():
         )
 
 
-def download_wikitionary_words():
+def job_key(translator):
+    """The name of a translator's item in a Job: `word` or `word, part of speech`."""
+    pos = getattr(translator, 'part_of_speech', None)
+    return translator.word if pos is None else '%s, %s' % (translator.word, pos)
+
+
+def run_translators(translators, output_path, fetcher=None, echo=False, job=None):
+    """
+    Download and parse every translator's page(s), appending the results to
+    `output_path` in the same order as `translators`.
+
+    Pages are downloaded by the fetcher's threads and parsed here, as they
+    arrive, so parsing never holds up a download.
+
+    With a `job` (jobs.Job writing to `output_path`) the words it has already
+    done are skipped and the results are committed through it in batches.
+
+    If the fetcher has metrics (metrics.Metrics) their report is written to
+    `output_path`.metrics.json at the end.
+    """
+    fetcher = fetcher or default_fetcher()
+    metrics = getattr(fetcher, 'metrics', NULL_METRICS)
+    if job is not None:
+        translators = [t for t in translators if job.should_run(job_key(t))]
+    # future -> (index, translator, remaining follow up urls or None for the main page)
+    pending = {}
+    for i, t in enumerate(translators):
+        url = t.url()
+        metrics.label(url, job_key(t))
+        pending[fetcher.submit(url)] = (i, t, None)
+    done = {}
+    next_index = 0
+    output = open(output_path, 'a', encoding="utf-8") if job is None else None
+    try:
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i, t, follow_ups = pending.pop(future)
+                try:
+                    section = t.parse(future.result().content)
+                except Exception as e:
+                    metrics.count('errors.%s' % e.__class__.__name__)
+                    print('Error with %s' % t.word)
+                    print(e)
+                    done[i] = (t, e)
+                    continue
+                if follow_ups is None and not t.meanings and section is not None:
+                    follow_ups = t.follow_up_urls(section)
+                if follow_ups:
+                    metrics.count('follow_ups')
+                    metrics.label(follow_ups[0], job_key(t))
+                    pending[fetcher.submit(follow_ups[0], 'follow_up')] = (i, t, follow_ups[1:])
+                    continue
+                print(t.word)
+                if echo:
+                    print(t)
+                done[i] = (t, None)
+            # Write everything that is finished and next in line
+            with metrics.span('write'):
+                while next_index in done:
+                    t, error = done.pop(next_index)
+                    if job is not None:
+                        if error is None:
+                            job.complete(job_key(t), '%s\n\n' % t)
+                        else:
+                            job.fail(job_key(t), error)
+                    elif error is None:
+                        output.write('%s\n\n' % t)
+                    next_index += 1
+                if output is not None:
+                    output.flush()
+    finally:
+        with metrics.span('write'):
+            if output is not None:
+                output.close()
+            if job is not None:
+                job.commit()
+    if job is not None:
+        print(job.report())
+    if fetcher.cache is not None:
+        print(fetcher.cache.report())
+    if metrics.enabled:
+        metrics.write(output_path + '.metrics.json')
+        print('metrics: %s.metrics.json' % output_path)
+
+
+def download_wikitionary_words(fetcher=None, resume=True):
     with open('tools/most_common_words.txt') as f:
         words = f.readlines()
 
+    translators = []
     for word in words:
         word = word.strip().lower()
         if not word:
             continue
-        print(word)
-        try:
-            t = Translator(word, 'Korean')
-        except Exception as e:
-            print('Error with %s' % word)
-            print(e)
-        else:
-            with open('tools/output.txt', 'a', encoding="utf-8") as f:
-                f.write('%s\n\n' % t)
-            print(t)
-        time.sleep(0.5)
+        translators.append(Translator(word, 'Korean', fetcher, run=False))
+    job = Job('tools/output.txt.job', 'tools/output.txt') if resume else None
+    run_translators(translators, 'tools/output.txt', fetcher, echo=True, job=job)
 
 
 class Section():
@@ -128,20 +294,48 @@ class Section():
         self.children = []
 
 
+class TocEntry():
+    """A heading of a Document: its path, depth, node and the heading that ends its section."""
+    __slots__ = ('index', 'path', 'level', 'node', 'end_node')
+
+    def __init__(self, index, path, level, node):
+        self.index = index
+        self.path = path
+        self.level = level
+        self.node = node
+        self.end_node = None
+
+
 class Document():
     LEVEL_SEPARATOR = ' // '
 
     def __init__(self, soup):
         self.soup = soup
         self.nodes_by_toc = OrderedDict()
+        self.toc = []
+        self.toc_by_path = {}
+        # path component -> indexes (in self.toc) of the headings that have it
+        self._toc_by_part = {}
+        self._find_cache = {}
 
     def build_nodes_by_toc(self, clean_text=lambda x: x.lower().strip()):
         nodes = OrderedDict()
         headings = self.soup.select('h1, h2, h3, h4, h5, h6')
+        for path, h in self.heading_paths(headings, clean_text):
+            nodes[path] = h
+        self.nodes_by_toc = nodes
+        self._build_index()
+
+    @classmethod
+    def heading_paths(cls, headings, clean_text):
+        """
+        Yield (path, heading) for every heading. The headings can be bs4 tags
+        or anything with a `level` and `text` (like RawHeading).
+        """
         stack = []
         last_level = 0
         for h in headings:
-            current_level = int(h.name.strip('h'))
+            current_level = h.level if isinstance(h, RawHeading) else int(h.name.strip('h'))
             # Go one level deeper (ie keep the last element in the path)
             if current_level > last_level:
                 pass
@@ -154,11 +348,28 @@ class Document():
                 stack.pop()
             # Insert the new element on the stack
             stack.append(clean_text(h.text.strip()))
-            path = self.LEVEL_SEPARATOR.join(stack)
-            nodes[path] = h
+            path = cls.LEVEL_SEPARATOR.join(stack)
+            yield path, h
             # print('%s: %s - %s' % (path, h.name, clean_text(h.text.strip())))
             last_level = current_level
-        self.nodes_by_toc = nodes
+
+    def _build_index(self):
+        """Precompute each heading's depth and the heading that ends its section (one pass)."""
+        self.toc = []
+        self.toc_by_path = {}
+        self._toc_by_part = {}
+        self._find_cache = {}
+        open_entries = []
+        for i, (path, node) in enumerate(self.nodes_by_toc.items()):
+            entry = TocEntry(i, path, path.count(self.LEVEL_SEPARATOR), node)
+            # This heading ends every open section at the same depth or deeper
+            while open_entries and open_entries[-1].level >= entry.level:
+                open_entries.pop().end_node = node
+            open_entries.append(entry)
+            self.toc.append(entry)
+            self.toc_by_path[path] = entry
+            for part in set(path.split(self.LEVEL_SEPARATOR)):
+                self._toc_by_part.setdefault(part, []).append(i)
 
     def get_toc_pretty(self):
         headings = self.nodes_by_toc.keys()
@@ -173,35 +384,44 @@ class Document():
         return self.nodes_by_toc.keys()
 
     def extract_section(self, heading):
-        # OrderedDicts dont support a .next method so we
-        # need to do wierd stuff to get the "next" element.
-        # https://stackoverflow.com/questions/12328184/how-to-get-the-next-item-in-an-ordereddict
-        start_node = self.nodes_by_toc[heading]
-        start_node_level = heading.count(self.LEVEL_SEPARATOR)
-        end_node = None
-        past_start = False
-        for key in self.nodes_by_toc:
-            if key == heading:
-                past_start = True
-                continue
-            if not past_start:
-                continue
-            node_level = key.count(self.LEVEL_SEPARATOR)
-            if node_level <= start_node_level:
-                end_node = self.nodes_by_toc[key]
-                break
-
-        # Apparently you cannot iterate over node.next_siblings
-        # but you can iterate over list(...)
+        """
+        Move everything between `heading` and the next heading at the same
+        or a higher level into a new div and return it.
+        """
+        entry = self.toc_by_path[heading]
+        end_node = entry.end_node
         section = self.soup.new_tag('div')
-        for node in list(start_node.next_siblings):
-            if node is end_node:
-                break
+        # Moving a node changes its next_sibling so look ahead before moving it
+        node = entry.node.next_sibling
+        while node is not None and node is not end_node:
+            following = node.next_sibling
             section.append(node)
+            node = following
         return section
 
+    def _candidates(self, part):
+        """Indexes of the headings with `part` somewhere in their path."""
+        if self.LEVEL_SEPARATOR in part or not self._toc_by_part:
+            return range(len(self.toc))
+        indexes = set()
+        for component, found in self._toc_by_part.items():
+            if part in component:
+                indexes.update(found)
+        return indexes
+
     def find_heading(self, parts):
-        for h in self.nodes_by_toc.keys():
+        key = tuple(parts)
+        if key in self._find_cache:
+            return self._find_cache[key]
+        # Only headings that contain every part can match; check those in order
+        candidates = None
+        for p in parts:
+            found = self._candidates(p)
+            candidates = set(found) if candidates is None else candidates & set(found)
+        if candidates is None:
+            candidates = range(len(self.toc))
+        for i in sorted(candidates):
+            h = self.toc[i].path
             try:
                 start = 0
                 for p in parts:
@@ -210,32 +430,103 @@ class Document():
                 # no string match
                 pass
             else:
+                self._find_cache[key] = h
                 return h
         # Uh oh. No match.
         raise ValueError('Unable to find matching heading containing: %s' % parts)
 
 
 class WiktionaryTranslator():
-    def __init__(self, word, part_of_speech, target_language):
+    def __init__(self, word, part_of_speech, target_language, fetcher=None, run=True, metrics=None):
         self.word = word
         self.part_of_speech = part_of_speech
         self.target_language = target_language
         self.meanings = []
-        self._run()
+        self.fetcher = fetcher or default_fetcher()
+        # The parsing stages are recorded with the fetcher's metrics unless told otherwise
+        self.metrics = metrics or getattr(self.fetcher, 'metrics', NULL_METRICS)
+        if run:
+            self._run()
 
     @staticmethod
     def _clean_heading(heading: str) -> str:
         return heading.strip().lower().replace('[edit]', '')
 
-    def _run_url(self, url):
-        r = requests.get(url)
-        soup = bs4.BeautifulSoup(r.content, features='lxml')
+    def url(self):
+        return '%s/wiki/%s' % (WIKTIONARY_URL, self.word)
+
+    def _run_url(self, url, stage='network'):
+        r = self.fetcher.get(url, stage)
+        return self.parse(r.content)
+
+    def parse(self, content, fast=True):
+        """
+        Parse a downloaded page, adding to `meanings`. Returns the translations section.
+
+        By default only the translations section is turned into a tree (see
+        `_parse_fast`); pages where that does not work get the full parse.
+        """
+        self.metrics.count('pages_parsed')
+        if fast:
+            try:
+                section = self._parse_fast(content)
+            except PartialParseError:
+                self.metrics.count('full_parse_fallbacks')
+            else:
+                self._parse_section(section)
+                return section
+        return self._parse_full(content)
+
+    def _parse_fast(self, content):
+        """
+        Find the part of speech -> translations heading with a regex over the
+        raw html (using the same heading paths and matching as Document) and
+        parse only the html up to the heading that ends that section.
+        """
+        metrics = self.metrics
+        key = job_key(self)
+        page = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+        doc = Document(None)
+        with metrics.span('toc', key):
+            doc.nodes_by_toc = OrderedDict(
+                (path, h) for path, h in doc.heading_paths(scan_headings(page), self._clean_heading)
+            )
+            doc._build_index()
+        try:
+            with metrics.span('find', key):
+                heading = doc.find_heading([self.part_of_speech, 'translations'])
+        except ValueError:
+            raise PartialParseError('No %s translations heading' % self.part_of_speech)
+        entry = doc.toc_by_path[heading]
+        end = entry.end_node.start if entry.end_node is not None else len(page)
+        with metrics.span('soup', key):
+            section = parse_fragment(page[entry.node.end:end])
+        if not section.select('.NavFrame') and not self.follow_up_urls(section):
+            # Not what a translations section looks like, let the full parse decide
+            raise PartialParseError('Nothing in the %s section' % heading)
+        return section
+
+    def _parse_full(self, content):
+        metrics = self.metrics
+        key = job_key(self)
+        with metrics.span('soup', key):
+            soup = bs4.BeautifulSoup(content, features='lxml')
 
         doc = Document(soup)
-        doc.build_nodes_by_toc(self._clean_heading)
-        heading = doc.find_heading([self.part_of_speech, 'translations'])
-        section = doc.extract_section(heading)
+        with metrics.span('toc', key):
+            doc.build_nodes_by_toc(self._clean_heading)
+        with metrics.span('find', key):
+            heading = doc.find_heading([self.part_of_speech, 'translations'])
+        with metrics.span('extract', key):
+            section = doc.extract_section(heading)
+        self._parse_section(section)
+        return section
+
+    def _parse_section(self, section):
+        with self.metrics.span('translations', job_key(self)):
+            self._parse_translations(section)
 
+    def _parse_translations(self, section):
         # Parse the translation sections into useful content
         for node in section.select('.NavFrame'):
             nav_head = node.select('.NavHead')[0]
@@ -249,18 +540,22 @@ class WiktionaryTranslator():
                     if translation:
                         self.meanings.append(Translation(meaning, translation))
 
-        # We may not get useful content -- return the section of interest
-        return section
+    @staticmethod
+    def follow_up_urls(section):
+        """The "see translations" links of a section (used when it has no translations itself)."""
+        urls = []
+        for link in section.select('a'):
+            if 'translation' in link.text.lower():
+                urls.append(WIKTIONARY_URL+link.get('href'))
+        return urls
 
     def _run(self):
         # Download the wiktionary page for this word
-        section = self._run_url('https://en.wiktionary.org/wiki/%s' % self.word)
+        section = self._run_url(self.url())
         if not self.meanings:
             # look for "see" and a link in the section
-            for link in section.select('a'):
-                if 'translation' in link.text.lower():
-                    url = 'https://en.wiktionary.org'+link.get('href')
-                    self._run_url(url)
+            for url in self.follow_up_urls(section):
+                self._run_url(url, 'follow_up')
 
     def __str__(self):
         return '%s:\n\t%s' % (
@@ -269,13 +564,15 @@ class WiktionaryTranslator():
         )
 
 
-def download_wikitionary_words_pos():
+def download_wikitionary_words_pos(fetcher=None, input_path='tools/most_common_words_wpos.txt',
+                                    output_path='tools/output_pos.txt', resume=True):
     # The word list is formatted as:
     # word, part-of-speech
     # Maybe I should make it a csv? But i was too lazy...
-    with open('tools/most_common_words_wpos.txt') as f:
+    with open(input_path) as f:
         lines = f.readlines()
 
+    translators = []
     for line in lines:
         # skip words without a part of speech
         parts = line.strip().split(',')
@@ -284,16 +581,10 @@ def download_wikitionary_words_pos():
 
         word = parts[0].strip().lower()
         pos = parts[1].strip().lower()
-        print(word)
-        try:
-            t = WiktionaryTranslator(word, pos, 'korean')
-        except Exception as e:
-            print('Error with %s' % word)
-            print(e)
-        else:
-            with open('tools/output_pos.txt', 'a', encoding="utf-8") as f:
-                f.write('%s\n\n' % t)
-        time.sleep(0.5)
+        translators.append(WiktionaryTranslator(word, pos, 'korean', fetcher, run=False))
+    # Rerunning after a crash picks up where it stopped (delete the .job file to start over)
+    job = Job(output_path + '.job', output_path) if resume else None
+    run_translators(translators, output_path, fetcher, job=job)
 
 
 if __name__ == '__main__':
@@ -318,7 +609,13 @@ if __name__ == '__main__':
     # t = WiktionaryTranslator('small', 'adjective', 'korean')
     # print(t)
 
-    download_wikitionary_words_pos()
+    # Pass --offline to only use pages downloaded on earlier runs and
+    # --metrics for a report of where the time went (tools/output_pos.txt.metrics.json)
+    import sys
+    cache = HttpCache('tools/.http_cache', offline='--offline' in sys.argv)
+    metrics = Metrics() if '--metrics' in sys.argv else None
+    with Fetcher(max_workers=8, rate=2.0, cache=cache, metrics=metrics) as fetcher:
+        download_wikitionary_words_pos(fetcher)
 
     # Wiktionary Seems to have more words than Bablenet...
     # t = BableTranslator('book', 'KO')
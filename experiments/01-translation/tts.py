@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Text to speech with a cache of rendered audio.
+
+A backend turns (text, voice, rate) into the bytes of a WAV file:
+    - `SapiBackend`: Windows SAPI (what `stuff1` in main.py used to call live)
+    - `StubBackend`: a tone whose pitch and length depend on the text; it
+      runs anywhere and always renders the same bytes for the same input
+
+`AudioCache` stores every rendering under the sha256 of (backend, voice,
+rate, text), so a phrase is only rendered once per voice and rate. `Tts`
+puts the two together and `prerender` renders every phrase of
+phrases/*.txt and the lesson phrases.js files across a thread pool,
+skipping the ones already cached, so drills can play them instantly.
+
+Run from experiments/01-translation:
+    python tts.py           (stub backend)
+    python tts.py --sapi    (Windows)
+"""
+
+from abc import ABC
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import hashlib
+import io
+import math
+import os
+import re
+import struct
+import threading
+import wave
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+
+AUDIO_CACHE_PATH = 'tools/.audio_cache'
+PHRASE_JS_RE = re.compile(r"new Phrase\(\s*'((?:[^'\\]|\\.)*)'\s*,\s*'((?:[^'\\]|\\.)*)'\s*\)")
+
+
+class TtsBackend(ABC):
+    """Renders text to WAV bytes. `name` is part of the cache key so backends never share entries."""
+    name = ''
+
+    @abstractmethod
+    def render(self, text: str, voice: str, rate: float) -> bytes:
+        pass
+
+
+class StubBackend(TtsBackend):
+    """A deterministic stand-in: a sine tone, 80ms per character, pitched by a hash of the text."""
+    name = 'stub'
+    SAMPLE_RATE = 16000
+    SECONDS_PER_CHARACTER = 0.08
+
+    def render(self, text: str, voice: str, rate: float) -> bytes:
+        digest = hashlib.sha256(('%s|%s' % (voice, text)).encode('utf-8')).digest()
+        frequency = 200 + digest[0] * 2
+        seconds = max(len(text), 1) * self.SECONDS_PER_CHARACTER / (rate or 1)
+        count = int(self.SAMPLE_RATE * seconds)
+        samples = struct.pack(
+            '<%dh' % count,
+            *(int(8000 * math.sin(2 * math.pi * frequency * i / self.SAMPLE_RATE)) for i in range(count))
+        )
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.SAMPLE_RATE)
+            w.writeframes(samples)
+        return buffer.getvalue()
+
+
+class SapiBackend(TtsBackend):
+    """
+    Windows SAPI through pywin32. `voice` is a substring of the voice
+    description (ie 'Heami' for the Korean voice) and `rate` goes from -10 to 10.
+    """
+    name = 'sapi'
+    SSFM_CREATE_FOR_WRITE = 3
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _voice(self):
+        # COM objects belong to the thread that made them
+        speaker = getattr(self._local, 'speaker', None)
+        if speaker is None:
+            import pythoncom
+            from win32com.client import Dispatch
+            pythoncom.CoInitialize()
+            speaker = self._local.speaker = Dispatch('SAPI.SpVoice')
+        return speaker
+
+    def render(self, text: str, voice: str, rate: float) -> bytes:
+        import tempfile
+        from win32com.client import Dispatch
+        speaker = self._voice()
+        for v in speaker.GetVoices():
+            if voice and voice in v.GetDescription():
+                speaker.Voice = v
+                break
+        speaker.Rate = rate
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            stream = Dispatch('SAPI.SpFileStream')
+            stream.Open(path, self.SSFM_CREATE_FOR_WRITE)
+            speaker.AudioOutputStream = stream
+            speaker.Speak(text)
+            stream.Close()
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+
+class AudioCache:
+    """Rendered audio on disk, addressed by the hash of what was rendered."""
+    def __init__(self, directory: str = AUDIO_CACHE_PATH):
+        self.directory = directory
+
+    @staticmethod
+    def key(backend: str, voice: str, rate: float, text: str) -> str:
+        # %g so 0, 0.0 and 1.50 are the same as 0 and 1.5
+        return hashlib.sha256(('%s\0%s\0%s\0%s' % (backend, voice, '%g' % float(rate), text)).encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.wav')
+
+    def get(self, key: str):
+        """The path of a cached rendering, or None."""
+        path = self.path(key)
+        return path if os.path.exists(path) else None
+
+    def put(self, key: str, audio: bytes) -> str:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = '%s.%d.tmp' % (path, threading.get_ident())
+        with open(tmp, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp, path)
+        return path
+
+
+class Tts:
+    """
+    Speaks through `backend`, rendering each (text, voice, rate) once.
+
+    With `pronounce` the text is first rewritten the way it sounds (see
+    pronunciation.py), for backends that read the spelling literally.
+    """
+    def __init__(self, backend: TtsBackend, cache: AudioCache = None, voice: str = '', rate: float = 0,
+                 pronounce: bool = False):
+        self.backend = backend
+        self.cache = cache or AudioCache()
+        self.voice = voice
+        self.rate = rate
+        self.pronounce = pronounce
+
+    def _text(self, text: str) -> str:
+        if self.pronounce:
+            from pronunciation import pronounce
+            return pronounce(text)
+        return text
+
+    def _key(self, text: str) -> str:
+        return self.cache.key(self.backend.name, self.voice, self.rate, self._text(text))
+
+    def is_cached(self, text: str) -> bool:
+        return self.cache.get(self._key(text)) is not None
+
+    def render(self, text: str) -> str:
+        """Return the path of the audio for `text`, rendering it first if it is not cached."""
+        key = self._key(text)
+        path = self.cache.get(key)
+        if path is None:
+            path = self.cache.put(key, self.backend.render(self._text(text), self.voice, self.rate))
+        return path
+
+    def speak(self, text: str):
+        path = self.render(text)
+        try:
+            import winsound
+        except ImportError:
+            print('%s: %s' % (text, path))
+            return
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+
+    def prerender(self, texts: Iterable[str], workers: int = 4) -> Tuple[int, int]:
+        """Render every text that is not cached yet. Returns (rendered, already cached)."""
+        texts = list(dict.fromkeys(texts))
+        missing = [text for text in texts if not self.is_cached(text)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(self.render, missing):
+                pass
+        return len(missing), len(texts) - len(missing)
+
+
+def read_phrase_texts(path: str) -> List[Tuple[str, str]]:
+    """(english, korean) from a phrases/*.txt file (`english = korean` lines)."""
+    phrases = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            english, equals, korean = line.partition('=')
+            if equals and korean.strip():
+                phrases.append((english.strip(), korean.strip()))
+    return phrases
+
+
+def read_phrase_js(path: str) -> List[Tuple[str, str]]:
+    """(english, korean) of every `new Phrase('english','korean')` in a phrases.js file."""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    return [
+        (english.replace("\\'", "'"), korean.replace("\\'", "'"))
+        for english, korean in PHRASE_JS_RE.findall(text)
+    ]
+
+
+def all_phrases(root: str = '../..') -> List[Tuple[str, str]]:
+    """Every phrase of phrases/*.txt and of the lessons' and concepts' phrases.js."""
+    phrases = []
+    for path in sorted(glob.glob('phrases/*.txt')):
+        phrases.extend(read_phrase_texts(path))
+    for pattern in ['lessons/*/phrases.js', 'concepts/*/phrases.js']:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            phrases.extend(read_phrase_js(path))
+    return phrases
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    if '--sapi' in sys.argv:
+        tts = Tts(SapiBackend(), voice='Korean', rate=0)
+    else:
+        tts = Tts(StubBackend(), pronounce=True)
+    korean = [k for _, k in all_phrases()]
+    for label in ['cold', 'warm']:
+        start = time.perf_counter()
+        rendered, cached = tts.prerender(korean)
+        print('%s: %d rendered, %d already cached in %.2fs' % (label, rendered, cached, time.perf_counter() - start))
+    print(tts.render(korean[0]))
+    assert AudioCache.key('stub', '', 0, korean[0]) == AudioCache.key('stub', '', 0.0, korean[0])
@@ -0,0 +1,81 @@
+// Built by experiments/01-translation/lessons.py from the lesson sources -- edit that instead
+let lessons = {
+	'concepts/numbers': [
+		new Phrase('1','일'),
+		new Phrase('2','이'),
+		new Phrase('3','삼'),
+		new Phrase('4','사'),
+		new Phrase('5','오'),
+		new Phrase('6','육'),
+		new Phrase('7','질'),
+		new Phrase('8','팔'),
+		new Phrase('9','구'),
+		new Phrase('10','십'),
+		new Phrase('100','백'),
+		new Phrase('1000','천'),
+		new Phrase('10000','만'),
+	],
+	'lessons/01': [
+		new Phrase('Hello','안녕'),
+		new Phrase('Thank You','고마워'),
+		new Phrase('You','너'),
+		new Phrase('I','나'),
+		new Phrase('Now','치금'),
+		new Phrase('What are you doing?','너 치금 뭐해'),
+	],
+	'lessons/02': [
+		new Phrase('You','너'),
+		new Phrase('I','나'),
+		new Phrase('Me too','나도'),
+		new Phrase('We','우리'),
+		new Phrase('Hello','안녕'),
+		new Phrase('Thank You','고마워'),
+		new Phrase('Good night','잘자'),
+		new Phrase('Nice to meet you','만나서 반가워'),
+		new Phrase('Nice to meet you','잎으로 잘 부탁해'),
+		new Phrase('Now','치금'),
+		new Phrase('What are you doing?','너 치금 뭐해'),
+	],
+	'lessons/03': [
+		new Phrase('eat','먹다'),
+		new Phrase('wear','입다'),
+		new Phrase('buy','사다'),
+		new Phrase('live','살다'),
+		new Phrase('do','하다'),
+		new Phrase('1','일'),
+		new Phrase('2','이'),
+		new Phrase('3','삼'),
+		new Phrase('4','사'),
+		new Phrase('5','오'),
+		new Phrase('6','육'),
+		new Phrase('7','질'),
+		new Phrase('8','팔'),
+		new Phrase('9','구'),
+		new Phrase('10','십'),
+		new Phrase('100','백'),
+		new Phrase('1000','천'),
+		new Phrase('10000','만'),
+	],
+	'lessons/delicious': [
+		new Phrase('The food is delicious.','음식이 맛있다.'),
+		new Phrase('The food was delicious.','음식은 맛 있었다.'),
+		new Phrase('The food will be delicious.','음식이 맛있을 것입니다.'),
+		new Phrase('Because the food is delicious I ate a lot.','음식이 맛있어서 많이 먹었어요.'),
+		new Phrase('If the food is delicious I will eat a lot.','음식이 맛 있으면 많이 먹겠습니다.'),
+		new Phrase('When the food is delicious I eat a lot.','음식이 맛있을 때 많이 먹습니다.'),
+		new Phrase('After I ate the food, I slept.','음식을 먹고 잤습니다.'),
+		new Phrase('Before I ate the food, I cooked.','음식을 먹기 전에 요리를했습니다.'),
+	],
+	'lessons/i_live_in': [
+		new Phrase('I live in New York City.','저는 뉴욕에 살고 있습니다.'),
+		new Phrase('I live in New York City','나는 뉴욕시에 산다'),
+		new Phrase('I lived in New York City.','저는 뉴욕시에 살았습니다.'),
+		new Phrase('I want to live in New York City.','저는 뉴욕시에 살고 싶습니다.'),
+		new Phrase('Because I live in New York City...','저는 뉴욕에 살고 있기 때문에 ...'),
+		new Phrase('When I live in New York City...','내가 뉴욕에 살 때 ...'),
+		new Phrase('If I live in New York City...','내가 뉴욕에 산다면 ...'),
+		new Phrase('I can live in New York City.','저는 뉴욕시에 살 수 있습니다.'),
+		new Phrase('I cannot live in New York City.','저는 뉴욕시에 살 수 없습니다.'),
+		new Phrase('Do not live in New York City.','뉴욕시에 살지 마십시오.'),
+	],
+};
@@ -1,3 +1,4 @@
+// Built by experiments/01-translation/lessons.py from lessons/01/phrases.txt -- edit that instead
 let phrases = [
 	new Phrase('Hello','안녕'),
 	new Phrase('Thank You','고마워'),
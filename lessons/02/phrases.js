@@ -1,3 +1,4 @@
+// Built by experiments/01-translation/lessons.py from lessons/02/phrases.txt -- edit that instead
 let phrases = [
 	new Phrase('You','너'),
 	new Phrase('I','나'),
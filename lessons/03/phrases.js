@@ -1,3 +1,4 @@
+// Built by experiments/01-translation/lessons.py from lessons/03/phrases.txt -- edit that instead
 let phrases = [
 	new Phrase('eat','먹다'),
 	new Phrase('wear','입다'),
@@ -16,5 +17,5 @@ let phrases = [
 	new Phrase('10','십'),
 	new Phrase('100','백'),
 	new Phrase('1000','천'),
-	new Phrase('10000','만')
+	new Phrase('10000','만'),
 ];
@@ -0,0 +1,13 @@
+// Built by experiments/01-translation/lessons.py from experiments/01-translation/phrases/i_live_in.txt -- edit that instead
+let phrases = [
+	new Phrase('I live in New York City.','저는 뉴욕에 살고 있습니다.'),
+	new Phrase('I live in New York City','나는 뉴욕시에 산다'),
+	new Phrase('I lived in New York City.','저는 뉴욕시에 살았습니다.'),
+	new Phrase('I want to live in New York City.','저는 뉴욕시에 살고 싶습니다.'),
+	new Phrase('Because I live in New York City...','저는 뉴욕에 살고 있기 때문에 ...'),
+	new Phrase('When I live in New York City...','내가 뉴욕에 살 때 ...'),
+	new Phrase('If I live in New York City...','내가 뉴욕에 산다면 ...'),
+	new Phrase('I can live in New York City.','저는 뉴욕시에 살 수 있습니다.'),
+	new Phrase('I cannot live in New York City.','저는 뉴욕시에 살 수 없습니다.'),
+	new Phrase('Do not live in New York City.','뉴욕시에 살지 마십시오.'),
+];
@@ -0,0 +1,116 @@
+"""
+A local stand-in for the image site: serves the jpgs in this folder under
+/<year>/<month>/<index>.jpg following SCHEDULE (with the real gaps: no 41,
+66, 67 or 162) and an artificial delay, so main.py can be tried without the
+network.
+
+Run from notes/other:
+    python image_server.py
+"""
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import os
+import shutil
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (first index, last index, year, month)
+SCHEDULE = [
+    (1, 40, 2011, 7),
+    (42, 65, 2011, 9),
+    (68, 120, 2011, 10),
+    (121, 161, 2012, 1),
+    (163, 177, 2012, 2),
+]
+
+
+def schedule_paths(directory=HERE, schedule=SCHEDULE):
+    """url path -> local file for every image of the schedule that exists in `directory`."""
+    paths = {}
+    for first, last, year, month in schedule:
+        for index in range(first, last+1):
+            filename = os.path.join(directory, '%d.jpg' % index)
+            if os.path.exists(filename):
+                paths['/%d/%02d/%02d.jpg' % (year, month, index)] = filename
+    return paths
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.count_request()
+        time.sleep(server.latency)
+        filename = server.paths.get(self.path)
+        if filename is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(os.path.getsize(filename)))
+        self.end_headers()
+        with open(filename, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ImageServer(ThreadingHTTPServer):
+    """Serves `paths` (url path -> file) on localhost with `latency` seconds of delay per request."""
+    daemon_threads = True
+
+    def __init__(self, paths=None, latency=0.05):
+        ThreadingHTTPServer.__init__(self, ('127.0.0.1', 0), ImageHandler)
+        self.paths = schedule_paths() if paths is None else paths
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def url(self):
+        return 'http://%s:%d' % self.server_address
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    import filecmp
+    import tempfile
+
+    from main import ImageDownloader
+    from main import START
+    from fetch import Fetcher
+    from jobs import Job
+
+    with ImageServer(latency=0.02) as server:
+        # One request at a time, one month at a time (like the old loop) vs in parallel
+        for label, workers, probe_months, probe_indexes in [('serial', 1, 1, 3), ('parallel', 8, 12, 3)]:
+            with tempfile.TemporaryDirectory() as tmp:
+                requests_before = server.requests
+                start = time.perf_counter()
+                with Job(os.path.join(tmp, 'images.job')) as job, \
+                        Fetcher(max_workers=workers, rate=None, backoff=0.01) as fetcher:
+                    downloader = ImageDownloader(fetcher, job, tmp, server.url, probe_months, probe_indexes,
+                                                 max_misses=12)
+                    downloader.run(START)
+                elapsed = time.perf_counter() - start
+                same = all(
+                    filecmp.cmp(filename, os.path.join(tmp, os.path.basename(filename)), shallow=False)
+                    for filename in server.paths.values()
+                )
+                print('%s: %d images (%s) in %.2fs, %d requests' % (
+                    label, len(job.state), 'identical' if same else 'DIFFERENT', elapsed,
+                    server.requests - requests_before))
@@ -1,49 +1,143 @@
-import time
-import shutil
-
-import requests
-'''
-a = requests.get('https://istheworldyouroyster.files.wordpress.com/2011/09/45.jpg')
-dir(a)
-a.status_code
-r = requests.get(settings.STATICMAP_URL.format(**data), stream=True)
-if r.status_code == 200:
-    with open(path, 'wb') as f:
-        r.raw.decode_content = True
-        shutil.copyfileobj(r.raw, f)     
-'''
-if __name__ == '__main__':
+import os
+import sys
+
+# The fetcher and the job runner live with the translator tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'experiments', '01-translation', 'tools'))
+from fetch import Fetcher
+from jobs import Job
+from jobs import FAILED
+
+BASE_URL = 'https://istheworldyouroyster.files.wordpress.com'
+# The images are numbered 1, 2, 3... across the months they were posted in
+# and some numbers were never posted (there is no 41, 66 or 67).
+START = (2011, 7, 1)
+# Give up after this many months without the next image
+MAX_MISSES = 100
+
+
+def image_url(base_url, year, month, index):
+    return '%s/%s/%02d/%02d.jpg' % (base_url, year, month, index)
+
+
+def image_key(year, month, index):
+    return '%d/%02d/%d' % (year, month, index)
+
+
+def parse_key(key):
+    return tuple(int(part) for part in key.split('/'))
+
+
+def add_months(year, month, months):
+    month += months - 1
+    return year + month // 12, month % 12 + 1
 
-    year = 2011
-    month = 7
-    index = 1
-    # there is no index 41?
-    year = 2011
-    month = 9
-    index = 42
-    # there is no 66,67?
-    year = 2011
-    month = 10
-    index = 68
-    #
-    year = 2011
-    month = 10
-    index = 177
-    error_count = 0
-    while error_count < 100:
-        r = requests.get('https://istheworldyouroyster.files.wordpress.com/%s/%02d/%02d.jpg' % (year,month,index))
-        if r.status_code == 200:
-            # download/save increment
-            with open('%s.jpg'%index, 'wb') as f:
-                f.write(r.content)
-                print( 'Downloading  : %s/%02d/%02d.jpg' % (year,month,index) )
-            index += 1
-        else:
-            print( 'Failed to get: %s/%02d/%02d.jpg' % (year,month,index) )
-            month += 1
-            if month > 12:
-                year += 1
-                month = 1
-        
-        time.sleep( 0.5 )
 
+def resume_position(job):
+    """Where to continue: right after the last downloaded image (or START)."""
+    done = [parse_key(k) for k in job.state if job.is_done(k)]
+    if done:
+        year, month, index = max(done, key=lambda p: p[2])
+        return year, month, index+1
+    return START
+
+
+class ImageDownloader():
+    """
+    Downloads the numbered images into `directory` with `fetcher`'s threads,
+    streaming each one to a temporary file and renaming it when complete.
+
+    Images of the current month are requested `fetcher.max_workers` at a
+    time. When the next index is missing, the following `probe_indexes`
+    indexes are probed in the next `probe_months` months all at once, so a
+    gap or a change of month costs one round of parallel requests instead of
+    one request per month.
+    """
+    def __init__(self, fetcher, job, directory='.', base_url=BASE_URL, probe_months=12, probe_indexes=3,
+                 max_misses=MAX_MISSES):
+        self.fetcher = fetcher
+        self.job = job
+        self.directory = directory
+        self.base_url = base_url
+        self.probe_months = probe_months
+        self.probe_indexes = probe_indexes
+        self.max_misses = max_misses
+        # Indexes that failed this run (retried on the next one)
+        self.failed = set()
+
+    def path(self, index):
+        return os.path.join(self.directory, '%s.jpg' % index)
+
+    def have(self, index):
+        return index in self.failed or os.path.exists(self.path(index))
+
+    def fetch(self, candidates):
+        """
+        Download every (year, month, index) at once. Returns the indexes that
+        were found (or failed for another reason than a 404, those are
+        retried on the next run) -> (year, month).
+        """
+        futures = {
+            self.fetcher.submit_download(image_url(self.base_url, *c), self.path(c[2])): c
+            for c in candidates
+        }
+        found = {}
+        for future, (year, month, index) in futures.items():
+            key = image_key(year, month, index)
+            try:
+                r = future.result()
+            except Exception as e:
+                print('Failed to get: %s/%02d/%02d.jpg (%s)' % (year, month, index, e))
+                self.job.fail(key, e)
+                self.failed.add(index)
+                found[index] = (year, month)
+                continue
+            if r.status_code == 200:
+                print('Downloaded   : %s/%02d/%02d.jpg' % (year, month, index))
+                self.job.complete(key)
+                found[index] = (year, month)
+            elif r.status_code != 404:
+                self.job.fail(key, 'HTTP %s' % r.status_code)
+                self.failed.add(index)
+                found[index] = (year, month)
+        return found
+
+    def retry_failed(self):
+        retry = [parse_key(k) for k, s in self.job.state.items() if s.status == FAILED and self.job.should_run(k)]
+        if retry:
+            self.fetch(retry)
+
+    def run(self, start=START):
+        year, month, index = start
+        misses = 0
+        while misses < self.max_misses:
+            while self.have(index):
+                index += 1
+            # The next few images, hopefully still in this month
+            batch = [(year, month, i) for i in range(index, index+self.fetcher.max_workers) if not self.have(i)]
+            found = self.fetch(batch)
+            if not found:
+                # Probe the next indexes in the coming months
+                candidates = []
+                for months in range(self.probe_months + 1):
+                    y, m = add_months(year, month, months)
+                    candidates.extend((y, m, index+i) for i in range(self.probe_indexes))
+                found = self.fetch([c for c in candidates if c not in batch and not self.have(c[2])])
+            if not found:
+                year, month = add_months(year, month, self.probe_months)
+                misses += self.probe_months
+                continue
+            first = min(found)
+            for missing in range(index, first):
+                print('No image     : %d' % missing)
+            year, month = found[first]
+            index = first
+            misses = 0
+
+
+if __name__ == '__main__':
+    # Delete images.job to start from START again
+    with Job('images.job', batch_size=10) as job, Fetcher(max_workers=8, rate=4.0) as fetcher:
+        downloader = ImageDownloader(fetcher, job)
+        downloader.retry_failed()
+        downloader.run(resume_position(job))
+    print(job.report())
@@ -0,0 +1,167 @@
+"""
+Builds manifest.json: the width, height, byte size and sha256 of every jpg
+in this folder, so pages showing them can set their dimensions up front
+(and lazy-load them without the layout jumping around).
+
+The dimensions come from the JPEG frame header (SOF), found by hopping from
+marker to marker, so no pixel is decoded. The files are scanned across a
+process pool and only files whose size or mtime changed since the last
+build are scanned again. The sizes and mtimes are local to a checkout so they
+live in .manifest_state.json (not committed): on a fresh clone every file is
+scanned once and the manifest comes out the same.
+
+Run from notes/other:
+    python manifest.py
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import hashlib
+import json
+import os
+import struct
+
+MANIFEST_PATH = 'manifest.json'
+STATE_PATH = '.manifest_state.json'
+
+# Start of frame markers (every one except DHT, JPG and DAC)
+SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length
+STANDALONE_MARKERS = set(range(0xD0, 0xD9)) | {0x01}
+START_OF_SCAN = 0xDA
+
+
+class JpegError(Exception):
+    pass
+
+
+def jpeg_size(f):
+    """Return (width, height) from the frame header of an open jpg."""
+    if f.read(2) != b'\xff\xd8':
+        raise JpegError('Not a jpg')
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise JpegError('No frame header')
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        # Any number of 0xFF can pad a marker
+        while marker == b'\xff':
+            marker = f.read(1)
+        if not marker:
+            raise JpegError('No frame header')
+        marker = marker[0]
+        if marker in STANDALONE_MARKERS:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        if marker in SOF_MARKERS:
+            _, height, width = struct.unpack('>BHH', f.read(5))
+            return width, height
+        if marker == START_OF_SCAN:
+            raise JpegError('No frame header before the image data')
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def scan(path):
+    """The manifest entry of one file."""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        width, height = jpeg_size(f)
+        f.seek(0)
+        for chunk in iter(lambda: f.read(64*1024), b''):
+            digest.update(chunk)
+    return {
+        'width': width,
+        'height': height,
+        'bytes': stat.st_size,
+        'sha256': digest.hexdigest(),
+    }
+
+
+def _scan_all(paths):
+    # Runs in a worker process
+    results = []
+    for path in paths:
+        try:
+            results.append((path, scan(path), None))
+        except (OSError, JpegError, struct.error) as e:
+            results.append((path, None, str(e)))
+    return results
+
+
+def _load(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_if_changed(path, data):
+    text = json.dumps(data, indent=1) + '\n'
+    try:
+        with open(path, encoding='utf-8') as f:
+            if f.read() == text:
+                return
+    except OSError:
+        pass
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def build(paths, manifest_path=MANIFEST_PATH, state_path=STATE_PATH, workers=None, chunk_size=16):
+    """
+    Update the manifest at `manifest_path` with `paths` (dropping files that
+    are gone) and return (manifest, scanned paths). `state_path` keeps the
+    size and mtime of every file as of its last scan.
+    """
+    old = _load(manifest_path)
+    # name -> [bytes, mtime]
+    old_state = _load(state_path)
+    manifest = {}
+    state = {}
+    changed = []
+    for path in sorted(paths):
+        name = os.path.basename(path)
+        stat = os.stat(path)
+        state[name] = [stat.st_size, stat.st_mtime]
+        if name in old and old_state.get(name) == state[name]:
+            manifest[name] = old[name]
+        else:
+            changed.append(path)
+    if changed:
+        chunks = [changed[i:i+chunk_size] for i in range(0, len(changed), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_scan_all, chunks):
+                for path, entry, error in results:
+                    name = os.path.basename(path)
+                    if error is not None:
+                        print('Error with %s: %s' % (path, error))
+                        del state[name]
+                        continue
+                    # Only touched (ie a fresh clone): keep the entry as it was
+                    manifest[name] = old[name] if old.get(name) == entry else entry
+    manifest = dict(sorted(manifest.items(), key=lambda item: _natural_key(item[0])))
+    _write_if_changed(manifest_path, manifest)
+    _write_if_changed(state_path, dict(sorted(state.items(), key=lambda item: _natural_key(item[0]))))
+    return manifest, changed
+
+
+def _natural_key(name):
+    # 2.jpg before 10.jpg
+    stem = os.path.splitext(name)[0]
+    return (0, int(stem), name) if stem.isdigit() else (1, 0, name)
+
+
+if __name__ == '__main__':
+    import time
+
+    paths = glob.glob('*.jpg')
+    for label in ['first run', 'second run']:
+        start = time.perf_counter()
+        manifest, changed = build(paths)
+        print('%s: %d images, %d scanned in %.3fs' % (label, len(manifest), len(changed), time.perf_counter() - start))